@@ -1,4 +1,5 @@
 from .lib import EcrConfig
+from .lib import PullThroughCacheConfig
 
 
 def define_container_registries(container_registries: list[EcrConfig]) -> None:
@@ -10,6 +11,52 @@ def define_container_registries(container_registries: list[EcrConfig]) -> None:
             git_repo_name="cool-repo",
             ecr_repo_name="backend",
             ecr_repo_namespace="my-project",
+            lifecycle=EcrLifecycleConfig(
+                tag_prefix_rules=[EcrTagPrefixRetention(tag_prefixes=["release-"], keep_last=50)],
+                expire_untagged_after_days=7,
+                keep_last=200,
+            ),
         )
     )
+    Preview what the lifecycle policy would expire with the simulator in `lib/ecr_lifecycle.py`.
+    Images are scanned on push (set `continuous_scan=True` to rescan as CVEs are published, which requires
+    ECR_REGISTRY_SCAN_TYPE = "ENHANCED" in `lib/constants.py`), and `lib/ecr_scan_findings.py` summarizes the findings
+    across all repositories. Set `signing_profile_arn` to have ECR sign every pushed image with an AWS Signer profile.
+    """
+
+
+def define_pull_through_caches(pull_through_caches: list[PullThroughCacheConfig]) -> None:
+    """Cache images from public registries in the central ECR (ECR Public is always cached, under `ecr-public`).
+
+    Nothing is created until `USE_ECR_PULL_THROUGH_CACHES` is enabled in `lib/constants.py`.
+
+    Registries that need credentials read them from a Secrets Manager secret (created manually in the central account)
+    whose name starts with `ecr-pullthroughcache/`, containing `username` and `accessToken`.
+
+    Example:
+    pull_through_caches.append(
+        PullThroughCacheConfig(
+            ecr_repository_prefix="docker-hub",
+            upstream_registry_url="registry-1.docker.io",
+            credential_secret_name="ecr-pullthroughcache/docker-hub",
+        )
+    )
+    pull_through_caches.append(
+        PullThroughCacheConfig(
+            ecr_repository_prefix="github",
+            upstream_registry_url="ghcr.io",
+            credential_secret_name="ecr-pullthroughcache/github",
+        )
+    )
+    """
+
+
+def define_ecr_replication_regions(replication_regions: list[str]) -> None:
+    """Replicate the container registries (except those with `replicate=False`) to other regions, for in-region pulls.
+
+    Each region's registry endpoint is published to SSM in the home region of every workload account, under
+    `ecr-registry-endpoints/<region>`.
+
+    Example:
+    replication_regions.append("us-west-2")
     """
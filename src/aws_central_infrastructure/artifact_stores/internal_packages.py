@@ -5,6 +5,7 @@ def create_internal_packages_configs(repo_package_claims: list[RepoPackageClaims
     """Create the internal packages configurations.
 
     Example: repo_package_claims.append(RepoPackageClaims(repo_name="cloud-courier", pypi_package_names={"cloud-courier"}))
+    Example (a repo publishing every package in an npm scope): repo_package_claims.append(RepoPackageClaims(repo_name="lab-ui", npm_scopes={"lab-ui"}))
     """
     repo_package_claims.append(
         RepoPackageClaims(
@@ -1,5 +1,66 @@
+from .code_artifact import CODE_ARTIFACT_PUBLISHING_ENVIRONMENT
 from .code_artifact import RepoPackageClaims
+from .code_artifact_package_groups import normalize_pypi_package_name
+from .code_artifact_package_groups import package_group_pattern
+from .code_artifact_package_groups import plan_claimed_package_patterns
+from .code_artifact_package_groups import split_package_namespace
+from .code_artifact_policy import MAX_PACKAGE_RESOURCES_LENGTH
+from .code_artifact_policy import PackageResourcePattern
+from .code_artifact_policy import PublishingPolicyTooLargeError
+from .code_artifact_policy import plan_package_resource_arns
+from .code_artifact_policy import plan_package_resource_patterns
+from .code_artifact_prewarm import LockedPackage
+from .code_artifact_prewarm import PrewarmReport
+from .code_artifact_prewarm import parse_simple_index_links
+from .code_artifact_prewarm import parse_uv_lock
+from .code_artifact_prewarm import prewarm_packages
+from .code_artifact_prewarm import simple_index_url
+from .code_artifact_promotion import PackagePromotion
+from .code_artifact_promotion import PromotionBatch
+from .code_artifact_promotion import PromotionReport
+from .code_artifact_promotion import PromotionTarget
+from .code_artifact_promotion import plan_promotion_batches
+from .code_artifact_promotion import promote_package_versions
+from .constants import USE_SINGLE_CODE_ARTIFACT_PUBLISHING_ROLE
+from .ecr import ConflictingEcrRepoOrgsError
 from .ecr import EcrConfig
+from .ecr import RepoEcrClaims
+from .ecr import group_ecr_claims
+from .ecr_lifecycle import EcrImage
+from .ecr_lifecycle import EcrLifecycleConfig
+from .ecr_lifecycle import EcrLifecycleRule
+from .ecr_lifecycle import EcrTagPrefixRetention
+from .ecr_lifecycle import LifecycleSimulation
+from .ecr_lifecycle import TaggedRuleWithoutPrefixesError
+from .ecr_lifecycle import lifecycle_policy_text
+from .ecr_lifecycle import parse_describe_images
+from .ecr_lifecycle import simulate_lifecycle_policy
+from .ecr_pull_through_cache import DuplicatePullThroughCachePrefixError
+from .ecr_pull_through_cache import InvalidPullThroughCacheSecretNameError
+from .ecr_pull_through_cache import PullThroughCacheConfig
+from .ecr_pull_through_cache import validate_pull_through_cache_configs
+from .ecr_registry import ContinuousScanRequiresEnhancedScanningError
+from .ecr_registry import RegistryScanningRule
+from .ecr_registry import RegistrySigningRule
+from .ecr_registry import TooManyScanningFiltersError
+from .ecr_registry import plan_registry_scanning_rules
+from .ecr_registry import plan_registry_signing_rules
+from .ecr_replication import ROOT_CREATION_TEMPLATE_PREFIX
+from .ecr_replication import InvalidReplicationRegionsError
+from .ecr_replication import TooManyReplicationFiltersError
+from .ecr_replication import ecr_registry_endpoint
+from .ecr_replication import plan_replication_filters
+from .ecr_replication import plan_replication_template_prefixes
+from .ecr_replication import validate_replication_regions
+from .ecr_scan_findings import ImageScanSummary
+from .ecr_scan_findings import ScanFindingsReport
+from .ecr_scan_findings import build_scan_findings_report
+from .ecr_scan_findings import collect_scan_findings
+from .ecr_scan_findings import summarize_image_scan_findings
 from .image_builder import ImageBuilderConfig
 from .image_builder import ImageShareConfig
 from .image_builder import NewImageConfig
+from .package_claims import ConflictingNpmScopeClaimError
+from .package_claims import DuplicateRepoPackageClaimsError
+from .package_claims import PackageClaimsIndex
+from .package_claims import get_package_claims_index
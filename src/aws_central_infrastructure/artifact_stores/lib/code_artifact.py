@@ -1,5 +1,6 @@
 import json
 import logging
+from typing import TYPE_CHECKING
 from typing import Literal
 
 import pulumi_aws
@@ -26,11 +27,21 @@ from aws_central_infrastructure.iac_management.lib import GITHUB_OIDC_URL
 from aws_central_infrastructure.iac_management.lib import GithubOidcConfig
 from aws_central_infrastructure.iac_management.lib import principal_in_org_condition
 
+from .code_artifact_package_groups import ClaimedPackageGroups
+from .code_artifact_policy import PackageResourcePattern
+from .code_artifact_policy import plan_package_resource_arns
+from .constants import USE_SINGLE_CODE_ARTIFACT_PUBLISHING_ROLE
+
+if TYPE_CHECKING:
+    from .package_claims import PackageClaimsIndex
+
 logger = logging.getLogger(__name__)
 
 CODE_ARTIFACT_DOMAIN_NAME = CENTRAL_INFRA_GITHUB_ORG_NAME
 PRIMARY_REPO_NAME = f"{CENTRAL_INFRA_GITHUB_ORG_NAME}-primary"
 STAGING_REPO_NAME = f"{CENTRAL_INFRA_GITHUB_ORG_NAME}-staging"
+# the GitHub environment (deployable only from main) allowed to assume the publishing role, when USE_SINGLE_CODE_ARTIFACT_PUBLISHING_ROLE is enabled
+CODE_ARTIFACT_PUBLISHING_ENVIRONMENT = "codeartifact-publishing"
 
 
 class RepoPackageClaims(BaseModel):
@@ -39,6 +50,7 @@ class RepoPackageClaims(BaseModel):
     publish_to_public_registry: bool = False
     pypi_package_names: set[str] = Field(default_factory=set)
     npm_package_names: set[str] = Field(default_factory=set)
+    npm_scopes: set[str] = Field(default_factory=set)  # whole scopes owned by the repo, without the @
     nuget_package_names: set[str] = Field(default_factory=set)
 
 
@@ -146,15 +158,17 @@ class CentralCodeArtifact(ComponentResource):
             tags=common_tags_native(),
         )
 
-    def register_package_claims(self, package_claims: list[RepoPackageClaims]) -> None:
+    def register_package_claims(self, package_claims: "PackageClaimsIndex") -> None:
         central_infra_oidc_provider_arn = get_open_id_connect_provider(url=GITHUB_OIDC_URL).arn
 
-        for claims in package_claims:
+        for claims in package_claims.claims:
             _ = RepoPublishingRoles(
                 code_artifact=self,
                 package_claims=claims,
+                other_package_claims=[other for other in package_claims.claims if other is not claims],
                 central_infra_oidc_provider_arn=central_infra_oidc_provider_arn,
             )
+        _ = ClaimedPackageGroups(code_artifact=self, package_claims=package_claims)
 
 
 def create_code_artifact_package_arn(
@@ -174,6 +188,7 @@ class RepoPublishingRoles(ComponentResource):
         *,
         code_artifact: CentralCodeArtifact,
         package_claims: RepoPackageClaims,
+        other_package_claims: list[RepoPackageClaims],
         central_infra_oidc_provider_arn: str,
     ):
         super().__init__(
@@ -184,34 +199,80 @@ class RepoPublishingRoles(ComponentResource):
         )
         self._central_infra_oidc_provider_arn = central_infra_oidc_provider_arn
         self._package_claims = package_claims
+        self._other_package_claims = other_package_claims
         self._code_artifact = code_artifact
 
-        _ = GithubOidcConfig(
-            aws_account_id=get_aws_account_id(),
-            repo_org=package_claims.repo_org,
-            repo_name=package_claims.repo_name,
-            role_name=f"GHA-CA-Staging-{package_claims.repo_name}",
-            role_policy=iam.RolePolicyArgs(
-                policy_name="PublishPackagesToCodeArtifact",
-                policy_document=self._create_role_policy_document().json,
-            ),
-        ).create_role(provider_arn=self._central_infra_oidc_provider_arn, parent=self)
+        if USE_SINGLE_CODE_ARTIFACT_PUBLISHING_ROLE:
+            # a role's permissions can't depend on which environment assumed it, so the role that can publish to primary
+            # is only trusted from the one environment that GitHub only lets main deploy to
+            _ = GithubOidcConfig(
+                aws_account_id=get_aws_account_id(),
+                repo_org=package_claims.repo_org,
+                repo_name=package_claims.repo_name,
+                environments=[CODE_ARTIFACT_PUBLISHING_ENVIRONMENT],
+                role_name=f"GHA-CA-Publish-{package_claims.repo_name}",
+                role_policy=iam.RolePolicyArgs(
+                    policy_name="PublishPackagesToCodeArtifact",
+                    policy_document=self._create_role_policy_document(
+                        ca_repos=[code_artifact.staging_repo, code_artifact.primary_repo]
+                    ).json,
+                ),
+            ).create_role(provider_arn=self._central_infra_oidc_provider_arn, parent=self)
+        else:
+            _ = GithubOidcConfig(
+                aws_account_id=get_aws_account_id(),
+                repo_org=package_claims.repo_org,
+                repo_name=package_claims.repo_name,
+                role_name=f"GHA-CA-Staging-{package_claims.repo_name}",
+                role_policy=iam.RolePolicyArgs(
+                    policy_name="PublishPackagesToCodeArtifact",
+                    policy_document=self._create_role_policy_document(ca_repos=[code_artifact.staging_repo]).json,
+                ),
+            ).create_role(provider_arn=self._central_infra_oidc_provider_arn, parent=self)
 
+            _ = GithubOidcConfig(
+                aws_account_id=get_aws_account_id(),
+                repo_org=package_claims.repo_org,
+                repo_name=package_claims.repo_name,
+                restrictions="ref:refs/heads/main",  # TODO: consider creating a publishing environment within GitHub and using that
+                role_name=f"GHA-CA-Primary-{package_claims.repo_name}",
+                role_policy=iam.RolePolicyArgs(
+                    policy_name="PublishPackagesToCodeArtifact",
+                    policy_document=self._create_role_policy_document(ca_repos=[code_artifact.primary_repo]).json,
+                ),
+            ).create_role(provider_arn=self._central_infra_oidc_provider_arn, parent=self)
+
+        # promotes the exact versions tested from staging, instead of building and publishing them again to primary
         _ = GithubOidcConfig(
             aws_account_id=get_aws_account_id(),
             repo_org=package_claims.repo_org,
             repo_name=package_claims.repo_name,
-            restrictions="refs/heads/main",  # TODO: consider creating a publishing environment within GitHub and using that
-            role_name=f"GHA-CA-Primary-{package_claims.repo_name}",
+            restrictions="ref:refs/heads/main",
+            role_name=f"GHA-CA-Promote-{package_claims.repo_name}",
             role_policy=iam.RolePolicyArgs(
-                policy_name="PublishPackagesToCodeArtifact",
-                policy_document=self._create_role_policy_document(for_primary=True).json,
+                policy_name="PromotePackagesInCodeArtifact",
+                policy_document=self._create_promotion_policy_document().json,
             ),
         ).create_role(provider_arn=self._central_infra_oidc_provider_arn, parent=self)
 
-    def _create_role_policy_document(self, *, for_primary: bool = False) -> Output[GetPolicyDocumentResult]:
-        ca_repo = self._code_artifact.primary_repo if for_primary else self._code_artifact.staging_repo
-        return Output.all(self._code_artifact.domain.name, ca_repo.name).apply(
+    def _claimed_package_arns(self, *, ca_domain_name: str, ca_repo_names: list[str]) -> list[str]:
+        def to_arn(ca_repo_name: str, pattern: PackageResourcePattern) -> str:
+            return create_code_artifact_package_arn(
+                ca_repo_name=ca_repo_name,
+                ca_domain_name=ca_domain_name,
+                package_type=pattern.package_type,
+                package_namespace=pattern.namespace,  # only npm scopes have one
+                package_name=pattern.name,
+            )
+
+        return plan_package_resource_arns(
+            self._package_claims, other_claims=self._other_package_claims, ca_repo_names=ca_repo_names, to_arn=to_arn
+        )
+
+    def _create_role_policy_document(
+        self, *, ca_repos: list[codeartifact.Repository]
+    ) -> Output[GetPolicyDocumentResult]:
+        return Output.all(self._code_artifact.domain.name, *(ca_repo.name for ca_repo in ca_repos)).apply(
             lambda args: get_policy_document(
                 statements=[
                     CODE_ARTIFACT_SERVICE_BEARER_STATEMENT,
@@ -222,36 +283,39 @@ class RepoPublishingRoles(ComponentResource):
                             "codeartifact:PublishPackageVersion",
                             "codeartifact:PutPackageMetadata",
                         ],
-                        resources=[
-                            create_code_artifact_package_arn(
-                                ca_repo_name=args[1],
-                                ca_domain_name=args[0],
-                                package_type="pypi",
-                                # pypi does not use namespaces
-                                package_name=package_name,
-                            )
-                            for package_name in self._package_claims.pypi_package_names
-                        ]
-                        + [
-                            create_code_artifact_package_arn(
-                                ca_repo_name=args[1],
-                                ca_domain_name=args[0],
-                                package_type="npm",
-                                # npm does use namespaces...but ignoring for now
-                                package_name=package_name,
-                            )
-                            for package_name in self._package_claims.npm_package_names
-                        ]
-                        + [
-                            create_code_artifact_package_arn(
-                                ca_repo_name=args[1],
-                                ca_domain_name=args[0],
-                                package_type="nuget",
-                                # nuget does not use namespaces
-                                package_name=package_name,
-                            )
-                            for package_name in self._package_claims.nuget_package_names
-                        ],
+                        resources=self._claimed_package_arns(ca_domain_name=args[0], ca_repo_names=list(args[1:])),
+                    ),
+                ]
+            )
+        )
+
+    def _create_promotion_policy_document(self) -> Output[GetPolicyDocumentResult]:
+        code_artifact = self._code_artifact
+        return Output.all(
+            code_artifact.domain.name,
+            code_artifact.staging_repo.name,
+            code_artifact.primary_repo.name,
+            code_artifact.staging_repo.arn,
+        ).apply(
+            lambda args: get_policy_document(
+                statements=[
+                    GetPolicyDocumentStatementArgs(
+                        sid="ReadFromStaging",
+                        effect="Allow",
+                        actions=["codeartifact:ReadFromRepository"],
+                        resources=[args[3]],
+                    ),
+                    GetPolicyDocumentStatementArgs(
+                        sid="ListPackageVersions",
+                        effect="Allow",
+                        actions=["codeartifact:ListPackageVersions"],
+                        resources=self._claimed_package_arns(ca_domain_name=args[0], ca_repo_names=[args[1], args[2]]),
+                    ),
+                    GetPolicyDocumentStatementArgs(
+                        sid="CopyToPrimary",
+                        effect="Allow",
+                        actions=["codeartifact:CopyPackageVersions"],
+                        resources=self._claimed_package_arns(ca_domain_name=args[0], ca_repo_names=[args[2]]),
                     ),
                 ]
             )
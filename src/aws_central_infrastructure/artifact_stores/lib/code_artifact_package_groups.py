@@ -0,0 +1,104 @@
+import re
+from typing import TYPE_CHECKING
+from typing import Literal
+
+from ephemeral_pulumi_deploy import append_resource_suffix
+from ephemeral_pulumi_deploy import common_tags_native
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_aws_native import codeartifact
+
+if TYPE_CHECKING:
+    from .code_artifact import CentralCodeArtifact
+    from .package_claims import PackageClaimsIndex
+
+type PackageType = Literal["pypi", "npm", "nuget"]
+
+
+def normalize_pypi_package_name(package_name: str) -> str:
+    # PEP 503, which is also how CodeArtifact stores PyPI package names
+    return re.sub(r"[-_.]+", "-", package_name).lower()
+
+
+def split_package_namespace(*, package_type: PackageType, package_name: str) -> tuple[str, str]:
+    """Split a package name into the namespace and name CodeArtifact uses, which only npm scopes have."""
+    if package_type == "npm" and package_name.startswith("@"):
+        namespace, name = package_name.removeprefix("@").split("/", maxsplit=1)
+        return namespace, name
+    return "", package_name
+
+
+def package_group_pattern(*, package_type: PackageType, package_name: str) -> str:
+    """Build the package group pattern matching exactly this package, in the `/format/namespace/name$` syntax."""
+    if package_type == "pypi":
+        package_name = normalize_pypi_package_name(package_name)
+    namespace, name = split_package_namespace(package_type=package_type, package_name=package_name)
+    return f"/{package_type}/{namespace}/{name}$"
+
+
+def plan_claimed_package_patterns(package_claims: "PackageClaimsIndex") -> list[str]:
+    """Patterns for every claimed package that is only ever published internally.
+
+    Packages also published to a public registry are excluded, since their public versions are the real ones and
+    still need to come through the upstream stores.
+    """
+    patterns: set[str] = set()
+    for claims in package_claims.claims:
+        if claims.publish_to_public_registry:
+            continue
+        package_names_by_type: tuple[tuple[PackageType, set[str]], ...] = (
+            ("pypi", claims.pypi_package_names),
+            ("npm", claims.npm_package_names),
+            ("nuget", claims.nuget_package_names),
+        )
+        patterns.update(f"/npm/{scope}/*" for scope in claims.npm_scopes)
+        for package_type, package_names in package_names_by_type:
+            patterns.update(
+                package_group_pattern(package_type=package_type, package_name=package_name)
+                for package_name in package_names
+            )
+    return sorted(patterns)
+
+
+class ClaimedPackageGroups(ComponentResource):
+    """Stop claimed internal package names from ever being fetched from the public registries.
+
+    A public package with the same name as an internal one (e.g. dependency confusion) would otherwise be pulled
+    through the upstream stores into primary and staging, and then installed instead of the internal one.
+    """
+
+    def __init__(self, *, code_artifact: "CentralCodeArtifact", package_claims: "PackageClaimsIndex"):
+        super().__init__(
+            "labauto:CentralCodeArtifactClaimedPackageGroups",
+            append_resource_suffix(),
+            None,
+            opts=ResourceOptions(parent=code_artifact),
+        )
+        for pattern in plan_claimed_package_patterns(package_claims):
+            _ = codeartifact.PackageGroup(
+                append_resource_suffix(
+                    f"claimed-{pattern.strip('/$').replace('/', '-').replace('*', 'all')}", max_length=150
+                ),
+                domain_name=code_artifact.domain.domain_name,
+                pattern=pattern,
+                description="A package claimed by a repo in internal_packages.py",
+                origin_configuration=codeartifact.PackageGroupOriginConfigurationArgs(
+                    restrictions=codeartifact.PackageGroupRestrictionsArgs(
+                        external_upstream=codeartifact.PackageGroupRestrictionTypeArgs(
+                            restriction_mode=codeartifact.PackageGroupRestrictionTypeRestrictionMode.BLOCK
+                        ),
+                        publish=codeartifact.PackageGroupRestrictionTypeArgs(
+                            restriction_mode=codeartifact.PackageGroupRestrictionTypeRestrictionMode.ALLOW_SPECIFIC_REPOSITORIES,
+                            repositories=[
+                                code_artifact.primary_repo.repository_name,
+                                code_artifact.staging_repo.repository_name,
+                            ],
+                        ),
+                        internal_upstream=codeartifact.PackageGroupRestrictionTypeArgs(
+                            restriction_mode=codeartifact.PackageGroupRestrictionTypeRestrictionMode.ALLOW
+                        ),
+                    )
+                ),
+                tags=common_tags_native(),
+                opts=ResourceOptions(parent=self),
+            )
@@ -0,0 +1,134 @@
+import re
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from .code_artifact_package_groups import PackageType
+from .code_artifact_package_groups import split_package_namespace
+
+if TYPE_CHECKING:
+    from .code_artifact import RepoPackageClaims
+
+# IAM allows 10,240 characters across a role's inline policies, and the promotion role lists the package ARNs three times
+MAX_PACKAGE_RESOURCES_LENGTH = 3000  # per CodeArtifact repository
+_PREFIX_PATTERN = re.compile(r"^[a-zA-Z0-9]+[-_.]")
+_ARN_JSON_OVERHEAD = 3  # the quotes and comma around each ARN in the policy JSON
+
+
+class PublishingPolicyTooLargeError(Exception):
+    def __init__(self, *, repo_name: str, length: int, max_length: int):
+        super().__init__(
+            f"The package ARNs for {repo_name} need {length} characters even after collapsing to wildcards, more than the budget of {max_length}. Claim whole npm scopes with npm_scopes, or give related packages a common prefix"
+        )
+
+
+class PackageResourcePattern(BaseModel, frozen=True):
+    package_type: PackageType
+    namespace: str = ""
+    name: str  # a package name, or a prefix ending in *
+
+    def matches(self, *, package_type: PackageType, package_name: str) -> bool:
+        namespace, name = split_package_namespace(package_type=package_type, package_name=package_name)
+        if package_type != self.package_type or namespace != self.namespace:
+            return False
+        if self.name.endswith("*"):
+            return name.lower().startswith(self.name.removesuffix("*").lower())
+        return name == self.name
+
+
+def _claimed_package_names(claims: "RepoPackageClaims") -> list[tuple[PackageType, str]]:
+    return [
+        *(("pypi", package_name) for package_name in sorted(claims.pypi_package_names)),
+        *(("npm", package_name) for package_name in sorted(claims.npm_package_names)),
+        *(("nuget", package_name) for package_name in sorted(claims.nuget_package_names)),
+    ]
+
+
+def _exact_patterns(claims: "RepoPackageClaims") -> list[PackageResourcePattern]:
+    patterns = [
+        PackageResourcePattern(package_type="npm", namespace=scope, name="*") for scope in sorted(claims.npm_scopes)
+    ]
+    for package_type, package_name in _claimed_package_names(claims):
+        if any(pattern.matches(package_type=package_type, package_name=package_name) for pattern in patterns):
+            continue  # already covered by the whole scope
+        namespace, name = split_package_namespace(package_type=package_type, package_name=package_name)
+        patterns.append(PackageResourcePattern(package_type=package_type, namespace=namespace, name=name))
+    return patterns
+
+
+def _safe_prefix_groups(
+    patterns: list[PackageResourcePattern], *, other_claims: list["RepoPackageClaims"]
+) -> dict[PackageResourcePattern, list[PackageResourcePattern]]:
+    """Group exact names sharing a first word, where no other repo claims a name the wildcard would also match."""
+    other_names = [package for claims in other_claims for package in _claimed_package_names(claims)]
+    groups: dict[PackageResourcePattern, list[PackageResourcePattern]] = {}
+    for pattern in patterns:
+        prefix_match = None if pattern.name.endswith("*") else _PREFIX_PATTERN.match(pattern.name)
+        if prefix_match is None:
+            continue
+        wildcard = pattern.model_copy(update={"name": f"{prefix_match.group()}*"})
+        groups.setdefault(wildcard, []).append(pattern)
+    return {
+        wildcard: members
+        for wildcard, members in groups.items()
+        if len(members) > 1
+        and not any(
+            wildcard.matches(package_type=package_type, package_name=package_name)
+            for package_type, package_name in other_names
+        )
+    }
+
+
+def plan_package_resource_patterns(
+    claims: "RepoPackageClaims",
+    *,
+    other_claims: list["RepoPackageClaims"],
+    to_arn: Callable[[PackageResourcePattern], str],
+    max_length: int = MAX_PACKAGE_RESOURCES_LENGTH,
+) -> list[PackageResourcePattern]:
+    """Pick the package resources for a repo's publishing policies, small enough to fit the policy size budget.
+
+    Claimed npm scopes always become `@scope/*`. Only when the exact names don't fit are the names sharing a first word
+    (e.g. `mylib-core` and `mylib-cli`) collapsed to a prefix wildcard, largest saving first, and never when another
+    repo has claimed a name the wildcard would also match.
+    """
+
+    def length(patterns: list[PackageResourcePattern]) -> int:
+        return sum(len(to_arn(pattern)) + _ARN_JSON_OVERHEAD for pattern in patterns)
+
+    patterns = _exact_patterns(claims)
+    groups = sorted(
+        _safe_prefix_groups(patterns, other_claims=other_claims).items(),
+        key=lambda group: length(group[1]) - length([group[0]]),
+        reverse=True,
+    )
+    for wildcard, members in groups:
+        if length(patterns) <= max_length:
+            break
+        patterns = [pattern for pattern in patterns if pattern not in members]
+        patterns.append(wildcard)
+    if length(patterns) > max_length:
+        raise PublishingPolicyTooLargeError(repo_name=claims.repo_name, length=length(patterns), max_length=max_length)
+    return patterns
+
+
+def plan_package_resource_arns(
+    claims: "RepoPackageClaims",
+    *,
+    other_claims: list["RepoPackageClaims"],
+    ca_repo_names: list[str],
+    to_arn: Callable[[str, PackageResourcePattern], str],  # the CodeArtifact repo name and the pattern
+) -> list[str]:
+    """List the ARNs of a repo's claimed packages in each of the given CodeArtifact repositories."""
+    arns: list[str] = []
+    for ca_repo_name in ca_repo_names:
+
+        def to_repo_arn(pattern: PackageResourcePattern, ca_repo_name: str = ca_repo_name) -> str:
+            return to_arn(ca_repo_name, pattern)
+
+        arns.extend(
+            to_repo_arn(pattern)
+            for pattern in plan_package_resource_patterns(claims, other_claims=other_claims, to_arn=to_repo_arn)
+        )
+    return arns
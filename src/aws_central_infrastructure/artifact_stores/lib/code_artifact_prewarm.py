@@ -0,0 +1,201 @@
+"""Pull every package version in a lockfile through the primary CodeArtifact repository, so CI installs hit the cache.
+
+CodeArtifact only keeps a public package version once something has asked for it, so the first install after a
+dependency bump waits on the public registry for every new version. Requesting them all ahead of time, a bounded number
+at once, moves that wait out of the CI jobs. Requesting any one file of a version makes CodeArtifact ingest every file of
+that version, so only the smallest locked file is downloaded (and discarded as it streams in).
+
+Example (with credentials for the central account):
+`uv run python -m aws_central_infrastructure.artifact_stores.lib.code_artifact_prewarm uv.lock --concurrency 16`
+"""
+
+import argparse
+import asyncio
+import base64
+import re
+import tomllib
+import urllib.request
+from collections.abc import Callable
+from pathlib import Path
+from pathlib import PurePosixPath
+from typing import Any
+from urllib.parse import urljoin
+from urllib.parse import urlparse
+
+import boto3
+from pydantic import BaseModel
+from pydantic import Field
+
+from .code_artifact_package_groups import normalize_pypi_package_name
+
+DEFAULT_CONCURRENCY = 8
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_HREF_PATTERN = re.compile(r"""href=["']([^"']+)["']""")
+
+type Fetch = Callable[[str], bytes]
+type Download = Callable[[str], None]  # reads the whole response, without keeping it
+
+
+class LockedPackage(BaseModel):
+    name: str
+    version: str
+    filenames: list[str]  # the sdist and wheels the lockfile knows about, smallest first
+
+
+class PrewarmReport(BaseModel):
+    warmed_filenames: list[str] = Field(default_factory=list)  # the one file downloaded for each version
+    missing_filenames: list[str] = Field(default_factory=list)  # locked, but not offered by the repository
+    failed_packages: dict[str, str] = Field(default_factory=dict)  # package name to the error
+
+
+def _filename_from_url(url: str) -> str:
+    return PurePosixPath(urlparse(url).path).name
+
+
+def parse_uv_lock(lock_text: str, *, skip_package_names: set[str] | None = None) -> list[LockedPackage]:
+    """List the packages in a `uv.lock` that come from a package index, excluding workspace members, git and path sources."""
+    skip = {normalize_pypi_package_name(package_name) for package_name in skip_package_names or set()}
+    packages: list[LockedPackage] = []
+    for package in tomllib.loads(lock_text).get("package", []):
+        if "registry" not in package.get("source", {}) or normalize_pypi_package_name(package["name"]) in skip:
+            continue
+        distributions: list[dict[str, Any]] = [*package.get("wheels", [])]
+        if "sdist" in package:
+            distributions.append(package["sdist"])
+        packages.append(
+            LockedPackage(
+                name=package["name"],
+                version=package["version"],
+                filenames=[
+                    _filename_from_url(distribution["url"])
+                    for distribution in sorted(
+                        distributions,
+                        key=lambda distribution: (distribution.get("size", 0), distribution.get("url", "")),
+                    )
+                    if "url" in distribution
+                ],
+            )
+        )
+    return packages
+
+
+def simple_index_url(*, repository_endpoint: str, package_name: str) -> str:
+    return f"{repository_endpoint.rstrip('/')}/simple/{normalize_pypi_package_name(package_name)}/"
+
+
+def parse_simple_index_links(html: str, *, page_url: str) -> dict[str, str]:
+    """Find the download URLs on a PEP 503 simple index page, keyed by filename."""
+    links: dict[str, str] = {}
+    for href in _HREF_PATTERN.findall(html):
+        url = urljoin(page_url, href)
+        links[_filename_from_url(url)] = url
+    return links
+
+
+async def _prewarm_package(  # noqa: PLR0913 # this is a lot of arguments, but they're all kwargs
+    package: LockedPackage,
+    *,
+    repository_endpoint: str,
+    fetch: Fetch,
+    download: Download,
+    semaphore: asyncio.Semaphore,
+    report: PrewarmReport,
+) -> None:
+    page_url = simple_index_url(repository_endpoint=repository_endpoint, package_name=package.name)
+    try:
+        async with semaphore:
+            html = (await asyncio.to_thread(fetch, page_url)).decode()
+        links = parse_simple_index_links(html, page_url=page_url)
+        report.missing_filenames.extend(filename for filename in package.filenames if filename not in links)
+        filename = next((filename for filename in package.filenames if filename in links), None)
+        if filename is None:
+            return
+        async with semaphore:
+            await asyncio.to_thread(download, links[filename])
+        report.warmed_filenames.append(filename)
+    except Exception as e:  # noqa: BLE001 # one package failing shouldn't stop the rest from being warmed
+        report.failed_packages[package.name] = str(e)
+
+
+async def prewarm_packages(
+    packages: list[LockedPackage],
+    *,
+    repository_endpoint: str,
+    fetch: Fetch,
+    download: Download,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> PrewarmReport:
+    """Request each package's index page and its smallest locked file, with at most `concurrency` requests in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    report = PrewarmReport()
+    _ = await asyncio.gather(
+        *(
+            _prewarm_package(
+                package,
+                repository_endpoint=repository_endpoint,
+                fetch=fetch,
+                download=download,
+                semaphore=semaphore,
+                report=report,
+            )
+            for package in packages
+        )
+    )
+    report.warmed_filenames.sort()
+    report.missing_filenames.sort()
+    return report
+
+
+def _create_authenticated_fetch_and_download(authorization_token: str) -> tuple[Fetch, Download]:
+    credentials = base64.b64encode(f"aws:{authorization_token}".encode()).decode()
+
+    def open_url(url: str) -> Any:  # noqa: ANN401 # urlopen's return type depends on the URL scheme
+        request = urllib.request.Request(url, headers={"Authorization": f"Basic {credentials}"})  # noqa: S310 # the URLs all come from the CodeArtifact repository endpoint
+        return urllib.request.urlopen(request)  # noqa: S310 # the URLs all come from the CodeArtifact repository endpoint
+
+    def fetch(url: str) -> bytes:
+        with open_url(url) as response:
+            return response.read()
+
+    def download(url: str) -> None:
+        with open_url(url) as response:
+            while response.read(_DOWNLOAD_CHUNK_SIZE):
+                pass  # only the request matters, so the body is discarded as it arrives
+
+    return fetch, download
+
+
+def main() -> None:
+    from .code_artifact import CODE_ARTIFACT_DOMAIN_NAME  # noqa: PLC0415 # code_artifact imports the Pulumi providers, which aren't needed unless this runs as a CLI
+    from .code_artifact import PRIMARY_REPO_NAME  # noqa: PLC0415 # code_artifact imports the Pulumi providers, which aren't needed unless this runs as a CLI
+    from .package_claims import get_package_claims_index  # noqa: PLC0415 # the package claims import internal_packages.py, which imports this lib package
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _ = parser.add_argument("lockfile", type=Path, help="the path to a uv.lock file")
+    _ = parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    _ = parser.add_argument("--region", default=None, help="the org home region, defaults to the AWS CLI's region")
+    args = parser.parse_args()
+    # claimed packages are published straight to the primary repository, so there is no upstream to warm them from
+    claimed_package_names = {
+        package_name for claims in get_package_claims_index().claims for package_name in claims.pypi_package_names
+    }
+    client = boto3.client("codeartifact", region_name=args.region)
+    authorization_token = client.get_authorization_token(domain=CODE_ARTIFACT_DOMAIN_NAME)["authorizationToken"]
+    fetch, download = _create_authenticated_fetch_and_download(authorization_token)
+    repository_endpoint = client.get_repository_endpoint(
+        domain=CODE_ARTIFACT_DOMAIN_NAME, repository=PRIMARY_REPO_NAME, format="pypi"
+    )["repositoryEndpoint"]
+    report = asyncio.run(
+        prewarm_packages(
+            parse_uv_lock(args.lockfile.read_text(), skip_package_names=claimed_package_names),
+            repository_endpoint=repository_endpoint,
+            fetch=fetch,
+            download=download,
+            concurrency=args.concurrency,
+        )
+    )
+    print(report.model_dump_json(indent=2))  # noqa: T201 # this is a CLI
+
+
+if __name__ == "__main__":
+    main()
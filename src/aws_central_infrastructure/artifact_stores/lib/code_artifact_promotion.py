@@ -0,0 +1,228 @@
+"""Promote package versions from the staging CodeArtifact repository to the primary one, without rebuilding them.
+
+The versions are copied with `CopyPackageVersions`, so what lands in primary is byte for byte what was tested from
+staging. Each package's versions are copied in batches, and the batches of different packages run concurrently.
+
+Example (in a GitHub Actions job that assumed the repo's GHA-CA-Promote role):
+`uv run python -m aws_central_infrastructure.artifact_stores.lib.code_artifact_promotion --package pypi my-package 1.2.0 --dry-run`
+"""
+
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
+from typing import TYPE_CHECKING
+
+import boto3
+from botocore.exceptions import BotoCoreError
+from botocore.exceptions import ClientError
+from pydantic import BaseModel
+from pydantic import Field
+
+from .code_artifact_package_groups import PackageType
+from .code_artifact_package_groups import split_package_namespace
+
+if TYPE_CHECKING:
+    from mypy_boto3_codeartifact import CodeArtifactClient
+
+logger = logging.getLogger(__name__)
+
+MAX_VERSIONS_PER_COPY = 100  # the CopyPackageVersions limit
+DEFAULT_MAX_WORKERS = 8
+
+
+class PackagePromotion(BaseModel):
+    package_type: PackageType
+    package_name: str  # including any npm scope
+    versions: list[str]
+
+    def version_label(self, version: str) -> str:
+        return f"{self.package_type}:{self.package_name}@{version}"
+
+
+class PromotionBatch(BaseModel):
+    promotion: PackagePromotion
+    versions: list[str]
+
+
+class PromotionReport(BaseModel):
+    dry_run: bool
+    promoted: list[str] = Field(default_factory=list)  # copied, or would be copied in a dry run
+    already_promoted: list[str] = Field(default_factory=list)
+    missing_from_source: list[str] = Field(default_factory=list)
+    failed: dict[str, str] = Field(default_factory=dict)  # version label to the error
+
+
+class PromotionTarget(BaseModel):
+    domain: str
+    source_repository: str
+    destination_repository: str
+
+
+def plan_promotion_batches(
+    promotions: list[PackagePromotion], *, batch_size: int = MAX_VERSIONS_PER_COPY
+) -> list[PromotionBatch]:
+    """Split each package's versions into batches small enough for a single `CopyPackageVersions` call."""
+    return [
+        PromotionBatch(promotion=promotion, versions=list(versions))
+        for promotion in promotions
+        for versions in batched(sorted(set(promotion.versions)), batch_size, strict=False)
+    ]
+
+
+def _package_kwargs(promotion: PackagePromotion) -> dict[str, str]:
+    namespace, name = split_package_namespace(package_type=promotion.package_type, package_name=promotion.package_name)
+    kwargs = {"format": promotion.package_type, "package": name}
+    if namespace:
+        kwargs["namespace"] = namespace
+    return kwargs
+
+
+def _list_versions(
+    client: "CodeArtifactClient", *, domain: str, repository: str, promotion: PackagePromotion
+) -> set[str]:
+    try:
+        return {
+            version["version"]
+            for page in client.get_paginator("list_package_versions").paginate(
+                domain=domain,
+                repository=repository,
+                **_package_kwargs(promotion),  # pyright: ignore[reportArgumentType] # the format is one of the literals
+            )
+            for version in page["versions"]
+        }
+    except client.exceptions.ResourceNotFoundException:
+        return set()  # the package has never been published to this repository
+
+
+def _plan_batch(client: "CodeArtifactClient", *, target: PromotionTarget, batch: PromotionBatch) -> PromotionReport:
+    try:
+        source_versions = _list_versions(
+            client, domain=target.domain, repository=target.source_repository, promotion=batch.promotion
+        )
+        destination_versions = _list_versions(
+            client, domain=target.domain, repository=target.destination_repository, promotion=batch.promotion
+        )
+    except (ClientError, BotoCoreError) as e:
+        # the same as when copying, one batch failing shouldn't lose the rest of the dry run's report
+        return PromotionReport(
+            dry_run=True,
+            failed=dict.fromkeys((batch.promotion.version_label(version) for version in batch.versions), str(e)),
+        )
+    report = PromotionReport(dry_run=True)
+    for version in batch.versions:
+        label = batch.promotion.version_label(version)
+        if version in destination_versions:
+            report.already_promoted.append(label)
+        elif version not in source_versions:
+            report.missing_from_source.append(label)
+        else:
+            report.promoted.append(label)
+    return report
+
+
+def _copy_batch(client: "CodeArtifactClient", *, target: PromotionTarget, batch: PromotionBatch) -> PromotionReport:
+    labels = [batch.promotion.version_label(version) for version in batch.versions]
+    try:
+        response = client.copy_package_versions(
+            domain=target.domain,
+            sourceRepository=target.source_repository,
+            destinationRepository=target.destination_repository,
+            versions=batch.versions,
+            allowOverwrite=False,  # a promoted version must never change under anyone who already installed it
+            includeFromUpstream=False,
+            **_package_kwargs(batch.promotion),  # pyright: ignore[reportArgumentType] # the format is one of the literals
+        )
+    except client.exceptions.ResourceNotFoundException:
+        # the package has never been published to the source repository, so none of its versions can be copied
+        return PromotionReport(dry_run=False, missing_from_source=labels)
+    except (ClientError, BotoCoreError) as e:
+        # one batch failing (e.g. throttled) shouldn't lose the results of the batches that already ran
+        return PromotionReport(dry_run=False, failed=dict.fromkeys(labels, str(e)))
+    report = PromotionReport(
+        dry_run=False,
+        promoted=[batch.promotion.version_label(version) for version in response.get("successfulVersions", {})],
+    )
+    for version, error in response.get("failedVersions", {}).items():
+        label = batch.promotion.version_label(version)
+        match error.get("errorCode"):
+            case "ALREADY_EXISTS":
+                report.already_promoted.append(label)
+            case "NOT_FOUND":
+                report.missing_from_source.append(label)
+            case _:
+                report.failed[label] = error.get("errorMessage", error.get("errorCode", "unknown error"))
+    return report
+
+
+def promote_package_versions(
+    client: "CodeArtifactClient",
+    promotions: list[PackagePromotion],
+    *,
+    target: PromotionTarget,
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> PromotionReport:
+    """Copy the versions to the destination, or in a dry run only report what would be copied."""
+    run_batch = _plan_batch if dry_run else _copy_batch
+    # boto3 clients are thread safe, so the one client is shared by every worker
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        batch_reports = list(
+            executor.map(
+                lambda batch: run_batch(client, target=target, batch=batch), plan_promotion_batches(promotions)
+            )
+        )
+    report = PromotionReport(dry_run=dry_run)
+    for batch_report in batch_reports:
+        report.promoted.extend(batch_report.promoted)
+        report.already_promoted.extend(batch_report.already_promoted)
+        report.missing_from_source.extend(batch_report.missing_from_source)
+        report.failed.update(batch_report.failed)
+    for labels in (report.promoted, report.already_promoted, report.missing_from_source):
+        labels.sort()
+    return report
+
+
+def main() -> None:
+    from .code_artifact import CODE_ARTIFACT_DOMAIN_NAME  # noqa: PLC0415 # code_artifact imports the Pulumi providers, which aren't needed unless this runs as a CLI
+    from .code_artifact import PRIMARY_REPO_NAME  # noqa: PLC0415 # code_artifact imports the Pulumi providers, which aren't needed unless this runs as a CLI
+    from .code_artifact import STAGING_REPO_NAME  # noqa: PLC0415 # code_artifact imports the Pulumi providers, which aren't needed unless this runs as a CLI
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _ = parser.add_argument(
+        "--package",
+        action="append",
+        nargs="+",
+        required=True,
+        metavar=("TYPE", "NAME VERSION"),
+        help="the package type (pypi, npm or nuget), the package name, then the versions to promote",
+    )
+    _ = parser.add_argument("--dry-run", action="store_true")
+    _ = parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    _ = parser.add_argument("--region", default=None, help="the org home region, defaults to the AWS CLI's region")
+    args = parser.parse_args()
+    for package in args.package:
+        if len(package) < 3:  # noqa: PLR2004 # the type, the name and at least one version
+            parser.error(f"--package needs a type, a name and at least one version, got: {' '.join(package)}")
+    promotions = [
+        PackagePromotion(package_type=package_type, package_name=package_name, versions=versions)
+        for package_type, package_name, *versions in args.package
+    ]
+    report = promote_package_versions(
+        boto3.client("codeartifact", region_name=args.region),
+        promotions,
+        target=PromotionTarget(
+            domain=CODE_ARTIFACT_DOMAIN_NAME,
+            source_repository=STAGING_REPO_NAME,
+            destination_repository=PRIMARY_REPO_NAME,
+        ),
+        dry_run=args.dry_run,
+        max_workers=args.max_workers,
+    )
+    print(report.model_dump_json(indent=2))  # noqa: T201 # this is a CLI
+    if report.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
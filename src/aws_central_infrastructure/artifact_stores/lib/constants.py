@@ -0,0 +1,14 @@
+from typing import Literal
+
+# Create one `GHA-ECR-Push--<git repo>` role per git repo (allowed to push to all of its ECR repositories) instead of one `GHA-ECR-Push-<ECR repo>` role per ECR repository.
+# Enabling it deletes the per-repository roles, so update the GitHub workflows that assume them at the same time.
+USE_CONSOLIDATED_ECR_PUSH_ROLES = False
+# BASIC scanning is free and only scans on push, ENHANCED uses Amazon Inspector (billed per image scanned) and can also scan continuously
+ECR_REGISTRY_SCAN_TYPE: Literal["BASIC", "ENHANCED"] = "BASIC"
+# Create the ECR pull through cache rules (ECR Public, plus any in `define_pull_through_caches`) and the registry policy letting the org's accounts pull through them.
+# Every image pulled through a rule is stored (and billed) in the central account, and the registry policy replaces any that already exists.
+USE_ECR_PULL_THROUGH_CACHES = False
+# Create one `GHA-CA-Publish-<git repo>` role per repo with package claims, publishing to both staging and primary, instead of separate `GHA-CA-Staging-*` and `GHA-CA-Primary-*` roles.
+# It's only assumable from the repo's `codeartifact-publishing` GitHub environment, which only main can deploy to, so other branches can no longer publish to staging.
+# Enabling it also creates that GitHub environment, and deletes the old roles, so update the GitHub workflows that assume them at the same time.
+USE_SINGLE_CODE_ARTIFACT_PUBLISHING_ROLE = False
@@ -2,6 +2,7 @@ import json
 import logging
 from typing import ClassVar
 
+import pulumi_aws
 from ephemeral_pulumi_deploy import append_resource_suffix
 from ephemeral_pulumi_deploy import common_tags_native
 from ephemeral_pulumi_deploy import get_aws_account_id
@@ -21,13 +22,24 @@ from aws_central_infrastructure.iac_management.lib import ECR_PULL_STATEMENT
 from aws_central_infrastructure.iac_management.lib import GithubOidcConfig
 from aws_central_infrastructure.iac_management.lib import principal_in_org_condition
 
+from .constants import USE_CONSOLIDATED_ECR_PUSH_ROLES
+from .ecr_lifecycle import EcrLifecycleConfig
+from .ecr_lifecycle import lifecycle_policy_text
+
 logger = logging.getLogger(__name__)
 
 
+class ConflictingEcrRepoOrgsError(Exception):
+    def __init__(self, *, repo_name: str, repo_orgs: list[str]):
+        super().__init__(
+            f"The ECR repositories pushed to by {repo_name} list more than one GitHub org for it ({', '.join(sorted(repo_orgs))}), but push roles are named after the repo alone"
+        )
+
+
 class RepoEcrClaims(BaseModel):
     repo_name: str
     repo_org: str = CENTRAL_INFRA_GITHUB_ORG_NAME
-    ecr_repo_names: set[str] = Field(default_factory=set)
+    ecr_repo_names: set[str] = Field(default_factory=set)  # the full names, including any namespace
 
 
 class EcrConfig(BaseModel):
@@ -35,6 +47,11 @@ class EcrConfig(BaseModel):
     git_repo_org: str | None = CENTRAL_INFRA_GITHUB_ORG_NAME
     ecr_repo_name: str
     ecr_repo_namespace: str | None = None
+    lifecycle: EcrLifecycleConfig | None = None  # without one, every image pushed is kept forever
+    replicate: bool = True  # to the regions in define_ecr_replication_regions
+    scan_on_push: bool = True
+    continuous_scan: bool = False  # rescan as new CVEs are published, requires ECR_REGISTRY_SCAN_TYPE = "ENHANCED"
+    signing_profile_arn: str | None = None  # an AWS Signer profile that ECR signs every pushed image with
 
     @property
     def ecr_repo_full_name_for_arn(self) -> str:
@@ -45,10 +62,55 @@ class EcrConfig(BaseModel):
         return self.ecr_repo_full_name_for_arn.replace("/", "-")
 
 
+def group_ecr_claims(configs: list[EcrConfig]) -> list[RepoEcrClaims]:
+    """Collect the ECR repositories each git repo pushes to, so each git repo needs only one push role."""
+    claims_by_repo_name: dict[str, RepoEcrClaims] = {}
+    for config in configs:
+        if config.git_repo_org is None or config.git_repo_name is None:
+            continue
+        claims = claims_by_repo_name.setdefault(
+            config.git_repo_name, RepoEcrClaims(repo_name=config.git_repo_name, repo_org=config.git_repo_org)
+        )
+        if claims.repo_org != config.git_repo_org:
+            raise ConflictingEcrRepoOrgsError(
+                repo_name=config.git_repo_name, repo_orgs=[claims.repo_org, config.git_repo_org]
+            )
+        claims.ecr_repo_names.add(config.ecr_repo_full_name_for_arn)
+    return list(claims_by_repo_name.values())
+
+
+def org_read_repository_policy(org_id: str) -> str:
+    return get_policy_document(
+        statements=[
+            GetPolicyDocumentStatementArgs(
+                effect="Allow",
+                sid="CrossAccountRead",
+                actions=["ecr:BatchGetImage", "ecr:GetDownloadUrlForLayer", "ecr:DescribeImages"],
+                principals=[
+                    GetPolicyDocumentStatementPrincipalArgs(
+                        type="*",
+                        identifiers=["*"],
+                    )
+                ],
+                conditions=[principal_in_org_condition(org_id)],
+            ),
+            # TODO: allow allow creating image-based Lambda functions that pull from the ECR, additional permissions needed according to https://docs.aws.amazon.com/lambda/latest/dg/configuration-images.html#configuration-images-permissions
+            # this is going to need to enumerate the list of all accounts in the org and add them to the policy
+        ]
+    ).json
+
+
 class Ecr(ComponentResource):
     _max_ecr_name_length: ClassVar[int] = 205
 
-    def __init__(self, *, config: EcrConfig, central_infra_oidc_provider_arn: str, org_id: str):
+    def __init__(
+        self,
+        *,
+        config: EcrConfig,
+        central_infra_oidc_provider_arn: str,
+        org_id: str,
+        create_push_role: bool = True,  # False when the git repo's consolidated EcrPushRole covers it
+    ):
         super().__init__(
             "labauto:Ecr",
             append_resource_suffix(config.ecr_repo_full_name_for_resource, max_length=self._max_ecr_name_length),
@@ -60,30 +122,17 @@ class Ecr(ComponentResource):
             repository_name=config.ecr_repo_full_name_for_arn,
             empty_on_delete=True,  # note, there's an upstream bug in CloudFormation that causes this to not work as expected https://github.com/pulumi/pulumi-aws-native/issues/1270
             image_tag_mutability=ecr.RepositoryImageTagMutability.IMMUTABLE,
-            repository_policy_text=json.loads(
-                get_policy_document(
-                    statements=[
-                        GetPolicyDocumentStatementArgs(
-                            effect="Allow",
-                            sid="CrossAccountRead",
-                            actions=["ecr:BatchGetImage", "ecr:GetDownloadUrlForLayer", "ecr:DescribeImages"],
-                            principals=[
-                                GetPolicyDocumentStatementPrincipalArgs(
-                                    type="*",
-                                    identifiers=["*"],
-                                )
-                            ],
-                            conditions=[principal_in_org_condition(org_id)],
-                        ),
-                        # TODO: allow allow creating image-based Lambda functions that pull from the ECR, additional permissions needed according to https://docs.aws.amazon.com/lambda/latest/dg/configuration-images.html#configuration-images-permissions
-                        # this is going to need to enumerate the list of all accounts in the org and add them to the policy
-                    ]
-                ).json
+            image_scanning_configuration=ecr.RepositoryImageScanningConfigurationArgs(scan_on_push=config.scan_on_push),
+            repository_policy_text=json.loads(org_read_repository_policy(org_id)),
+            lifecycle_policy=None
+            if config.lifecycle is None
+            else ecr.RepositoryLifecyclePolicyArgs(
+                lifecycle_policy_text=lifecycle_policy_text(config.lifecycle.to_rules())
             ),
             opts=ResourceOptions(parent=self),
             tags=common_tags_native(),
         )
-        if config.git_repo_org is not None and config.git_repo_name is not None:
+        if create_push_role and config.git_repo_org is not None and config.git_repo_name is not None:
             _ = GithubOidcConfig(
                 aws_account_id=get_aws_account_id(),
                 repo_org=config.git_repo_org,
@@ -118,11 +167,67 @@ class Ecr(ComponentResource):
             ).create_role(provider_arn=central_infra_oidc_provider_arn, parent=self)
 
 
-def create_ecrs(*, ecr_configs: list[EcrConfig], central_infra_oidc_provider_arn: str, org_id: str):
-    for config in [
+class EcrPushRole(ComponentResource):
+    """A single role for a git repo's workflows to push to all of its ECR repositories."""
+
+    def __init__(self, *, claims: RepoEcrClaims, central_infra_oidc_provider_arn: str):
+        super().__init__("labauto:EcrPushRole", append_resource_suffix(claims.repo_name), None)
+        # the ARNs are built from the names rather than from the repositories' outputs, so the policy document is a
+        # single invoke that doesn't wait for anything to be created
+        region = pulumi_aws.config.region
+        account_id = get_aws_account_id()
+        self.role = GithubOidcConfig(
+            aws_account_id=account_id,
+            repo_org=claims.repo_org,
+            repo_name=claims.repo_name,
+            restrictions="*",
+            role_name=f"GHA-ECR-Push--{claims.repo_name}",
+            role_policy=iam.RolePolicyArgs(
+                policy_name="PushToEcr",
+                policy_document=get_policy_document(
+                    statements=[
+                        ECR_AUTH_STATEMENT,
+                        ECR_PULL_STATEMENT,
+                        GetPolicyDocumentStatementArgs(
+                            effect="Allow",
+                            sid="ImagePush",
+                            actions=[
+                                "ecr:BatchCheckLayerAvailability",
+                                "ecr:InitiateLayerUpload",
+                                "ecr:UploadLayerPart",
+                                "ecr:CompleteLayerUpload",
+                                "ecr:PutImage",
+                            ],
+                            resources=[
+                                f"arn:aws:ecr:{region}:{account_id}:repository/{ecr_repo_name}"
+                                for ecr_repo_name in sorted(claims.ecr_repo_names)
+                            ],
+                        ),
+                    ]
+                ).json,
+            ),
+        ).create_role(provider_arn=central_infra_oidc_provider_arn, parent=self)
+
+
+def with_default_ecr_configs(ecr_configs: list[EcrConfig]) -> list[EcrConfig]:
+    return [
         *ecr_configs,
         EcrConfig(  # TODO: allow uploading to this via the Manual Artifact Upload permission set
             ecr_repo_name="manual-artifacts"
         ),
-    ]:
-        _ = Ecr(config=config, central_infra_oidc_provider_arn=central_infra_oidc_provider_arn, org_id=org_id)
+    ]
+
+
+def create_ecrs(*, ecr_configs: list[EcrConfig], central_infra_oidc_provider_arn: str, org_id: str) -> list[EcrConfig]:
+    all_configs = with_default_ecr_configs(ecr_configs)
+    for config in all_configs:
+        _ = Ecr(
+            config=config,
+            central_infra_oidc_provider_arn=central_infra_oidc_provider_arn,
+            org_id=org_id,
+            create_push_role=not USE_CONSOLIDATED_ECR_PUSH_ROLES,
+        )
+    if USE_CONSOLIDATED_ECR_PUSH_ROLES:
+        for claims in group_ecr_claims(all_configs):
+            _ = EcrPushRole(claims=claims, central_infra_oidc_provider_arn=central_infra_oidc_provider_arn)
+    return all_configs
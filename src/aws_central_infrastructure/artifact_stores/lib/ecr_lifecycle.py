@@ -0,0 +1,200 @@
+"""ECR lifecycle policies, and a local simulator to see what a policy would expire before applying it.
+
+Example (with the listing from `aws ecr describe-images --repository-name my-project/backend > images.json`):
+`uv run python -m aws_central_infrastructure.artifact_stores.lib.ecr_lifecycle my-project/backend images.json`
+"""
+
+import argparse
+import json
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Literal
+
+from pydantic import BaseModel
+from pydantic import Field
+
+if TYPE_CHECKING:
+    from .ecr import EcrConfig
+
+type LifecycleTagStatus = Literal["tagged", "untagged", "any"]
+type LifecycleCountType = Literal["imageCountMoreThan", "sinceImagePushed"]
+
+
+class TaggedRuleWithoutPrefixesError(Exception):
+    def __init__(self, description: str):
+        super().__init__(
+            f"The lifecycle rule '{description}' selects tagged images, so it needs at least one tag prefix"
+        )
+
+
+class UnknownEcrRepositoryError(Exception):
+    def __init__(self, ecr_repo_name: str):
+        super().__init__(f"No ECR repository named {ecr_repo_name} is defined in container_registries.py")
+
+
+class EcrLifecycleRule(BaseModel):
+    """A single rule of an ECR lifecycle policy, its priority is its position in the policy."""
+
+    description: str
+    tag_status: LifecycleTagStatus
+    tag_prefixes: list[str] = Field(default_factory=list)  # an image must have a tag starting with each one
+    count_type: LifecycleCountType
+    count_number: int = Field(ge=1)  # images beyond the newest N, or days since pushed
+
+
+class EcrTagPrefixRetention(BaseModel):
+    tag_prefixes: list[str]
+    keep_last: int = Field(ge=1)
+
+
+class EcrLifecycleConfig(BaseModel):
+    """The common retention rules, in the order ECR needs them: tag prefix rules, then untagged, then everything else.
+
+    Once a rule selects an image, lower priority rules never see it, so images matching a tag prefix rule are only
+    ever expired by that rule.
+    """
+
+    tag_prefix_rules: list[EcrTagPrefixRetention] = Field(default_factory=list)
+    expire_untagged_after_days: int | None = Field(default=7, ge=1)
+    keep_last: int | None = Field(default=None, ge=1)  # across all images not selected by an earlier rule
+
+    def to_rules(self) -> list[EcrLifecycleRule]:
+        rules = [
+            EcrLifecycleRule(
+                description=f"Keep the last {rule.keep_last} images tagged {'+'.join(rule.tag_prefixes)}*",
+                tag_status="tagged",
+                tag_prefixes=rule.tag_prefixes,
+                count_type="imageCountMoreThan",
+                count_number=rule.keep_last,
+            )
+            for rule in self.tag_prefix_rules
+        ]
+        if self.expire_untagged_after_days is not None:
+            rules.append(
+                EcrLifecycleRule(
+                    description=f"Expire untagged images after {self.expire_untagged_after_days} days",
+                    tag_status="untagged",
+                    count_type="sinceImagePushed",
+                    count_number=self.expire_untagged_after_days,
+                )
+            )
+        if self.keep_last is not None:
+            rules.append(
+                EcrLifecycleRule(
+                    description=f"Keep the last {self.keep_last} images",
+                    tag_status="any",
+                    count_type="imageCountMoreThan",
+                    count_number=self.keep_last,
+                )
+            )
+        return rules
+
+
+def lifecycle_policy_text(rules: list[EcrLifecycleRule]) -> str:
+    policy_rules: list[dict[str, Any]] = []
+    for priority, rule in enumerate(rules, start=1):
+        if rule.tag_status == "tagged" and not rule.tag_prefixes:
+            raise TaggedRuleWithoutPrefixesError(rule.description)
+        selection: dict[str, Any] = {
+            "tagStatus": rule.tag_status,
+            "countType": rule.count_type,
+            "countNumber": rule.count_number,
+        }
+        if rule.tag_prefixes:
+            selection["tagPrefixList"] = rule.tag_prefixes
+        if rule.count_type == "sinceImagePushed":
+            selection["countUnit"] = "days"
+        policy_rules.append(
+            {
+                "rulePriority": priority,
+                "description": rule.description,
+                "selection": selection,
+                "action": {"type": "expire"},
+            }
+        )
+    return json.dumps({"rules": policy_rules})
+
+
+class EcrImage(BaseModel):
+    digest: str
+    tags: list[str] = Field(default_factory=list)
+    pushed_at: datetime
+
+
+class LifecycleSimulation(BaseModel):
+    expired: list[EcrImage]
+    retained: list[EcrImage]
+    expired_digests_by_rule: dict[str, list[str]]  # keyed by rule description
+
+
+def _rule_selects(rule: EcrLifecycleRule, image: EcrImage) -> bool:
+    match rule.tag_status:
+        case "untagged":
+            return not image.tags
+        case "any":
+            return True
+        case "tagged":
+            return all(any(tag.startswith(prefix) for tag in image.tags) for prefix in rule.tag_prefixes)
+
+
+def simulate_lifecycle_policy(
+    rules: list[EcrLifecycleRule], images: list[EcrImage], *, now: datetime | None = None
+) -> LifecycleSimulation:
+    """Evaluate the rules the way ECR does, in priority order, with each image only considered by the first rule selecting it."""
+    now = now or datetime.now(tz=UTC)
+    unselected = sorted(images, key=lambda image: image.pushed_at, reverse=True)  # newest first
+    expired_digests: set[str] = set()
+    expired_digests_by_rule: dict[str, list[str]] = {}
+    for rule in rules:
+        selected = [image for image in unselected if _rule_selects(rule, image)]
+        unselected = [image for image in unselected if not _rule_selects(rule, image)]
+        if rule.count_type == "imageCountMoreThan":
+            rule_expired = selected[rule.count_number :]
+        else:
+            cutoff = now - timedelta(days=rule.count_number)
+            rule_expired = [image for image in selected if image.pushed_at < cutoff]
+        expired_digests.update(image.digest for image in rule_expired)
+        expired_digests_by_rule[rule.description] = [image.digest for image in rule_expired]
+    return LifecycleSimulation(
+        expired=[image for image in images if image.digest in expired_digests],
+        retained=[image for image in images if image.digest not in expired_digests],
+        expired_digests_by_rule=expired_digests_by_rule,
+    )
+
+
+def parse_describe_images(describe_images_output: dict[str, Any]) -> list[EcrImage]:
+    return [
+        EcrImage(
+            digest=image_detail["imageDigest"],
+            tags=image_detail.get("imageTags", []),
+            pushed_at=image_detail["imagePushedAt"],
+        )
+        for image_detail in describe_images_output["imageDetails"]
+    ]
+
+
+def main() -> None:
+    from ..container_registries import define_container_registries  # noqa: PLC0415 # the container registry definitions import this library, so they can't be imported at the top
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _ = parser.add_argument("ecr_repo_name", help="the full name of the repository, including any namespace")
+    _ = parser.add_argument("describe_images_json", type=Path)
+    args = parser.parse_args()
+    ecr_configs: list[EcrConfig] = []
+    define_container_registries(ecr_configs)
+    config = next((config for config in ecr_configs if config.ecr_repo_full_name_for_arn == args.ecr_repo_name), None)
+    if config is None:
+        raise UnknownEcrRepositoryError(args.ecr_repo_name)
+    simulation = simulate_lifecycle_policy(
+        [] if config.lifecycle is None else config.lifecycle.to_rules(),
+        parse_describe_images(json.loads(args.describe_images_json.read_text())),
+    )
+    print(simulation.model_dump_json(indent=2))  # noqa: T201 # this is a CLI
+
+
+if __name__ == "__main__":
+    main()
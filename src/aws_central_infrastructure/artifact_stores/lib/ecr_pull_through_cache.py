@@ -0,0 +1,168 @@
+import logging
+
+import pulumi_aws
+from ephemeral_pulumi_deploy import append_resource_suffix
+from ephemeral_pulumi_deploy import common_tags
+from ephemeral_pulumi_deploy import common_tags_native
+from ephemeral_pulumi_deploy import get_aws_account_id
+from lab_auto_pulumi import ORG_MANAGED_SSM_PARAM_PREFIX
+from lab_auto_pulumi import AwsLogicalWorkload
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_aws.iam import GetPolicyDocumentStatementArgs
+from pulumi_aws.iam import GetPolicyDocumentStatementPrincipalArgs
+from pulumi_aws.iam import get_policy_document
+from pulumi_aws.secretsmanager import get_secret_output
+from pulumi_aws_native import ecr
+from pulumi_aws_native import ssm
+from pydantic import BaseModel
+
+from aws_central_infrastructure.iac_management.lib import create_providers
+from aws_central_infrastructure.iac_management.lib import load_workload_info
+from aws_central_infrastructure.iac_management.lib import principal_in_org_condition
+
+from .ecr import org_read_repository_policy
+
+logger = logging.getLogger(__name__)
+
+# ECR only lets pull through cache rules use secrets whose names start with this
+PULL_THROUGH_CACHE_SECRET_NAME_PREFIX = "ecr-pullthroughcache/"  # noqa: S105 # this is a name prefix, not a secret
+
+
+class DuplicatePullThroughCachePrefixError(Exception):
+    def __init__(self, ecr_repository_prefix: str):
+        super().__init__(
+            f"More than one pull through cache rule uses the ECR repository prefix {ecr_repository_prefix}"
+        )
+
+
+class InvalidPullThroughCacheSecretNameError(Exception):
+    def __init__(self, *, ecr_repository_prefix: str, secret_name: str):
+        super().__init__(
+            f"The pull through cache rule {ecr_repository_prefix} uses the secret {secret_name}, but ECR requires the secret name to start with {PULL_THROUGH_CACHE_SECRET_NAME_PREFIX}"
+        )
+
+
+class PullThroughCacheConfig(BaseModel):
+    ecr_repository_prefix: str  # images are pulled as <registry>/<prefix>/<upstream repository>:<tag>
+    upstream_registry_url: str
+    # Docker Hub and GitHub Container Registry require credentials, created manually in Secrets Manager in this account
+    credential_secret_name: str | None = None
+
+
+def validate_pull_through_cache_configs(configs: list[PullThroughCacheConfig]) -> None:
+    seen_prefixes: set[str] = set()
+    for config in configs:
+        if config.ecr_repository_prefix in seen_prefixes:
+            raise DuplicatePullThroughCachePrefixError(config.ecr_repository_prefix)
+        seen_prefixes.add(config.ecr_repository_prefix)
+        if config.credential_secret_name is not None and not config.credential_secret_name.startswith(
+            PULL_THROUGH_CACHE_SECRET_NAME_PREFIX
+        ):
+            raise InvalidPullThroughCacheSecretNameError(
+                ecr_repository_prefix=config.ecr_repository_prefix, secret_name=config.credential_secret_name
+            )
+
+
+def pull_through_cache_repository_uri_prefix(*, account_id: str, region: str, ecr_repository_prefix: str) -> str:
+    return f"{account_id}.dkr.ecr.{region}.amazonaws.com/{ecr_repository_prefix}"
+
+
+class PullThroughCaches(ComponentResource):
+    """Cache public registry images in this account's ECR, so the org pulls them in-region and without upstream rate limits.
+
+    The cached repositories are created by ECR on the first pull, with the org wide read policy from the creation
+    template. The registry policy lets any account in the org trigger that first pull.
+    """
+
+    def __init__(self, *, configs: list[PullThroughCacheConfig], org_id: str):
+        super().__init__("labauto:EcrPullThroughCaches", append_resource_suffix(), None)
+        validate_pull_through_cache_configs(configs)
+        self.configs = configs
+        self.rules: list[ecr.PullThroughCacheRule] = []
+        for config in configs:
+            rule = ecr.PullThroughCacheRule(
+                append_resource_suffix(f"pull-through-{config.ecr_repository_prefix}", max_length=150),
+                ecr_repository_prefix=config.ecr_repository_prefix,
+                upstream_registry_url=config.upstream_registry_url,
+                credential_arn=None
+                if config.credential_secret_name is None
+                else get_secret_output(name=config.credential_secret_name).arn,
+                opts=ResourceOptions(parent=self),
+            )
+            self.rules.append(rule)
+            _ = ecr.RepositoryCreationTemplate(
+                append_resource_suffix(f"pull-through-{config.ecr_repository_prefix}", max_length=150),
+                prefix=config.ecr_repository_prefix,
+                applied_for=[ecr.RepositoryCreationTemplateAppliedForItem.PULL_THROUGH_CACHE],
+                description=f"Repositories cached from {config.upstream_registry_url}",
+                # upstream tags (e.g. `latest`) move, and the cache has to follow them
+                image_tag_mutability=ecr.RepositoryCreationTemplateImageTagMutability.MUTABLE,
+                repository_policy=org_read_repository_policy(org_id),
+                resource_tags=[
+                    ecr.RepositoryCreationTemplateTagArgs(key=tag.key, value=tag.value) for tag in common_tags_native()
+                ],
+                opts=ResourceOptions(parent=rule),
+            )
+        if not configs:
+            return
+        region = pulumi_aws.config.region
+        account_id = get_aws_account_id()
+        _ = ecr.RegistryPolicy(
+            append_resource_suffix("pull-through-caches"),
+            policy_text=get_policy_document(
+                statements=[
+                    GetPolicyDocumentStatementArgs(
+                        effect="Allow",
+                        sid="OrgPullThroughCacheImport",
+                        actions=["ecr:CreateRepository", "ecr:BatchImportUpstreamImage"],
+                        principals=[GetPolicyDocumentStatementPrincipalArgs(type="*", identifiers=["*"])],
+                        resources=[
+                            f"arn:aws:ecr:{region}:{account_id}:repository/{config.ecr_repository_prefix}/*"
+                            for config in configs
+                        ],
+                        conditions=[principal_in_org_condition(org_id)],
+                    )
+                ]
+            ).json,
+            opts=ResourceOptions(parent=self),
+        )
+
+
+class PullThroughCacheSsmParameters(ComponentResource):
+    """Publish each rule's repository URI prefix in the workload's accounts, so they can build image references."""
+
+    def __init__(self, *, workload_info: AwsLogicalWorkload, configs: list[PullThroughCacheConfig]):
+        super().__init__("labauto:EcrPullThroughCacheSsmParameters", append_resource_suffix(workload_info.name), None)
+        all_accounts = [*workload_info.prod_accounts, *workload_info.staging_accounts, *workload_info.dev_accounts]
+        providers = create_providers(aws_accounts=all_accounts, parent=self)
+        region = str(pulumi_aws.config.region)
+        account_id = get_aws_account_id()
+        for account in all_accounts:
+            for config in configs:
+                _ = ssm.Parameter(
+                    append_resource_suffix(
+                        f"pull-through-{config.ecr_repository_prefix}-{workload_info.name}-{account.id}",
+                        max_length=100,
+                    ),
+                    type=ssm.ParameterType.STRING,
+                    name=f"{ORG_MANAGED_SSM_PARAM_PREFIX}/ecr-pull-through-caches/{config.ecr_repository_prefix}/repository-uri-prefix",
+                    value=pull_through_cache_repository_uri_prefix(
+                        account_id=account_id, region=region, ecr_repository_prefix=config.ecr_repository_prefix
+                    ),
+                    opts=ResourceOptions(provider=providers[account.id], parent=self, delete_before_replace=True),
+                    tags=common_tags(),
+                )
+
+
+def create_pull_through_caches(*, configs: list[PullThroughCacheConfig], org_id: str) -> None:
+    all_configs = [
+        *configs,
+        PullThroughCacheConfig(  # ECR Public needs no credentials, so it's always cached
+            ecr_repository_prefix="ecr-public", upstream_registry_url="public.ecr.aws"
+        ),
+    ]
+    _ = PullThroughCaches(configs=all_configs, org_id=org_id)
+    workloads_dict, _ = load_workload_info()
+    for workload_info in workloads_dict.values():
+        _ = PullThroughCacheSsmParameters(workload_info=workload_info, configs=all_configs)
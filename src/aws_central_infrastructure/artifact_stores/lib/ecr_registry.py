@@ -0,0 +1,113 @@
+from typing import Literal
+
+from ephemeral_pulumi_deploy import append_resource_suffix
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_aws_native import ecr
+from pydantic import BaseModel
+
+from .ecr import EcrConfig
+
+type ScanFrequency = Literal["SCAN_ON_PUSH", "CONTINUOUS_SCAN"]
+MAX_SCANNING_FILTERS_PER_RULE = 100
+
+
+class ContinuousScanRequiresEnhancedScanningError(Exception):
+    def __init__(self, ecr_repo_names: list[str]):
+        super().__init__(
+            f"Continuous scanning needs ECR_REGISTRY_SCAN_TYPE = 'ENHANCED', but these repositories request it with BASIC scanning: {', '.join(ecr_repo_names)}"
+        )
+
+
+class TooManyScanningFiltersError(Exception):
+    def __init__(self, *, scan_frequency: ScanFrequency, filter_count: int):
+        super().__init__(
+            f"ECR allows {MAX_SCANNING_FILTERS_PER_RULE} repository filters per scanning rule, but the {scan_frequency} rule needs {filter_count}"
+        )
+
+
+class RegistryScanningRule(BaseModel):
+    scan_frequency: ScanFrequency
+    ecr_repo_names: list[str]
+
+
+class RegistrySigningRule(BaseModel):
+    signing_profile_arn: str
+    ecr_repo_names: list[str]
+
+
+def plan_registry_scanning_rules(
+    *, configs: list[EcrConfig], scan_type: Literal["BASIC", "ENHANCED"]
+) -> list[RegistryScanningRule]:
+    """Group the managed repositories by how often they're scanned, since the registry setting overrides the repository one."""
+    continuous = sorted(config.ecr_repo_full_name_for_arn for config in configs if config.continuous_scan)
+    if continuous and scan_type == "BASIC":
+        raise ContinuousScanRequiresEnhancedScanningError(continuous)
+    on_push = sorted(
+        config.ecr_repo_full_name_for_arn for config in configs if config.scan_on_push and not config.continuous_scan
+    )
+    rules = [
+        RegistryScanningRule(scan_frequency=scan_frequency, ecr_repo_names=ecr_repo_names)
+        for scan_frequency, ecr_repo_names in (("SCAN_ON_PUSH", on_push), ("CONTINUOUS_SCAN", continuous))
+        if ecr_repo_names
+    ]
+    for rule in rules:
+        if len(rule.ecr_repo_names) > MAX_SCANNING_FILTERS_PER_RULE:
+            raise TooManyScanningFiltersError(scan_frequency=rule.scan_frequency, filter_count=len(rule.ecr_repo_names))
+    return rules
+
+
+def plan_registry_signing_rules(configs: list[EcrConfig]) -> list[RegistrySigningRule]:
+    ecr_repo_names_by_profile: dict[str, list[str]] = {}
+    for config in configs:
+        if config.signing_profile_arn is not None:
+            ecr_repo_names_by_profile.setdefault(config.signing_profile_arn, []).append(
+                config.ecr_repo_full_name_for_arn
+            )
+    return [
+        RegistrySigningRule(signing_profile_arn=signing_profile_arn, ecr_repo_names=sorted(ecr_repo_names))
+        for signing_profile_arn, ecr_repo_names in sorted(ecr_repo_names_by_profile.items())
+    ]
+
+
+class EcrRegistrySettings(ComponentResource):
+    """The registry wide scanning and signing configuration, of which there can only be one per account and region."""
+
+    def __init__(self, *, configs: list[EcrConfig], scan_type: Literal["BASIC", "ENHANCED"]):
+        super().__init__("labauto:EcrRegistrySettings", append_resource_suffix(), None)
+        # repository names without wildcards, so only the repositories managed here are matched
+        _ = ecr.RegistryScanningConfiguration(
+            append_resource_suffix("ecr-scanning"),
+            scan_type=ecr.RegistryScanningConfigurationScanType(scan_type),
+            rules=[
+                ecr.RegistryScanningConfigurationScanningRuleArgs(
+                    scan_frequency=ecr.RegistryScanningConfigurationScanFrequency(rule.scan_frequency),
+                    repository_filters=[
+                        ecr.RegistryScanningConfigurationRepositoryFilterArgs(
+                            filter=ecr_repo_name, filter_type=ecr.RegistryScanningConfigurationFilterType.WILDCARD
+                        )
+                        for ecr_repo_name in rule.ecr_repo_names
+                    ],
+                )
+                for rule in plan_registry_scanning_rules(configs=configs, scan_type=scan_type)
+            ],
+            opts=ResourceOptions(parent=self),
+        )
+        signing_rules = plan_registry_signing_rules(configs)
+        if signing_rules:
+            _ = ecr.SigningConfiguration(
+                append_resource_suffix("ecr-signing"),
+                rules=[
+                    ecr.SigningConfigurationRuleArgs(
+                        signing_profile_arn=rule.signing_profile_arn,
+                        repository_filters=[
+                            ecr.SigningConfigurationRepositoryFilterArgs(
+                                filter=ecr_repo_name, filter_type=ecr.SigningConfigurationFilterType.WILDCARD_MATCH
+                            )
+                            for ecr_repo_name in rule.ecr_repo_names
+                        ],
+                    )
+                    for rule in signing_rules
+                ],
+                opts=ResourceOptions(parent=self),
+            )
@@ -0,0 +1,168 @@
+import logging
+
+import pulumi_aws
+from ephemeral_pulumi_deploy import append_resource_suffix
+from ephemeral_pulumi_deploy import common_tags
+from ephemeral_pulumi_deploy import common_tags_native
+from ephemeral_pulumi_deploy import get_aws_account_id
+from lab_auto_pulumi import ORG_MANAGED_SSM_PARAM_PREFIX
+from lab_auto_pulumi import AwsLogicalWorkload
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_aws_native import ecr
+from pulumi_aws_native import ssm
+
+from aws_central_infrastructure.iac_management.lib import create_central_native_provider
+from aws_central_infrastructure.iac_management.lib import create_providers
+from aws_central_infrastructure.iac_management.lib import load_workload_info
+
+from .ecr import EcrConfig
+from .ecr import org_read_repository_policy
+
+logger = logging.getLogger(__name__)
+
+MAX_REPLICATION_FILTERS_PER_RULE = 100
+MAX_REPLICATION_DESTINATIONS = 25
+ROOT_CREATION_TEMPLATE_PREFIX = "ROOT"  # ECR applies it to repositories in no namespace that has its own template
+
+
+class TooManyReplicationFiltersError(Exception):
+    def __init__(self, filter_count: int):
+        super().__init__(
+            f"ECR allows {MAX_REPLICATION_FILTERS_PER_RULE} repository filters per replication rule, but {filter_count} are needed. Group more repositories under shared namespaces"
+        )
+
+
+class InvalidReplicationRegionsError(Exception):
+    def __init__(self, *, home_region: str, regions: list[str]):
+        super().__init__(
+            f"ECR replication regions must be unique, at most {MAX_REPLICATION_DESTINATIONS}, and not include the home region {home_region}, but got {regions}"
+        )
+
+
+def ecr_registry_endpoint(*, account_id: str, region: str) -> str:
+    return f"{account_id}.dkr.ecr.{region}.amazonaws.com"
+
+
+def plan_replication_filters(configs: list[EcrConfig]) -> list[str]:
+    """Return the repository name prefixes to replicate, one per namespace and one per repository outside a namespace.
+
+    Prefixes already covered by a shorter prefix are dropped. Note that a repository outside a namespace also matches
+    any other repository whose name starts with its name.
+    """
+    prefixes = sorted(
+        {
+            f"{config.ecr_repo_namespace}/" if config.ecr_repo_namespace else config.ecr_repo_name
+            for config in configs
+            if config.replicate
+        }
+    )
+    filters: list[str] = []
+    for prefix in prefixes:  # sorted, so a covering prefix always comes before the ones it covers
+        if not any(prefix.startswith(existing) for existing in filters):
+            filters.append(prefix)
+    if len(filters) > MAX_REPLICATION_FILTERS_PER_RULE:
+        raise TooManyReplicationFiltersError(len(filters))
+    return filters
+
+
+def plan_replication_template_prefixes(configs: list[EcrConfig]) -> list[str]:
+    """Return the creation template prefixes for the replicated repositories, their namespaces plus ROOT for the rest.
+
+    Unlike the replication filters, a template's prefix only matches a namespace, so these are never collapsed.
+    """
+    replicated_configs = [config for config in configs if config.replicate]
+    prefixes = sorted({config.ecr_repo_namespace for config in replicated_configs if config.ecr_repo_namespace})
+    if any(not config.ecr_repo_namespace for config in replicated_configs):
+        prefixes.append(ROOT_CREATION_TEMPLATE_PREFIX)
+    return prefixes
+
+
+def validate_replication_regions(*, home_region: str, regions: list[str]) -> None:
+    if home_region in regions or len(set(regions)) != len(regions) or len(regions) > MAX_REPLICATION_DESTINATIONS:
+        raise InvalidReplicationRegionsError(home_region=home_region, regions=regions)
+
+
+class EcrReplication(ComponentResource):
+    """Replicate the org's repositories to other regions, so pulls there stay in-region.
+
+    ECR creates the replicated repositories itself, and the creation template in each region gives them the same org
+    wide read policy as the source repositories.
+    """
+
+    def __init__(self, *, configs: list[EcrConfig], regions: list[str], org_id: str):
+        super().__init__("labauto:EcrReplication", append_resource_suffix(), None)
+        validate_replication_regions(home_region=str(pulumi_aws.config.region), regions=regions)
+        filters = plan_replication_filters(configs)
+        account_id = get_aws_account_id()
+        self.replication_configuration = ecr.ReplicationConfiguration(
+            append_resource_suffix("ecr-replication"),
+            replication_configuration=ecr.ReplicationConfigurationArgs(
+                rules=[
+                    ecr.ReplicationConfigurationReplicationRuleArgs(
+                        destinations=[
+                            ecr.ReplicationConfigurationReplicationDestinationArgs(
+                                region=region, registry_id=account_id
+                            )
+                            for region in regions
+                        ],
+                        repository_filters=[
+                            ecr.ReplicationConfigurationRepositoryFilterArgs(
+                                filter=prefix, filter_type=ecr.ReplicationConfigurationFilterType.PREFIX_MATCH
+                            )
+                            for prefix in filters
+                        ],
+                    )
+                ]
+            ),
+            opts=ResourceOptions(parent=self),
+        )
+        for region in regions:
+            provider = create_central_native_provider(region=region, parent=self)
+            for prefix in plan_replication_template_prefixes(configs):
+                _ = ecr.RepositoryCreationTemplate(
+                    append_resource_suffix(f"replication-{prefix.replace('/', '-')}-{region}", max_length=150),
+                    prefix=prefix,
+                    applied_for=[ecr.RepositoryCreationTemplateAppliedForItem.REPLICATION],
+                    description="Repositories replicated from the org home region",
+                    image_tag_mutability=ecr.RepositoryCreationTemplateImageTagMutability.IMMUTABLE,
+                    repository_policy=org_read_repository_policy(org_id),
+                    resource_tags=[
+                        ecr.RepositoryCreationTemplateTagArgs(key=tag.key, value=tag.value)
+                        for tag in common_tags_native()
+                    ],
+                    opts=ResourceOptions(provider=provider, parent=self.replication_configuration),
+                )
+
+
+class EcrRegistryEndpointSsmParameters(ComponentResource):
+    """Publish the registry endpoint of each region the repositories are available in, in the workload's accounts."""
+
+    def __init__(self, *, workload_info: AwsLogicalWorkload, regions: list[str]):
+        super().__init__("labauto:EcrRegistryEndpointSsmParameters", append_resource_suffix(workload_info.name), None)
+        all_accounts = [*workload_info.prod_accounts, *workload_info.staging_accounts, *workload_info.dev_accounts]
+        providers = create_providers(aws_accounts=all_accounts, parent=self)
+        account_id = get_aws_account_id()
+        for account in all_accounts:
+            for region in regions:
+                _ = ssm.Parameter(
+                    append_resource_suffix(
+                        f"ecr-registry-endpoint-{region}-{workload_info.name}-{account.id}", max_length=100
+                    ),
+                    type=ssm.ParameterType.STRING,
+                    name=f"{ORG_MANAGED_SSM_PARAM_PREFIX}/ecr-registry-endpoints/{region}",
+                    value=ecr_registry_endpoint(account_id=account_id, region=region),
+                    opts=ResourceOptions(provider=providers[account.id], parent=self, delete_before_replace=True),
+                    tags=common_tags(),
+                )
+
+
+def create_ecr_replication(*, configs: list[EcrConfig], regions: list[str], org_id: str) -> None:
+    if not regions:
+        return
+    _ = EcrReplication(configs=configs, regions=regions, org_id=org_id)
+    workloads_dict, _ = load_workload_info()
+    for workload_info in workloads_dict.values():
+        _ = EcrRegistryEndpointSsmParameters(
+            workload_info=workload_info, regions=[str(pulumi_aws.config.region), *regions]
+        )
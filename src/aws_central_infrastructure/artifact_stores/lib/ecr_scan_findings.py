@@ -0,0 +1,160 @@
+"""Collect the scan findings of the most recent images in every managed ECR repository, into one compact summary.
+
+Each repository's images and findings are paged through on a thread pool, so a review of the whole registry takes
+about as long as the slowest repository rather than the sum of them all.
+
+Example (with credentials for the central account):
+`uv run python -m aws_central_infrastructure.artifact_stores.lib.ecr_scan_findings --images-per-repo 3 > findings.json`
+"""
+
+import argparse
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from typing import Any
+
+import boto3
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from mypy_boto3_ecr import ECRClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class ImageScanSummary(BaseModel):
+    repository_name: str
+    image_digest: str
+    image_tags: list[str]
+    scan_status: str
+    severity_counts: dict[str, int]
+    vulnerability_ids: list[str]
+
+
+class ScanFindingsReport(BaseModel):
+    images: list[ImageScanSummary]
+    total_severity_counts: dict[str, int]
+    top_vulnerabilities: list[tuple[str, int]]  # (vulnerability ID, number of images affected)
+
+
+def _finding_id(finding: dict[str, Any]) -> str | None:
+    # basic scanning names findings after the CVE, enhanced scanning nests it in the package vulnerability details
+    return finding.get("packageVulnerabilityDetails", {}).get("vulnerabilityId") or finding.get("name")
+
+
+def summarize_image_scan_findings(
+    *, repository_name: str, image_digest: str, image_tags: list[str], pages: Iterable[dict[str, Any]]
+) -> ImageScanSummary:
+    """Reduce the pages of `describe_image_scan_findings` to counts by severity and the distinct vulnerability IDs."""
+    scan_status = "NOT_SCANNED"
+    severity_counts: dict[str, int] = {}
+    vulnerability_ids: set[str] = set()
+    for page in pages:
+        scan_status = page.get("imageScanStatus", {}).get("status", scan_status)
+        findings = page.get("imageScanFindings", {})
+        severity_counts = findings.get("findingSeverityCounts", severity_counts)  # the same on every page
+        for finding in [*findings.get("findings", []), *findings.get("enhancedFindings", [])]:
+            finding_id = _finding_id(finding)
+            if finding_id is not None:
+                vulnerability_ids.add(finding_id)
+    return ImageScanSummary(
+        repository_name=repository_name,
+        image_digest=image_digest,
+        image_tags=image_tags,
+        scan_status=scan_status,
+        severity_counts=severity_counts,
+        vulnerability_ids=sorted(vulnerability_ids),
+    )
+
+
+def build_scan_findings_report(images: list[ImageScanSummary], *, top: int = 20) -> ScanFindingsReport:
+    total_severity_counts: Counter[str] = Counter()
+    images_affected: Counter[str] = Counter()
+    for image in images:
+        total_severity_counts.update(image.severity_counts)
+        images_affected.update(image.vulnerability_ids)
+    return ScanFindingsReport(
+        images=images,
+        total_severity_counts=dict(total_severity_counts),
+        top_vulnerabilities=images_affected.most_common(top),
+    )
+
+
+def _summarize_repository(client: "ECRClient", *, repository_name: str, images_per_repo: int) -> list[ImageScanSummary]:
+    image_details = [
+        image_detail
+        for page in client.get_paginator("describe_images").paginate(repositoryName=repository_name)
+        for image_detail in page.get("imageDetails", [])
+    ]
+    latest = sorted(image_details, key=lambda image_detail: image_detail["imagePushedAt"], reverse=True)[
+        :images_per_repo
+    ]
+    summaries: list[ImageScanSummary] = []
+    for image_detail in latest:
+        image_digest = image_detail["imageDigest"]
+        pages = (
+            client.get_paginator("describe_image_scan_findings").paginate(
+                repositoryName=repository_name, imageId={"imageDigest": image_digest}
+            )
+            if "imageScanStatus" in image_detail
+            else []  # never scanned, so there are no findings to describe
+        )
+        summaries.append(
+            summarize_image_scan_findings(
+                repository_name=repository_name,
+                image_digest=image_digest,
+                image_tags=image_detail.get("imageTags", []),
+                pages=pages,  # pyright: ignore[reportArgumentType] # the typed pages are TypedDicts
+            )
+        )
+    return summaries
+
+
+def collect_scan_findings(
+    client: "ECRClient",
+    repository_names: list[str],
+    *,
+    images_per_repo: int = 1,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[ImageScanSummary]:
+    # boto3 clients are thread safe, so the one client is shared by every worker
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        per_repository = executor.map(
+            lambda repository_name: _summarize_repository(
+                client, repository_name=repository_name, images_per_repo=images_per_repo
+            ),
+            repository_names,
+        )
+        return [summary for summaries in per_repository for summary in summaries]
+
+
+def main() -> None:
+    from ..container_registries import define_container_registries  # noqa: PLC0415 # the container registry definitions import this library, so they can't be imported at the top
+    from .ecr import EcrConfig  # noqa: PLC0415 # ecr imports the Pulumi providers, which aren't needed unless this runs as a CLI
+    from .ecr import with_default_ecr_configs  # noqa: PLC0415 # ecr imports the Pulumi providers, which aren't needed unless this runs as a CLI
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _ = parser.add_argument("--images-per-repo", type=int, default=1, help="the most recently pushed images to check")
+    _ = parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    _ = parser.add_argument("--top", type=int, default=20, help="the most widespread vulnerabilities to list")
+    _ = parser.add_argument("--region", default=None, help="the org home region, defaults to the AWS CLI's region")
+    args = parser.parse_args()
+    ecr_configs: list[EcrConfig] = []
+    define_container_registries(ecr_configs)
+    repository_names = [config.ecr_repo_full_name_for_arn for config in with_default_ecr_configs(ecr_configs)]
+    client = boto3.client("ecr", region_name=args.region)
+    report = build_scan_findings_report(
+        collect_scan_findings(
+            client, repository_names, images_per_repo=args.images_per_repo, max_workers=args.max_workers
+        ),
+        top=args.top,
+    )
+    print(report.model_dump_json(indent=2))  # noqa: T201 # this is a CLI
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import logging
+from collections.abc import Iterable
+from functools import cache
+
+from aws_central_infrastructure.iac_management.lib import CENTRAL_INFRA_GITHUB_ORG_NAME
+
+from .code_artifact import RepoPackageClaims
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateRepoPackageClaimsError(Exception):
+    def __init__(self, *, repo_org: str, repo_name: str):
+        super().__init__(
+            f"The repo {repo_org}/{repo_name} has more than one entry in the package claims, combine them into a single RepoPackageClaims"
+        )
+
+
+class ConflictingNpmScopeClaimError(Exception):
+    def __init__(self, *, scope: str, repo_names: list[str]):
+        super().__init__(
+            f"The npm scope @{scope} is claimed whole by one repo, so no other repo can claim it or packages in it, but it is claimed by: {', '.join(repo_names)}"
+        )
+
+
+def _validate_npm_scope_claims(package_claims: list[RepoPackageClaims]) -> None:
+    for claims in package_claims:
+        for scope in claims.npm_scopes:
+            repo_names = sorted(
+                other.repo_name
+                for other in package_claims
+                if scope in other.npm_scopes
+                or any(package_name.startswith(f"@{scope}/") for package_name in other.npm_package_names)
+            )
+            if repo_names != [claims.repo_name]:
+                raise ConflictingNpmScopeClaimError(scope=scope, repo_names=repo_names)
+
+
+class PackageClaimsIndex:
+    """The package claims keyed by the org and name of the git repo that owns them."""
+
+    def __init__(self, package_claims: Iterable[RepoPackageClaims]):
+        self._by_repo: dict[tuple[str, str], RepoPackageClaims] = {}
+        for claims in package_claims:
+            key = (claims.repo_org, claims.repo_name)
+            if key in self._by_repo:
+                raise DuplicateRepoPackageClaimsError(repo_org=claims.repo_org, repo_name=claims.repo_name)
+            self._by_repo[key] = claims
+        _validate_npm_scope_claims(self.claims)
+
+    @property
+    def claims(self) -> list[RepoPackageClaims]:
+        return list(self._by_repo.values())
+
+    def __contains__(self, repo: object) -> bool:
+        """Check for claims by a `(repo_org, repo_name)` pair."""
+        return repo in self._by_repo
+
+    def get(self, repo_name: str, *, repo_org: str = CENTRAL_INFRA_GITHUB_ORG_NAME) -> RepoPackageClaims | None:
+        return self._by_repo.get((repo_org, repo_name))
+
+    def find_unknown_repo_names(self, known_repo_names: Iterable[str]) -> list[str]:
+        """Find the claims for repos in this organization that are not in the given repo names."""
+        known = set(known_repo_names)
+        return [
+            repo_name
+            for repo_org, repo_name in self._by_repo
+            if repo_org == CENTRAL_INFRA_GITHUB_ORG_NAME and repo_name not in known
+        ]
+
+    def warn_about_unknown_repos(self, known_repo_names: Iterable[str]) -> list[str]:
+        unknown_repo_names = self.find_unknown_repo_names(known_repo_names)
+        for repo_name in unknown_repo_names:
+            logger.warning(
+                f"Package claims exist for the repo {repo_name}, but it is not managed in github_repos/repos.py, so no publishing environments will be created for it"
+            )
+        return unknown_repo_names
+
+
+@cache
+def get_package_claims_index() -> PackageClaimsIndex:
+    """Build the index from `internal_packages.py` once, and share it between every stack that uses the claims."""
+    from ..internal_packages import create_internal_packages_configs  # noqa: PLC0415 # internal_packages imports this lib package, so it can't be imported at module load
+
+    package_claims: list[RepoPackageClaims] = []
+    create_internal_packages_configs(package_claims)
+    return PackageClaimsIndex(package_claims)
@@ -5,16 +5,20 @@ from pulumi_aws.iam import get_open_id_connect_provider
 from pulumi_aws.organizations import get_organization
 
 from aws_central_infrastructure.iac_management.lib import GITHUB_OIDC_URL
+from aws_central_infrastructure.org_model.lib import get_org_model
 
-from ..ami_sharing import define_image_builders
-from ..container_registries import define_container_registries
-from ..internal_packages import create_internal_packages_configs
+from ..container_registries import define_ecr_replication_regions
+from ..container_registries import define_pull_through_caches
 from .code_artifact import CentralCodeArtifact
-from .code_artifact import RepoPackageClaims
-from .ecr import EcrConfig
+from .constants import ECR_REGISTRY_SCAN_TYPE
+from .constants import USE_ECR_PULL_THROUGH_CACHES
 from .ecr import create_ecrs
-from .image_builder import ImageBuilderConfig
+from .ecr_pull_through_cache import PullThroughCacheConfig
+from .ecr_pull_through_cache import create_pull_through_caches
+from .ecr_registry import EcrRegistrySettings
+from .ecr_replication import create_ecr_replication
 from .image_builder import create_image_builders
+from .package_claims import PackageClaimsIndex
 from .ssm_buckets import DistributorPackagesBucket
 from .ssm_buckets import ManualArtifactsBucket
 from .ssm_buckets import create_ssm_bucket_ssm_params
@@ -24,6 +28,7 @@ logger = logging.getLogger(__name__)
 
 def pulumi_program() -> None:
     """Execute creating the stack."""
+    org_model = get_org_model()
     # Create Resources Here
     central_code_artifact = CentralCodeArtifact()
     manual_artifacts_bucket = ManualArtifactsBucket()
@@ -34,17 +39,23 @@ def pulumi_program() -> None:
     export(
         "manual-artifacts-bucket-name", manual_artifacts_bucket.bucket.bucket_name
     )  # TODO: reference this by the Identity Center stack
-    package_claims: list[RepoPackageClaims] = []
-    create_internal_packages_configs(package_claims)
-    central_code_artifact.register_package_claims(package_claims)
-    image_builders: list[ImageBuilderConfig] = []
-    define_image_builders(image_builders)
+    central_code_artifact.register_package_claims(PackageClaimsIndex(org_model.package_claims.values()))
     create_image_builders(
-        image_builder_configs=image_builders,
+        image_builder_configs=org_model.image_builders,
         manual_artifacts_bucket_name=manual_artifacts_bucket.bucket.bucket_name,
     )
     org_id = get_organization().id
-    ecr_repos: list[EcrConfig] = []
     central_infra_oidc_provider_arn = get_open_id_connect_provider(url=GITHUB_OIDC_URL).arn
-    define_container_registries(ecr_repos)
-    create_ecrs(ecr_configs=ecr_repos, central_infra_oidc_provider_arn=central_infra_oidc_provider_arn, org_id=org_id)
+    all_ecr_configs = create_ecrs(
+        ecr_configs=org_model.ecr_configs,
+        central_infra_oidc_provider_arn=central_infra_oidc_provider_arn,
+        org_id=org_id,
+    )
+    _ = EcrRegistrySettings(configs=all_ecr_configs, scan_type=ECR_REGISTRY_SCAN_TYPE)
+    replication_regions: list[str] = []
+    define_ecr_replication_regions(replication_regions)
+    create_ecr_replication(configs=all_ecr_configs, regions=replication_regions, org_id=org_id)
+    if USE_ECR_PULL_THROUGH_CACHES:
+        pull_through_caches: list[PullThroughCacheConfig] = []
+        define_pull_through_caches(pull_through_caches)
+        create_pull_through_caches(configs=pull_through_caches, org_id=org_id)
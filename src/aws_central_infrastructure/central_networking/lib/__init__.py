@@ -1,4 +1,62 @@
 from .constants import CREATE_PRIVATE_SUBNET
+from .flow_log_analysis import FlowLogAggregator
+from .flow_log_analysis import FlowLogSummary
+from .flow_log_analysis import FlowLogTotal
+from .flow_log_analysis import iter_flow_log_records
+from .flow_log_analysis import iter_parquet_flow_log_records
+from .flow_log_analysis import iter_text_flow_log_records
+from .flow_log_analysis import summarize_flow_logs
+from .flow_logs import FLOW_LOG_FIELDS
+from .flow_logs import VpcFlowLogs
+from .flow_logs import VpcFlowLogsConfig
+from .instance_metadata import InstanceMetadataDefaultsFanOut
+from .instance_metadata import InvalidConcurrencyBudgetError
+from .instance_metadata import RegionalPolicyTarget
+from .instance_metadata import RegionalProviderCache
+from .instance_metadata import plan_concurrency_lanes
+from .ipam import CidrAllocations
+from .ipam import CidrBlockConflictError
+from .ipam import CidrBlockIndex
+from .ipam import CidrBlockOutsideVpcError
+from .ipam import SubnetCidrRequest
+from .ipam import SubnetSize
+from .ipam import UncommittedCidrAllocationsError
+from .ipam import VpcAddressSpaceExhaustedError
+from .ipam import VpcIpv6SubnetsExhaustedError
+from .ipam import find_uncommitted_subnets
+from .ipam import ipv6_subnet_cidr_block
+from .ipam import plan_ipv6_subnet_indexes
+from .ipam import plan_subnet_cidr_blocks
+from .nat_pool import NatGatewayNotInAvailabilityZoneError
+from .nat_pool import NatGatewayPool
+from .nat_pool import NatGatewayPoolEmptyError
+from .nat_pool import select_nat_availability_zone
 from .network import CentralNetworkingVpc
+from .network import MultipleDefaultRoutesError
+from .network import NatPoolWithoutNatError
 from .network import SharedSubnet
 from .network import SharedSubnetConfig
+from .network import VpcIpv6NotEnabledError
+from .network import ram_share_principals_key
+from .network import validate_subnet_config
+from .route_analysis import BlackholeRoutesError
+from .route_analysis import SubnetDefaultRoute
+from .route_analysis import SubnetReachability
+from .route_analysis import analyze_reachability
+from .route_analysis import check_default_routes
+from .route_analysis import describe_default_routes
+from .subnet_group import SharedSubnetGroup
+from .subnet_group import SharedSubnetGroupConfig
+from .subnet_group import UnknownNatSubnetGroupError
+from .subnet_group import validate_subnet_group_nat_references
+from .transit_gateway import EgressHub
+from .transit_gateway import EgressHubConfig
+from .transit_gateway import HubVpcAttachedTwiceError
+from .transit_gateway import HubVpcCidrOverlapError
+from .transit_gateway import TransitGatewayVpcAttachmentConfig
+from .transit_gateway import UnknownHubVpcError
+from .transit_gateway import plan_egress_hub_return_routes
+from .vpc_endpoints import CentralNetworkingVpcEndpoints
+from .vpc_endpoints import InterfaceEndpointSubnetsError
+from .vpc_endpoints import VpcEndpointsConfig
+from .vpc_endpoints import validate_interface_endpoint_subnets
@@ -0,0 +1,31 @@
+"""Allocate CIDR blocks to any new subnets, and record them in `cidr_allocations.json` to be committed.
+
+Previews and updates never write the allocations, they fail while a subnet's allocation isn't committed. This runs
+a preview of the stack that allocates blocks for the new subnets and writes the file, without deploying anything.
+
+Example:
+`uv run python -m aws_central_infrastructure.central_networking.lib.allocate_cidr_blocks --stack prod`
+"""
+
+import logging
+import os
+import sys
+
+from .ipam import WRITE_CIDR_ALLOCATIONS_ENV_VAR
+from .pulumi_deploy import main as run_deploy_cli
+
+logger = logging.getLogger(__name__)
+
+_DEPLOYING_ARGS = ("--up", "--destroy", "--refresh")
+
+
+def main() -> None:
+    if any(arg in _DEPLOYING_ARGS for arg in sys.argv[1:]):
+        logger.error(f"Allocating CIDR blocks only runs a preview, so none of {_DEPLOYING_ARGS} can be passed")
+        sys.exit(1)
+    os.environ[WRITE_CIDR_ALLOCATIONS_ENV_VAR] = "1"  # the inline Pulumi program runs in this process
+    run_deploy_cli()
+
+
+if __name__ == "__main__":
+    main()
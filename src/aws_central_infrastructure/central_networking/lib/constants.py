@@ -1 +1,19 @@
 CREATE_PRIVATE_SUBNET = False
+# S3/DynamoDB gateway endpoints (free) and ECR/SSM/CodeArtifact/STS interface endpoints (billed per endpoint per AZ per hour) in the generic VPC
+CREATE_VPC_ENDPOINTS = False
+# Parquet flow logs (partitioned by hour) of the generic VPC in an S3 bucket, analyze them with flow_log_analysis.py
+CREATE_VPC_FLOW_LOGS = False
+# associate an Amazon-provided IPv6 block (and an egress-only internet gateway) with the generic VPC, so subnets in it can be dual-stack
+ENABLE_GENERIC_VPC_IPV6 = False
+# regions (besides the home region) where IMDSv2 is enforced as the instance metadata default in every account
+IMDS_ADDITIONAL_REGIONS: list[str] = []
+# the most InstanceMetadataDefaults operations (one per account per region) in flight at once
+IMDS_CONCURRENCY_BUDGET = 10
+# Tag shared VPCs/subnets/route tables in each account with one AWS CLI `create-tags` call (a single resource per account) instead of one Tag resource per tag per account.
+# Before enabling on an existing stack, run `pulumi state delete` on the existing `aws:ec2/tag:Tag` resources, otherwise their deletion at the end of the update removes the tags the new commands just applied.
+# Requires the AWS CLI wherever Pulumi runs.
+USE_BULK_SHARED_RESOURCE_TAGGING = False
+# Add each subnet to one RAM share per VPC and set of principals (with a ResourceAssociation) instead of creating a share per subnet.
+# Enabling it on an existing stack creates the new shares and associations before the per-subnet shares are deleted, so subnets stay shared throughout,
+# but the Tag and SSM resources parented to each subnet's share are recreated.
+USE_BATCHED_SUBNET_RAM_SHARES = False
@@ -0,0 +1,153 @@
+"""Aggregate VPC flow logs locally, to find the top talkers and the bytes each subnet sends to each destination.
+
+Records are streamed one file (or Parquet row batch) at a time, so memory use is bounded by the number of distinct
+talkers rather than by the size of the logs. Both Parquet (as `VpcFlowLogs` delivers them) and the plain text format
+(`.log`/`.log.gz`) are read.
+
+Example (after `aws s3 sync s3://<flow-logs-bucket>/AWSLogs/<account>/vpcflowlogs/us-east-1/2026/10/19/ ./flow-logs`):
+`uv run python -m aws_central_infrastructure.central_networking.lib.flow_log_analysis ./flow-logs --top 20`
+"""
+
+import argparse
+import gzip
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from pathlib import Path
+
+from pydantic import BaseModel
+
+type FlowLogRecord = Mapping[str, str | int | None]
+
+PARQUET_BATCH_SIZE = 65536
+_ANALYZED_COLUMNS = ("srcaddr", "dstaddr", "pkt_srcaddr", "pkt_dstaddr", "subnet_id", "bytes", "action")
+
+
+class FlowLogTotal(BaseModel):
+    key: tuple[str, str]
+    bytes: int
+
+
+class FlowLogSummary(BaseModel):
+    record_count: int
+    total_bytes: int
+    top_talkers: list[FlowLogTotal]  # keyed by (source, destination)
+    top_subnet_destinations: list[FlowLogTotal]  # keyed by (subnet ID, destination)
+
+
+class FlowLogAggregator:
+    """Sum the bytes of accepted flows by talker pair and by subnet and destination.
+
+    The original packet addresses (`pkt-srcaddr`/`pkt-dstaddr`) are preferred, so traffic through a NAT gateway is
+    attributed to the instance behind it rather than to the NAT's network interface.
+    """
+
+    def __init__(self):
+        self.record_count = 0
+        self.total_bytes = 0
+        self._bytes_by_talkers: Counter[tuple[str, str]] = Counter()
+        self._bytes_by_subnet_destination: Counter[tuple[str, str]] = Counter()
+
+    def add(self, record: FlowLogRecord) -> None:
+        self.record_count += 1
+        if record.get("action") == "REJECT":
+            return
+        num_bytes = int(record.get("bytes") or 0)
+        if num_bytes == 0:
+            return
+        source = str(record.get("pkt_srcaddr") or record.get("srcaddr") or "-")
+        destination = str(record.get("pkt_dstaddr") or record.get("dstaddr") or "-")
+        self.total_bytes += num_bytes
+        self._bytes_by_talkers[(source, destination)] += num_bytes
+        self._bytes_by_subnet_destination[(str(record.get("subnet_id") or "-"), destination)] += num_bytes
+
+    def add_all(self, records: Iterable[FlowLogRecord]) -> None:
+        for record in records:
+            self.add(record)
+
+    def summarize(self, *, top: int = 10) -> FlowLogSummary:
+        # most_common(n) uses a heap, so this is O(k log n) in the number of distinct keys rather than a full sort
+        return FlowLogSummary(
+            record_count=self.record_count,
+            total_bytes=self.total_bytes,
+            top_talkers=[
+                FlowLogTotal(key=key, bytes=num_bytes) for key, num_bytes in self._bytes_by_talkers.most_common(top)
+            ],
+            top_subnet_destinations=[
+                FlowLogTotal(key=key, bytes=num_bytes)
+                for key, num_bytes in self._bytes_by_subnet_destination.most_common(top)
+            ],
+        )
+
+
+def _normalize_field_name(field_name: str) -> str:
+    # the text format's header uses the log format's hyphenated names, Parquet columns use underscores
+    return field_name.replace("-", "_")
+
+
+def iter_text_flow_log_records(path: Path) -> Iterator[FlowLogRecord]:
+    """Stream the records of a space separated flow log file (gzipped or not), whose first line names the fields."""
+    with gzip.open(path, "rt") if path.suffix == ".gz" else path.open() as file:
+        header = file.readline().split()
+        field_names = [_normalize_field_name(field_name) for field_name in header]
+        for line in file:
+            values = line.split()
+            if not values:
+                continue
+            yield {
+                field_name: None if value == "-" else value
+                for field_name, value in zip(field_names, values, strict=True)
+            }
+
+
+def iter_parquet_flow_log_records(path: Path, *, batch_size: int = PARQUET_BATCH_SIZE) -> Iterator[FlowLogRecord]:
+    from pyarrow import parquet  # noqa: PLC0415 # pyarrow is slow to import, and only needed when analyzing Parquet files
+
+    parquet_file = parquet.ParquetFile(path)
+    columns = [column for column in _ANALYZED_COLUMNS if column in parquet_file.schema_arrow.names]
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield from batch.to_pylist()
+
+
+def find_flow_log_files(paths: Iterable[Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    file
+                    for file in path.rglob("*")
+                    if file.is_file() and (file.suffix == ".parquet" or file.name.endswith((".log", ".log.gz")))
+                )
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def iter_flow_log_records(paths: Iterable[Path]) -> Iterator[FlowLogRecord]:
+    for path in find_flow_log_files(paths):
+        if path.suffix == ".parquet":
+            yield from iter_parquet_flow_log_records(path)
+        else:
+            yield from iter_text_flow_log_records(path)
+
+
+def summarize_flow_logs(paths: Iterable[Path], *, top: int = 10) -> FlowLogSummary:
+    aggregator = FlowLogAggregator()
+    aggregator.add_all(iter_flow_log_records(paths))
+    return aggregator.summarize(top=top)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _ = parser.add_argument("paths", type=Path, nargs="+", help="flow log files, or directories to search for them")
+    _ = parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    summary = summarize_flow_logs(args.paths, top=args.top)
+    print(summary.model_dump_json(indent=2))  # noqa: T201 # this is a CLI
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from typing import TYPE_CHECKING
+from typing import Literal
+
+from ephemeral_pulumi_deploy import append_resource_suffix
+from ephemeral_pulumi_deploy import common_tags
+from ephemeral_pulumi_deploy import common_tags_native
+from ephemeral_pulumi_deploy import get_aws_account_id
+from lab_auto_pulumi import CENTRAL_NETWORKING_SSM_PREFIX
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_aws_native import TagArgs
+from pulumi_aws_native import ec2
+from pulumi_aws_native import s3
+from pulumi_aws_native import ssm
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from .network import CentralNetworkingVpc
+
+# the default fields, plus the ones that attribute traffic to a subnet and to its original source/destination behind a NAT
+FLOW_LOG_FIELDS = (
+    "version",
+    "account-id",
+    "interface-id",
+    "srcaddr",
+    "dstaddr",
+    "srcport",
+    "dstport",
+    "protocol",
+    "packets",
+    "bytes",
+    "start",
+    "end",
+    "action",
+    "log-status",
+    "vpc-id",
+    "subnet-id",
+    "az-id",
+    "flow-direction",
+    "pkt-srcaddr",
+    "pkt-dstaddr",
+    "traffic-path",
+)
+
+
+class VpcFlowLogsConfig(BaseModel):
+    retention_days: int = 30
+    traffic_type: ec2.FlowLogTrafficType = ec2.FlowLogTrafficType.ALL
+    max_aggregation_interval_seconds: Literal[60, 600] = 600  # the only intervals AWS accepts
+
+
+class VpcFlowLogs(ComponentResource):
+    """Flow logs for every network interface in the VPC, delivered to S3 as Parquet partitioned by hour.
+
+    Analyze them locally with `flow_log_analysis.py`.
+    """
+
+    def __init__(self, *, vpc: "CentralNetworkingVpc", config: VpcFlowLogsConfig):
+        super().__init__(
+            "labauto:CentralNetworkingVpcFlowLogs",
+            append_resource_suffix(vpc.name),
+            None,
+            opts=ResourceOptions(parent=vpc),
+        )
+        self.bucket = s3.Bucket(
+            append_resource_suffix(f"{vpc.name}-flow-logs", max_length=150),
+            public_access_block_configuration=s3.BucketPublicAccessBlockConfigurationArgs(
+                block_public_acls=True,
+                block_public_policy=True,
+                ignore_public_acls=True,
+                restrict_public_buckets=True,
+            ),
+            bucket_encryption=s3.BucketEncryptionArgs(
+                server_side_encryption_configuration=[
+                    s3.BucketServerSideEncryptionRuleArgs(
+                        server_side_encryption_by_default=s3.BucketServerSideEncryptionByDefaultArgs(
+                            sse_algorithm=s3.BucketServerSideEncryptionByDefaultSseAlgorithm.AES256
+                        ),
+                        bucket_key_enabled=True,
+                    )
+                ]
+            ),
+            lifecycle_configuration=s3.BucketLifecycleConfigurationArgs(
+                rules=[
+                    s3.BucketRuleArgs(
+                        id="expire-flow-logs",
+                        status=s3.BucketRuleStatus.ENABLED,
+                        expiration_in_days=config.retention_days,
+                    )
+                ]
+            ),
+            tags=[TagArgs(key="Name", value=f"central-networking-{vpc.name}-flow-logs"), *common_tags_native()],
+            opts=ResourceOptions(parent=self),
+        )
+        account_id = get_aws_account_id()
+        _ = s3.BucketPolicy(
+            append_resource_suffix(f"{vpc.name}-flow-logs", max_length=150),
+            bucket=self.bucket.bucket_name,  # type: ignore[reportArgumentType] # pyright somehow thinks a bucket name can be Output[None], which doesn't seem possible
+            policy_document=self.bucket.arn.apply(
+                lambda bucket_arn: {
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Sid": "AWSLogDeliveryWrite",
+                            "Effect": "Allow",
+                            "Principal": {"Service": "delivery.logs.amazonaws.com"},
+                            "Action": "s3:PutObject",
+                            "Resource": f"{bucket_arn}/AWSLogs/{account_id}/*",
+                            "Condition": {
+                                "StringEquals": {
+                                    "s3:x-amz-acl": "bucket-owner-full-control",
+                                    "aws:SourceAccount": account_id,
+                                }
+                            },
+                        },
+                        {
+                            "Sid": "AWSLogDeliveryAclCheck",
+                            "Effect": "Allow",
+                            "Principal": {"Service": "delivery.logs.amazonaws.com"},
+                            "Action": "s3:GetBucketAcl",
+                            "Resource": bucket_arn,
+                            "Condition": {"StringEquals": {"aws:SourceAccount": account_id}},
+                        },
+                    ],
+                }
+            ),
+            opts=ResourceOptions(parent=self.bucket, delete_before_replace=True),
+        )
+        _ = ec2.FlowLog(
+            append_resource_suffix(vpc.name),
+            resource_id=vpc.vpc.vpc_id,
+            resource_type=ec2.FlowLogResourceType.VPC,
+            traffic_type=config.traffic_type,
+            log_destination_type=ec2.FlowLogLogDestinationType.S3,
+            log_destination=self.bucket.arn,
+            log_format=" ".join(f"${{{field}}}" for field in FLOW_LOG_FIELDS),
+            max_aggregation_interval=config.max_aggregation_interval_seconds,
+            destination_options=ec2.DestinationOptionsPropertiesArgs(
+                file_format=ec2.FlowLogDestinationOptionsPropertiesFileFormat.PARQUET,
+                hive_compatible_partitions=True,
+                per_hour_partition=True,
+            ),
+            tags=[TagArgs(key="Name", value=f"central-networking-{vpc.name}"), *common_tags_native()],
+            opts=ResourceOptions(parent=self),
+        )
+        # only in this account, since the bucket isn't readable from the others
+        _ = ssm.Parameter(
+            append_resource_suffix(f"central-networking-flow-logs-bucket-{vpc.name}", max_length=150),
+            type=ssm.ParameterType.STRING,
+            name=f"{CENTRAL_NETWORKING_SSM_PREFIX}/vpcs/{vpc.name}/flow-logs-bucket-name",
+            value=self.bucket.bucket_name,  # type: ignore[reportArgumentType] # pyright somehow thinks a bucket name can be Output[None], which doesn't seem possible
+            tags=common_tags(),
+            opts=ResourceOptions(parent=self.bucket, delete_before_replace=True),
+        )
@@ -0,0 +1,123 @@
+import pulumi_aws
+from ephemeral_pulumi_deploy import append_resource_suffix
+from ephemeral_pulumi_deploy import get_aws_account_id
+from lab_auto_pulumi import AwsAccountId
+from lab_auto_pulumi import AwsLogicalWorkload
+from lab_auto_pulumi import WorkloadName
+from pulumi import ROOT_STACK_RESOURCE
+from pulumi import Alias
+from pulumi import ComponentResource
+from pulumi import Resource
+from pulumi import ResourceOptions
+from pulumi_aws.ec2 import InstanceMetadataDefaults
+from pydantic import BaseModel
+
+from aws_central_infrastructure.iac_management.lib import create_central_classic_provider
+from aws_central_infrastructure.iac_management.lib import create_classic_provider
+
+from .network import AllAccountProviders
+
+DEFAULT_CONCURRENCY_BUDGET = 10
+
+
+class InvalidConcurrencyBudgetError(Exception):
+    def __init__(self, budget: int):
+        super().__init__(f"The concurrency budget must be at least 1, but was {budget}")
+
+
+class RegionalPolicyTarget(BaseModel):
+    resource_name: str  # without the region
+    account_id: AwsAccountId
+    region: str
+
+
+def plan_concurrency_lanes(count: int, *, budget: int) -> list[int | None]:
+    """Return, for each operation, the index of the earlier one it has to wait for (None if it can start right away).
+
+    Operation i waits for operation i-budget, so the operations form `budget` chains and at most `budget` of them are
+    in flight at once, however many accounts and regions there are.
+    """
+    if budget < 1:
+        raise InvalidConcurrencyBudgetError(budget)
+    return [index - budget if index >= budget else None for index in range(count)]
+
+
+class RegionalProviderCache:
+    """Classic providers keyed by (account, region), created on first use so every pair only ever gets one.
+
+    It starts out with the home region providers already in AllAccountProviders, and this (central) account uses the
+    default provider in the home region.
+    """
+
+    def __init__(self, *, all_providers: AllAccountProviders, home_region: str, parent: Resource):
+        self._parent = parent
+        self._central_account_id = get_aws_account_id()
+        self._accounts = {account.id: account for account in all_providers.all_accounts}
+        self._providers: dict[tuple[AwsAccountId, str], pulumi_aws.Provider | None] = {
+            (self._central_account_id, home_region): None
+        }
+        for account_id, provider in all_providers.all_classic_providers.items():
+            self._providers[(account_id, home_region)] = provider
+
+    def get(self, *, account_id: AwsAccountId, region: str) -> pulumi_aws.Provider | None:
+        key = (account_id, region)
+        if key not in self._providers:
+            self._providers[key] = (
+                create_central_classic_provider(region=region, parent=self._parent)
+                if account_id == self._central_account_id
+                else create_classic_provider(account=self._accounts[account_id], parent=self._parent, region=region)
+            )
+        return self._providers[key]
+
+
+class InstanceMetadataDefaultsFanOut(ComponentResource):
+    """Enforce IMDSv2 as the EC2 instance metadata default in every account, in every region given.
+
+    The Pulumi engine would otherwise start every account x region operation at once, so they're chained into
+    `concurrency_budget` lanes to stay under the EC2 API rate limits while still running in parallel.
+    """
+
+    def __init__(
+        self,
+        *,
+        workloads_info: dict[WorkloadName, AwsLogicalWorkload],
+        all_providers: AllAccountProviders,
+        home_region: str,
+        additional_regions: list[str],
+        concurrency_budget: int = DEFAULT_CONCURRENCY_BUDGET,
+    ):
+        super().__init__("labauto:InstanceMetadataDefaultsFanOut", append_resource_suffix(), None)
+        self.providers = RegionalProviderCache(all_providers=all_providers, home_region=home_region, parent=self)
+        account_resource_names: list[tuple[AwsAccountId, str]] = [(get_aws_account_id(), "central-infra")]
+        for workload_info in workloads_info.values():
+            account_resource_names.extend(
+                (account.id, f"{workload_info.name}-{account.name}")
+                for account in [
+                    *workload_info.prod_accounts,
+                    *workload_info.staging_accounts,
+                    *workload_info.dev_accounts,
+                ]
+            )
+        targets = [
+            RegionalPolicyTarget(resource_name=resource_name, account_id=account_id, region=region)
+            for region in [home_region, *(region for region in additional_regions if region != home_region)]
+            for account_id, resource_name in account_resource_names
+        ]
+        self.instance_metadata_defaults: list[InstanceMetadataDefaults] = []
+        for target, wait_for_index in zip(
+            targets, plan_concurrency_lanes(len(targets), budget=concurrency_budget), strict=True
+        ):
+            self.instance_metadata_defaults.append(
+                InstanceMetadataDefaults(
+                    append_resource_suffix(f"{target.resource_name}-{target.region}", max_length=150),
+                    http_tokens="required",  # enforce imdsv2
+                    http_put_response_hop_limit=1,  # enforce imdsv2
+                    opts=ResourceOptions(
+                        parent=self,
+                        provider=self.providers.get(account_id=target.account_id, region=target.region),
+                        depends_on=[] if wait_for_index is None else [self.instance_metadata_defaults[wait_for_index]],
+                        aliases=[Alias(parent=ROOT_STACK_RESOURCE)],  # these were created at the top level originally
+                        delete_before_replace=True,
+                    ),
+                )
+            )
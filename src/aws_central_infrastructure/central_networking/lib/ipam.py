@@ -0,0 +1,242 @@
+import logging
+from bisect import bisect_right
+from bisect import insort
+from enum import IntEnum
+from ipaddress import IPv4Network
+from ipaddress import IPv6Network
+from pathlib import Path
+
+from pydantic import BaseModel
+from pydantic import Field
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VPC_CIDR_BLOCK = "10.0.0.0/16"
+CIDR_ALLOCATIONS_PATH = Path(__file__).parent.parent / "cidr_allocations.json"
+# set by the allocate_cidr_blocks CLI, the only time the allocations file is written
+WRITE_CIDR_ALLOCATIONS_ENV_VAR = "WRITE_CIDR_ALLOCATIONS"
+AMAZON_PROVIDED_IPV6_PREFIX_LENGTH = 56
+IPV6_SUBNET_PREFIX_LENGTH = 64  # the only size AWS allows for dual-stack subnets created from an Amazon-provided block
+MAX_IPV6_SUBNETS_PER_VPC = 2 ** (IPV6_SUBNET_PREFIX_LENGTH - AMAZON_PROVIDED_IPV6_PREFIX_LENGTH)
+
+
+class SubnetSize(IntEnum):
+    """The prefix length for a subnet holding the given number of addresses.
+
+    AWS reserves 5 addresses in every subnet (the first four and the last one), so e.g. ADDRESSES_16 has 11 usable.
+    """
+
+    ADDRESSES_16 = 28
+    ADDRESSES_32 = 27
+    ADDRESSES_64 = 26
+    ADDRESSES_128 = 25
+    ADDRESSES_256 = 24
+    ADDRESSES_512 = 23
+    ADDRESSES_1024 = 22
+    ADDRESSES_4096 = 20
+
+
+class CidrBlockOutsideVpcError(Exception):
+    def __init__(self, *, owner: str, cidr_block: str, vpc_cidr_block: str):
+        super().__init__(f"The CIDR block {cidr_block} for {owner} is not within the VPC CIDR block {vpc_cidr_block}")
+
+
+class CidrBlockConflictError(Exception):
+    def __init__(self, *, owner: str, cidr_block: str, conflicting_owner: str, conflicting_cidr_block: str):
+        super().__init__(
+            f"The CIDR block {cidr_block} for {owner} overlaps {conflicting_cidr_block} already used by {conflicting_owner}"
+        )
+
+
+class VpcAddressSpaceExhaustedError(Exception):
+    def __init__(self, *, owner: str, prefix_length: int, vpc_cidr_block: str):
+        super().__init__(
+            f"There is no free /{prefix_length} block left in the VPC CIDR block {vpc_cidr_block} to allocate to {owner}"
+        )
+
+
+class VpcIpv6SubnetsExhaustedError(Exception):
+    def __init__(self, *, vpc_name: str, subnet_name: str):
+        super().__init__(
+            f"All {MAX_IPV6_SUBNETS_PER_VPC} IPv6 /{IPV6_SUBNET_PREFIX_LENGTH} blocks in VPC {vpc_name} are in use, so none can be allocated to {subnet_name}"
+        )
+
+
+class UncommittedCidrAllocationsError(Exception):
+    def __init__(self, *, subnet_names: list[str], allocations_path: Path):
+        super().__init__(
+            f"The subnets {subnet_names} have no CIDR allocation in {allocations_path}. Run `uv run python -m aws_central_infrastructure.central_networking.lib.allocate_cidr_blocks --stack <stack>` and commit the file"
+        )
+
+
+class CidrBlockIndex:
+    """The non-overlapping IPv4 blocks used within a VPC, sorted by their first address.
+
+    Since the blocks can never overlap each other, a sorted list searched with bisect answers the same questions an
+    interval tree would (point/overlap lookup in O(log n)), and walking it in order finds the gaps to allocate from.
+    """
+
+    def __init__(self, vpc_cidr_block: str):
+        self.vpc_network = IPv4Network(vpc_cidr_block)
+        self._blocks: list[tuple[IPv4Network, str]] = []  # sorted by first address
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def find_conflict(self, network: IPv4Network) -> tuple[str, IPv4Network] | None:
+        index = bisect_right(self._blocks, network.broadcast_address, key=lambda block: block[0].network_address)
+        # only the block starting closest before the end of this one can overlap it, since blocks don't overlap each other
+        if index == 0:
+            return None
+        block_network, owner = self._blocks[index - 1]
+        if block_network.broadcast_address < network.network_address:
+            return None
+        return owner, block_network
+
+    def add(self, *, owner: str, cidr_block: str) -> IPv4Network:
+        network = IPv4Network(cidr_block)
+        if not network.subnet_of(self.vpc_network):
+            raise CidrBlockOutsideVpcError(owner=owner, cidr_block=cidr_block, vpc_cidr_block=str(self.vpc_network))
+        conflict = self.find_conflict(network)
+        if conflict is not None:
+            conflicting_owner, conflicting_network = conflict
+            raise CidrBlockConflictError(
+                owner=owner,
+                cidr_block=cidr_block,
+                conflicting_owner=conflicting_owner,
+                conflicting_cidr_block=str(conflicting_network),
+            )
+        insort(self._blocks, (network, owner), key=lambda block: block[0].network_address)
+        return network
+
+    def allocate(self, *, owner: str, prefix_length: int) -> IPv4Network:
+        """Take the lowest free block of the given size, aligned to its own size as CIDR blocks must be."""
+        block_size = 2 ** (32 - prefix_length)
+        vpc_first = int(self.vpc_network.network_address)
+        vpc_last = int(self.vpc_network.broadcast_address)
+        candidate = _align_up(vpc_first, block_size)
+        for block_network, _ in self._blocks:
+            if candidate + block_size - 1 < int(block_network.network_address):
+                break
+            candidate = max(candidate, _align_up(int(block_network.broadcast_address) + 1, block_size))
+        if prefix_length < self.vpc_network.prefixlen or candidate + block_size - 1 > vpc_last:
+            raise VpcAddressSpaceExhaustedError(
+                owner=owner, prefix_length=prefix_length, vpc_cidr_block=str(self.vpc_network)
+            )
+        network = IPv4Network((candidate, prefix_length))
+        insort(self._blocks, (network, owner), key=lambda block: block[0].network_address)
+        return network
+
+
+def _align_up(address: int, block_size: int) -> int:
+    return -(-address // block_size) * block_size
+
+
+class SubnetCidrRequest(BaseModel):
+    vpc_name: str
+    subnet_name: str
+    cidr_block: str | None = None  # when not specified, a block of `size` is allocated
+    size: SubnetSize = SubnetSize.ADDRESSES_16
+    ipv6: bool = False  # also allocate a /64 from the VPC's IPv6 block
+
+
+class CidrAllocations(BaseModel):
+    """The CIDR block of every subnet, by VPC name then subnet name. Persisted so allocations never move."""
+
+    vpcs: dict[str, dict[str, str]] = Field(default_factory=dict)
+    # the index of each dual-stack subnet's /64 within its VPC's IPv6 block (the block itself is only known once created)
+    ipv6_subnet_indexes: dict[str, dict[str, int]] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "CidrAllocations":
+        if not path.exists():
+            return cls()
+        return cls.model_validate_json(path.read_text())
+
+    def save(self, path: Path) -> None:
+        _ = path.write_text(self.model_dump_json(indent=2) + "\n")
+
+
+def plan_subnet_cidr_blocks(
+    *, vpc_cidr_blocks: dict[str, str], requests: list[SubnetCidrRequest], previous: CidrAllocations
+) -> CidrAllocations:
+    """Validate the explicit CIDR blocks and allocate the rest, keeping every previous allocation in place.
+
+    Explicit blocks are indexed first, then previously allocated blocks, then new blocks are allocated in the order
+    requested, so adding a subnet never moves an existing one. Subnets no longer requested are dropped from the result.
+    """
+    indexes = {vpc_name: CidrBlockIndex(cidr_block) for vpc_name, cidr_block in vpc_cidr_blocks.items()}
+    allocations = CidrAllocations(vpcs={vpc_name: {} for vpc_name in vpc_cidr_blocks})
+    explicit_blocks = [
+        (IPv4Network(request.cidr_block), request) for request in requests if request.cidr_block is not None
+    ]
+    # sorting by address means each insert lands at the end of the index, so validation is O(n log n) overall
+    explicit_blocks.sort(key=lambda block: block[0].network_address)
+    for network, request in explicit_blocks:
+        _ = indexes[request.vpc_name].add(owner=request.subnet_name, cidr_block=str(network))
+        allocations.vpcs[request.vpc_name][request.subnet_name] = str(network)
+    new_requests: list[SubnetCidrRequest] = []
+    for request in requests:
+        if request.cidr_block is not None:
+            continue
+        previous_cidr_block = previous.vpcs.get(request.vpc_name, {}).get(request.subnet_name)
+        if previous_cidr_block is None or IPv4Network(previous_cidr_block).prefixlen != request.size:
+            new_requests.append(request)
+            continue
+        network = indexes[request.vpc_name].add(owner=request.subnet_name, cidr_block=previous_cidr_block)
+        allocations.vpcs[request.vpc_name][request.subnet_name] = str(network)
+    for request in new_requests:
+        network = indexes[request.vpc_name].allocate(owner=request.subnet_name, prefix_length=request.size)
+        logger.info(f"Allocated {network} to subnet {request.subnet_name} in VPC {request.vpc_name}")
+        allocations.vpcs[request.vpc_name][request.subnet_name] = str(network)
+    allocations.ipv6_subnet_indexes = plan_ipv6_subnet_indexes(
+        requests=[request for request in requests if request.ipv6], previous=previous.ipv6_subnet_indexes
+    )
+    return allocations
+
+
+def find_uncommitted_subnets(
+    *, requests: list[SubnetCidrRequest], allocations: CidrAllocations, previous: CidrAllocations
+) -> list[str]:
+    """Find the subnets whose allocated IPv4 block or IPv6 index isn't already in the previous (committed) allocations.
+
+    Subnets with an explicit CIDR block don't need a committed allocation, since their block can't move.
+    """
+    uncommitted: list[str] = []
+    for request in requests:
+        allocated_block = allocations.vpcs[request.vpc_name][request.subnet_name]
+        previous_block = previous.vpcs.get(request.vpc_name, {}).get(request.subnet_name)
+        ipv6_index = allocations.ipv6_subnet_indexes.get(request.vpc_name, {}).get(request.subnet_name)
+        previous_ipv6_index = previous.ipv6_subnet_indexes.get(request.vpc_name, {}).get(request.subnet_name)
+        if (request.cidr_block is None and allocated_block != previous_block) or ipv6_index != previous_ipv6_index:
+            uncommitted.append(f"{request.vpc_name}/{request.subnet_name}")
+    return uncommitted
+
+
+def plan_ipv6_subnet_indexes(
+    *, requests: list[SubnetCidrRequest], previous: dict[str, dict[str, int]]
+) -> dict[str, dict[str, int]]:
+    """Keep each subnet's previous /64 index and give new subnets the lowest free index in their VPC."""
+    indexes: dict[str, dict[str, int]] = {}
+    new_requests: list[SubnetCidrRequest] = []
+    for request in requests:
+        previous_index = previous.get(request.vpc_name, {}).get(request.subnet_name)
+        if previous_index is None:
+            new_requests.append(request)
+            continue
+        indexes.setdefault(request.vpc_name, {})[request.subnet_name] = previous_index
+    for request in new_requests:
+        vpc_indexes = indexes.setdefault(request.vpc_name, {})
+        used = set(vpc_indexes.values())
+        index = next((index for index in range(MAX_IPV6_SUBNETS_PER_VPC) if index not in used), None)
+        if index is None:
+            raise VpcIpv6SubnetsExhaustedError(vpc_name=request.vpc_name, subnet_name=request.subnet_name)
+        logger.info(f"Allocated IPv6 subnet index {index} to subnet {request.subnet_name} in VPC {request.vpc_name}")
+        vpc_indexes[request.subnet_name] = index
+    return indexes
+
+
+def ipv6_subnet_cidr_block(*, vpc_ipv6_cidr_block: str, index: int) -> str:
+    vpc_network = IPv6Network(vpc_ipv6_cidr_block)
+    subnet_size = 2 ** (128 - IPV6_SUBNET_PREFIX_LENGTH)
+    return str(IPv6Network((int(vpc_network.network_address) + index * subnet_size, IPV6_SUBNET_PREFIX_LENGTH)))
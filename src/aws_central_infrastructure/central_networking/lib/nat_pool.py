@@ -0,0 +1,65 @@
+import logging
+
+from pulumi_aws_native import ec2
+
+logger = logging.getLogger(__name__)
+
+# each NAT gateway supports 55,000 simultaneous connections to a single destination per EIP, and by default can have 8 EIPs
+MAX_SECONDARY_EIPS_PER_NAT = 7
+
+
+class NatGatewayPoolEmptyError(Exception):
+    def __init__(self, pool_name: str):
+        super().__init__(f"The NAT gateway pool {pool_name} has no NAT gateways to route to")
+
+
+class NatGatewayNotInAvailabilityZoneError(Exception):
+    def __init__(self, *, pool_name: str, availability_zone_id: str):
+        super().__init__(
+            f"The NAT gateway pool {pool_name} has no NAT gateway in {availability_zone_id}. Add one there, or set allow_cross_az_nat=True to route to another AZ (which pays cross-AZ data transfer and fails with that AZ)"
+        )
+
+
+def select_nat_availability_zone(
+    *, pool_name: str, availability_zone_id: str, available_availability_zone_ids: list[str], allow_cross_az: bool
+) -> str:
+    """Prefer the NAT in the same AZ, otherwise (if allowed) the lowest AZ ID, so the choice is stable."""
+    if availability_zone_id in available_availability_zone_ids:
+        return availability_zone_id
+    if not available_availability_zone_ids:
+        raise NatGatewayPoolEmptyError(pool_name)
+    if not allow_cross_az:
+        raise NatGatewayNotInAvailabilityZoneError(pool_name=pool_name, availability_zone_id=availability_zone_id)
+    fallback = min(available_availability_zone_ids)
+    logger.warning(
+        f"No NAT gateway in {availability_zone_id} in the pool {pool_name}, routing to the one in {fallback} instead"
+    )
+    return fallback
+
+
+class NatGatewayPool:
+    """NAT gateways spread across availability zones, so each subnet can route to the one in its own AZ.
+
+    Pass a pool as a subnet's `route_to_nat_gateway` and the NAT is picked by the subnet's AZ, so losing an AZ only
+    affects the subnets in it and no traffic crosses AZs to reach a NAT.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.nat_gateways: dict[str, ec2.NatGateway] = {}  # keyed by AZ ID
+
+    def add(self, *, availability_zone_id: str, nat_gateway: ec2.NatGateway) -> None:
+        self.nat_gateways[availability_zone_id] = nat_gateway
+
+    def has_availability_zone(self, availability_zone_id: str) -> bool:
+        return availability_zone_id in self.nat_gateways
+
+    def select(self, *, availability_zone_id: str, allow_cross_az: bool = False) -> ec2.NatGateway:
+        return self.nat_gateways[
+            select_nat_availability_zone(
+                pool_name=self.name,
+                availability_zone_id=availability_zone_id,
+                available_availability_zone_ids=list(self.nat_gateways),
+                allow_cross_az=allow_cross_az,
+            )
+        ]
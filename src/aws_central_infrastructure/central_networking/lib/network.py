@@ -1,3 +1,7 @@
+import hashlib
+import logging
+import shlex
+from pathlib import Path
 from typing import Literal
 from typing import Self
 
@@ -21,15 +25,74 @@ from pulumi_aws_native import TagArgs
 from pulumi_aws_native import ec2
 from pulumi_aws_native import ram
 from pulumi_aws_native import ssm
+from pulumi_command import local
 from pydantic import BaseModel
 from pydantic import ConfigDict
+from pydantic import Field
 
+from aws_central_infrastructure.iac_management.lib import central_infra_role_arn
 from aws_central_infrastructure.iac_management.lib import create_classic_providers
 from aws_central_infrastructure.iac_management.lib import create_providers
 
+from .constants import USE_BATCHED_SUBNET_RAM_SHARES
+from .constants import USE_BULK_SHARED_RESOURCE_TAGGING
+from .flow_logs import VpcFlowLogs
+from .flow_logs import VpcFlowLogsConfig
+from .ipam import DEFAULT_VPC_CIDR_BLOCK
+from .ipam import CidrAllocations
+from .ipam import SubnetCidrRequest
+from .ipam import SubnetSize
+from .ipam import UncommittedCidrAllocationsError
+from .ipam import find_uncommitted_subnets
+from .ipam import ipv6_subnet_cidr_block
+from .ipam import plan_subnet_cidr_blocks
+from .nat_pool import MAX_SECONDARY_EIPS_PER_NAT
+from .nat_pool import NatGatewayPool
+from .vpc_endpoints import CentralNetworkingVpcEndpoints
+from .vpc_endpoints import VpcEndpointsConfig
+
+logger = logging.getLogger(__name__)
+
 
 def tag_args_to_aws_cli_str(tag_args: list[TagArgs]) -> str:
-    return " ".join([f"Key={tag.key},Value={tag.value}" for tag in tag_args])
+    return " ".join([shlex.quote(f"Key={tag.key},Value={tag.value}") for tag in tag_args])
+
+
+def tag_keys_to_aws_cli_str(tag_args: list[TagArgs]) -> str:
+    return " ".join([shlex.quote(f"Key={tag.key}") for tag in tag_args])
+
+
+# assumes the Deploy role in the target account (commands only run during `pulumi up`) and leaves the credentials in $1 $2 $3
+_ASSUME_ROLE_IN_TARGET_ACCOUNT = 'set -- $(aws sts assume-role --role-arn "$ROLE_ARN" --role-session-name pulumi-tagging --query "Credentials.[AccessKeyId,SecretAccessKey,SessionToken]" --output text) && export AWS_ACCESS_KEY_ID="$1" AWS_SECRET_ACCESS_KEY="$2" AWS_SESSION_TOKEN="$3"'
+
+
+def bulk_tag_resource_in_account(  # noqa: PLR0913 # this is a lot of arguments, but they're all kwargs
+    *,
+    account_id: AwsAccountId,
+    tags: list[TagArgs],
+    resource_name: str,
+    resource_id: Output[str],
+    parent: Resource,
+    depends_on: list[Resource],
+) -> local.Command:
+    """Apply the whole tag set with a single CreateTags call in the account, instead of one Tag resource per tag."""
+    return local.Command(
+        append_resource_suffix(f"tags-{resource_name}-{account_id}", max_length=150),
+        create=f'{_ASSUME_ROLE_IN_TARGET_ACCOUNT} && aws ec2 create-tags --region "$AWS_REGION" --resources "$RESOURCE_ID" --tags {tag_args_to_aws_cli_str(tags)}',
+        delete=f'{_ASSUME_ROLE_IN_TARGET_ACCOUNT} && aws ec2 delete-tags --region "$AWS_REGION" --resources "$RESOURCE_ID" --tags {tag_keys_to_aws_cli_str(tags)}',
+        environment={
+            "ROLE_ARN": central_infra_role_arn(account_id, role_type="Deploy"),
+            "AWS_REGION": str(pulumi_aws.config.region),
+            "RESOURCE_ID": resource_id,
+        },
+        triggers=[resource_id, tag_args_to_aws_cli_str(tags)],
+        opts=ResourceOptions(
+            parent=parent,
+            depends_on=depends_on,
+            # otherwise the replacement's tags would be created before the old command deleted the same keys
+            delete_before_replace=True,
+        ),
+    )
 
 
 def create_ssm_param_in_all_accounts(  # noqa: PLR0913 # this is a lot of arguments, but they're all kwargs
@@ -69,6 +132,16 @@ def tag_shared_resource(  # noqa: PLR0913 # this is a lot of arguments, but they
         depends_on = [parent]
     for account_id, provider in providers.items():
         if "all" in accounts_to_share_to or account_id in accounts_to_share_to:
+            if USE_BULK_SHARED_RESOURCE_TAGGING:
+                _ = bulk_tag_resource_in_account(
+                    account_id=account_id,
+                    tags=tags,
+                    resource_name=resource_name,
+                    resource_id=resource_id,
+                    parent=parent,
+                    depends_on=depends_on,
+                )
+                continue
             for tag in tags:
                 _ = Tag(
                     append_resource_suffix(f"tag-{resource_name}-{account_id}-{tag.key}", max_length=150),
@@ -84,6 +157,11 @@ def tag_shared_resource(  # noqa: PLR0913 # this is a lot of arguments, but they
                 )
 
 
+def ram_share_principals_key(principals: list[str]) -> str:
+    """Name a set of principals independent of order, so each set maps to the same share on every run."""
+    return hashlib.sha256(",".join(sorted(set(principals))).encode()).hexdigest()[:12]
+
+
 class AllAccountProviders(ComponentResource):
     def __init__(self, *, workloads_info: dict[WorkloadName, AwsLogicalWorkload]):
         super().__init__(
@@ -96,23 +174,39 @@ class AllAccountProviders(ComponentResource):
             all_accounts.extend(
                 [*workload_info.prod_accounts, *workload_info.staging_accounts, *workload_info.dev_accounts]
             )
+        self.all_accounts = all_accounts
         self.all_native_providers = create_providers(aws_accounts=all_accounts, parent=self)
         self.all_classic_providers = create_classic_providers(aws_accounts=all_accounts, parent=self)
 
 
 class CentralNetworkingVpc(ComponentResource):
-    def __init__(self, *, name: str, all_providers: AllAccountProviders, all_vpcs: dict[str, Self]):
+    def __init__(  # noqa: PLR0913 # this is a lot of arguments, but they're all kwargs
+        self,
+        *,
+        name: str,
+        all_providers: AllAccountProviders,
+        all_vpcs: dict[str, Self],
+        cidr_block: str = DEFAULT_VPC_CIDR_BLOCK,
+        endpoints_config: VpcEndpointsConfig | None = None,  # created by `create_endpoints`, once the subnets exist
+        flow_logs_config: VpcFlowLogsConfig | None = None,
+        enable_ipv6: bool = False,  # associates an Amazon-provided /56, so subnets can opt in to a /64 each
+    ):
         super().__init__(
             "labauto:CentralNetworkingVpc",
             append_resource_suffix(name),
             None,
         )
         all_vpcs[name] = self
+        self.name = name
+        self.subnet_shares: dict[str, ram.ResourceShare] = {}  # keyed by ram_share_principals_key
+        self.cidr_block = cidr_block
+        self.endpoints_config = endpoints_config
+        self.all_providers = all_providers
         self.resource_name_base = f"{name}-vpc"
         self.vpc_tags = [TagArgs(key="Name", value=f"central-networking-{name}"), *common_tags_native()]
         self.vpc = ec2.Vpc(
             append_resource_suffix(name),
-            cidr_block="10.0.0.0/16",
+            cidr_block=cidr_block,
             enable_dns_hostnames=True,
             tags=self.vpc_tags,
             opts=ResourceOptions(parent=self),
@@ -137,24 +231,198 @@ class CentralNetworkingVpc(ComponentResource):
             internet_gateway_id=self.igw.id,
             opts=ResourceOptions(parent=self.vpc),
         )
+        self.ipv6_enabled = enable_ipv6
+        if enable_ipv6:
+            self.ipv6_cidr_block_association = ec2.VpcCidrBlock(
+                append_resource_suffix(f"{self.resource_name_base}-ipv6", max_length=150),
+                vpc_id=self.vpc.id,
+                amazon_provided_ipv6_cidr_block=True,
+                opts=ResourceOptions(parent=self.vpc),
+            )
+
+            def require_ipv6_cidr_block(ipv6_cidr_block: str | None) -> str:
+                if ipv6_cidr_block is None:
+                    raise VpcIpv6CidrBlockNotAssignedError(name)
+                return ipv6_cidr_block
+
+            self.ipv6_cidr_block = self.ipv6_cidr_block_association.ipv6_cidr_block.apply(require_ipv6_cidr_block)
+            # lets IPv6 traffic out (but not in) with no NAT gateway processing charges
+            self.egress_only_igw = ec2.EgressOnlyInternetGateway(
+                append_resource_suffix(self.resource_name_base),
+                vpc_id=self.vpc.id,
+                tags=common_tags_native(),
+                opts=ResourceOptions(parent=self),
+            )
+            create_ssm_param_in_all_accounts(
+                providers=all_providers.all_native_providers,
+                parent=self.ipv6_cidr_block_association,
+                resource_name_prefix=f"central-networking-vpc-ipv6-cidr-{name}",
+                param_value=self.ipv6_cidr_block,
+                param_name=f"{CENTRAL_NETWORKING_SSM_PREFIX}/vpcs/{name}/ipv6-cidr-block",
+                include_this_account=True,
+            )
+        if flow_logs_config is not None:
+            self.flow_logs = VpcFlowLogs(vpc=self, config=flow_logs_config)
+
+    def share_subnet(
+        self, *, subnet_arn: Output[str], principals: list[str], resource_name: str, parent: Resource
+    ) -> pulumi_aws.ram.ResourceAssociation:
+        """Add the subnet to the VPC's one RAM share for these principals, creating that share the first time.
+
+        Fewer shares means fewer RAM principal association workflows to wait on before the shared resources can be tagged.
+        """
+        principals_key = ram_share_principals_key(principals)
+        if principals_key not in self.subnet_shares:
+            self.subnet_shares[principals_key] = ram.ResourceShare(
+                append_resource_suffix(f"{self.name}-subnets-{principals_key}", max_length=150),
+                principals=sorted(set(principals)),
+                allow_external_principals=False,
+                tags=common_tags_native(),
+                opts=ResourceOptions(parent=self),
+            )
+        subnet_share = self.subnet_shares[principals_key]
+        # the classic provider's association adds one resource to an existing share, which the native provider can't do
+        return pulumi_aws.ram.ResourceAssociation(
+            append_resource_suffix(resource_name, max_length=150),
+            resource_arn=subnet_arn,
+            resource_share_arn=subnet_share.arn,
+            opts=ResourceOptions(parent=parent),
+        )
+
+    def create_endpoints(self, *, all_subnets: dict[str, "SharedSubnet"]) -> CentralNetworkingVpcEndpoints | None:
+        """Create the configured endpoints, adding the gateway endpoints to the route table of every subnet in the VPC."""
+        if self.endpoints_config is None:
+            return None
+        return CentralNetworkingVpcEndpoints(
+            vpc=self, config=self.endpoints_config, all_providers=self.all_providers, all_subnets=all_subnets
+        )
 
 
 class SharedSubnetConfig(BaseModel):
     name: str
     vpc: CentralNetworkingVpc
-    cidr_block: str
+    cidr_block: str | None = None  # when not specified, a block of `size` is allocated from the VPC's free space
+    size: SubnetSize = SubnetSize.ADDRESSES_16
     map_public_ip_on_launch: bool = False
     route_to_internet_gateway: bool = False
-    route_to_nat_gateway: ec2.NatGateway | None = None
+    route_to_nat_gateway: ec2.NatGateway | NatGatewayPool | None = None  # a pool routes to its NAT in this subnet's AZ
+    allow_cross_az_nat: bool = False  # when routing to a pool with no NAT in this subnet's AZ, use one in another AZ
+    route_to_transit_gateway: bool = False  # send internet bound traffic through the egress hub this VPC is a spoke of
+    # dual-stack, with a /64 from the VPC's IPv6 block, and IPv6 egress through the (egress-only) internet gateway
+    assign_ipv6_cidr_block: bool = False
+    # extra EIPs on the NAT created by create_nat, each adds 55,000 simultaneous connections to a single destination
+    nat_secondary_eip_count: int = Field(default=0, ge=0, le=MAX_SECONDARY_EIPS_PER_NAT)
     create_nat: bool = False  # Note! NATs must (should?) be in the same availability zone as the subnet they serve (i.e. the public subnet the NAT is in must be the same AZ as the private subnet routing to it)
+    # registers the NAT created by create_nat in this pool under the subnet's AZ, so other subnets can route to the pool
+    # (the subnets routing to it must be defined after this one)
+    add_nat_to_pool: NatGatewayPool | None = None
     availability_zone_id: str = "use1-az1"  # must use ID, not name https://docs.aws.amazon.com/vpc/latest/userguide/vpc-sharing-share-subnet-working-with.html
     accounts_to_share_to: list[
         AwsAccountId | Literal["all"]
     ]  # list of account IDs to share the subnet to, or 'all' to share to all accounts in the organization
+    ipv6_subnet_index: int | None = None  # filled in by assign_subnet_cidr_blocks when assign_ipv6_cidr_block is set
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+class MultipleDefaultRoutesError(Exception):
+    def __init__(self, subnet_name: str):
+        super().__init__(
+            f"Subnet {subnet_name} can only have one default route, choose one of route_to_internet_gateway, route_to_nat_gateway or route_to_transit_gateway"
+        )
+
+
+class NatPoolWithoutNatError(Exception):
+    def __init__(self, *, subnet_name: str, pool_name: str):
+        super().__init__(
+            f"Subnet {subnet_name} adds its NAT gateway to the pool {pool_name}, but doesn't have create_nat=True"
+        )
+
+
+class VpcIpv6NotEnabledError(Exception):
+    def __init__(self, *, subnet_name: str, vpc_name: str):
+        super().__init__(
+            f"Subnet {subnet_name} requests an IPv6 CIDR block, but its VPC {vpc_name} was created without enable_ipv6=True"
+        )
+
+
+class VpcIpv6CidrBlockNotAssignedError(Exception):
+    def __init__(self, vpc_name: str):
+        super().__init__(
+            f"VPC {vpc_name} was created with enable_ipv6=True, but AWS did not assign it an IPv6 CIDR block"
+        )
+
+
+class SubnetCidrBlockNotAssignedError(Exception):
+    def __init__(self, subnet_name: str):
+        super().__init__(
+            f"Subnet {subnet_name} has no CIDR block, call assign_subnet_cidr_blocks with its config before creating it"
+        )
+
+
+def assign_subnet_cidr_blocks(
+    *,
+    vpcs: dict[str, CentralNetworkingVpc],
+    subnet_configs: list[SharedSubnetConfig],
+    allocations_path: Path,
+    write_allocations: bool = False,
+) -> None:
+    """Validate every subnet's CIDR block against its VPC and the other subnets, and fill in any that are unspecified.
+
+    Unspecified blocks must already be committed in `allocations_path`, otherwise this raises rather than letting a
+    preview or update depend on allocations that aren't in the source. Only `write_allocations` (set by the
+    allocate_cidr_blocks CLI) writes new allocations to the file.
+    """
+    for config in subnet_configs:
+        if config.assign_ipv6_cidr_block and not config.vpc.ipv6_enabled:
+            raise VpcIpv6NotEnabledError(subnet_name=config.name, vpc_name=config.vpc.name)
+    previous = CidrAllocations.load(allocations_path)
+    requests = [
+        SubnetCidrRequest(
+            vpc_name=config.vpc.name,
+            subnet_name=config.name,
+            cidr_block=config.cidr_block,
+            size=config.size,
+            ipv6=config.assign_ipv6_cidr_block,
+        )
+        for config in subnet_configs
+    ]
+    allocations = plan_subnet_cidr_blocks(
+        vpc_cidr_blocks={vpc_name: vpc.cidr_block for vpc_name, vpc in vpcs.items()},
+        requests=requests,
+        previous=previous,
+    )
+    if write_allocations:
+        if allocations != previous:
+            allocations.save(allocations_path)
+            logger.warning(f"The subnet CIDR allocations changed, commit {allocations_path} so they remain stable")
+    else:
+        uncommitted = find_uncommitted_subnets(requests=requests, allocations=allocations, previous=previous)
+        if uncommitted:
+            raise UncommittedCidrAllocationsError(subnet_names=uncommitted, allocations_path=allocations_path)
+    for config in subnet_configs:
+        config.cidr_block = allocations.vpcs[config.vpc.name][config.name]
+        if config.assign_ipv6_cidr_block:
+            config.ipv6_subnet_index = allocations.ipv6_subnet_indexes[config.vpc.name][config.name]
+
+
+def validate_subnet_config(config: SharedSubnetConfig) -> None:
+    """Check the config can be created, after its CIDR blocks have been assigned."""
+    if config.cidr_block is None:
+        raise SubnetCidrBlockNotAssignedError(config.name)
+    default_route_targets = [
+        config.route_to_internet_gateway,
+        config.route_to_nat_gateway is not None,
+        config.route_to_transit_gateway,
+    ]
+    if sum(default_route_targets) > 1:
+        raise MultipleDefaultRoutesError(config.name)
+    if config.assign_ipv6_cidr_block and config.ipv6_subnet_index is None:
+        raise SubnetCidrBlockNotAssignedError(config.name)
+    if config.add_nat_to_pool is not None and not config.create_nat:
+        raise NatPoolWithoutNatError(subnet_name=config.name, pool_name=config.add_nat_to_pool.name)
+
+
 class SharedSubnet(ComponentResource):
     def __init__(
         self,
@@ -163,51 +431,72 @@ class SharedSubnet(ComponentResource):
         org_arn: str,
         all_providers: AllAccountProviders,
         all_subnets: dict[str, Self],
+        parent: Resource | None = None,  # defaults to the VPC
     ):
+        validate_subnet_config(config)
         super().__init__(
             "labauto:CentralNetworkingSharedSubnet",
             append_resource_suffix(config.name),
             None,
-            opts=ResourceOptions(parent=config.vpc),
+            opts=ResourceOptions(parent=config.vpc if parent is None else parent),
         )
 
         all_subnets[config.name] = self
+        self.config = config
+        self.vpc = config.vpc
+        self.availability_zone_id = config.availability_zone_id
+        self.route_to_transit_gateway = config.route_to_transit_gateway  # the route is created by the egress hub
         self.resource_base_name = f"central-{config.name}"
+        self.routed_nat_gateway: ec2.NatGateway | None = None  # resolved from route_to_nat_gateway, for route analysis
         subnet_tags = [TagArgs(key="Name", value=f"central-networking-{config.name}"), *common_tags_native()]
-        subnet = ec2.Subnet(
+        ipv6_subnet_index = config.ipv6_subnet_index
+        self.ipv6_cidr_block: Output[str] | None = None
+        if ipv6_subnet_index is not None:
+            self.ipv6_cidr_block = config.vpc.ipv6_cidr_block.apply(
+                lambda vpc_ipv6_cidr_block: ipv6_subnet_cidr_block(
+                    vpc_ipv6_cidr_block=vpc_ipv6_cidr_block, index=ipv6_subnet_index
+                )
+            )
+        self.subnet = ec2.Subnet(
             append_resource_suffix(self.resource_base_name, max_length=75),
             vpc_id=config.vpc.vpc.id,
             availability_zone_id=config.availability_zone_id,
             cidr_block=config.cidr_block,
+            ipv6_cidr_block=self.ipv6_cidr_block,
+            assign_ipv6_address_on_creation=True if self.ipv6_cidr_block is not None else None,
             map_public_ip_on_launch=config.map_public_ip_on_launch,
             tags=subnet_tags,
             opts=ResourceOptions(parent=self),
         )
         principals = [org_arn if value == "all" else value for value in config.accounts_to_share_to]
-        self.subnet_share = ram.ResourceShare(
-            append_resource_suffix(self.resource_base_name, max_length=150),
-            resource_arns=[
-                subnet.subnet_id.apply(
-                    lambda subnet_id: (
-                        f"arn:aws:ec2:{pulumi_aws.config.region}:{get_aws_account_id()}:subnet/{subnet_id}"
-                    )
-                )
-            ],
-            principals=principals,
-            opts=ResourceOptions(parent=self),
-            allow_external_principals=False,
-            tags=common_tags_native(),
+        subnet_arn = self.subnet.subnet_id.apply(
+            lambda subnet_id: f"arn:aws:ec2:{pulumi_aws.config.region}:{get_aws_account_id()}:subnet/{subnet_id}"
         )
+        # the shared resources are tagged and published once this exists, since that's when the other accounts can see them
+        self.subnet_share: Resource
+        if USE_BATCHED_SUBNET_RAM_SHARES:
+            self.subnet_share = config.vpc.share_subnet(
+                subnet_arn=subnet_arn, principals=principals, resource_name=self.resource_base_name, parent=self
+            )
+        else:
+            self.subnet_share = ram.ResourceShare(
+                append_resource_suffix(self.resource_base_name, max_length=150),
+                resource_arns=[subnet_arn],
+                principals=principals,
+                opts=ResourceOptions(parent=self),
+                allow_external_principals=False,
+                tags=common_tags_native(),
+            )
         tag_shared_resource(
             providers=all_providers.all_classic_providers,
             tags=subnet_tags,
             resource_name=f"{self.resource_base_name}-subnet",
-            resource_id=subnet.subnet_id,
+            resource_id=self.subnet.subnet_id,
             parent=self.subnet_share,
             accounts_to_share_to=config.accounts_to_share_to,
         )
         route_table_tags = [TagArgs(key="Name", value=self.resource_base_name), *common_tags_native()]
-        route_table = ec2.RouteTable(
+        self.route_table = ec2.RouteTable(
             append_resource_suffix(self.resource_base_name, max_length=75),
             vpc_id=config.vpc.vpc.id,
             tags=route_table_tags,
@@ -217,32 +506,60 @@ class SharedSubnet(ComponentResource):
             providers=all_providers.all_classic_providers,
             tags=route_table_tags,
             resource_name=f"{self.resource_base_name}-route-table",
-            resource_id=route_table.id,
+            resource_id=self.route_table.id,
             parent=self.subnet_share,
             accounts_to_share_to=config.accounts_to_share_to,
         )
 
         _ = ec2.SubnetRouteTableAssociation(
             append_resource_suffix(self.resource_base_name, max_length=150),
-            subnet_id=subnet.id,
-            route_table_id=route_table.id,
-            opts=ResourceOptions(parent=route_table),
+            subnet_id=self.subnet.id,
+            route_table_id=self.route_table.id,
+            opts=ResourceOptions(parent=self.route_table),
         )
         if config.route_to_internet_gateway:
             _ = ec2.Route(
                 append_resource_suffix(f"{self.resource_base_name}-to-igw", max_length=150),
-                route_table_id=route_table.id,
+                route_table_id=self.route_table.id,
                 destination_cidr_block="0.0.0.0/0",
                 gateway_id=config.vpc.igw.id,
-                opts=ResourceOptions(parent=route_table),
+                opts=ResourceOptions(parent=self.route_table),
             )
         if config.route_to_nat_gateway is not None:
+            nat_gateway = (
+                config.route_to_nat_gateway.select(
+                    availability_zone_id=config.availability_zone_id, allow_cross_az=config.allow_cross_az_nat
+                )
+                if isinstance(config.route_to_nat_gateway, NatGatewayPool)
+                else config.route_to_nat_gateway
+            )
+            self.routed_nat_gateway = nat_gateway
             _ = ec2.Route(
                 append_resource_suffix(f"{self.resource_base_name}-to-nat", max_length=150),
-                route_table_id=route_table.id,
+                route_table_id=self.route_table.id,
                 destination_cidr_block="0.0.0.0/0",
-                gateway_id=config.route_to_nat_gateway.id,
-                opts=ResourceOptions(parent=route_table),
+                gateway_id=nat_gateway.id,
+                opts=ResourceOptions(parent=self.route_table),
+            )
+        if self.ipv6_cidr_block is not None:
+            # public subnets take IPv6 in and out through the internet gateway, all others only egress through the egress-only one
+            _ = ec2.Route(
+                append_resource_suffix(f"{self.resource_base_name}-ipv6-to-igw", max_length=150),
+                route_table_id=self.route_table.id,
+                destination_ipv6_cidr_block="::/0",
+                gateway_id=config.vpc.igw.id if config.route_to_internet_gateway else None,
+                egress_only_internet_gateway_id=None
+                if config.route_to_internet_gateway
+                else config.vpc.egress_only_igw.aws_id,
+                opts=ResourceOptions(parent=self.route_table),
+            )
+            create_ssm_param_in_all_accounts(
+                providers=all_providers.all_native_providers,
+                parent=self.subnet,
+                resource_name_prefix=f"central-networking-subnet-ipv6-cidr-{config.name}",
+                param_value=self.ipv6_cidr_block,
+                param_name=f"{CENTRAL_NETWORKING_SSM_PREFIX}/subnets/{config.name}/ipv6-cidr-block",
+                include_this_account=True,
             )
         if config.create_nat:
             nat_eip = ec2.Eip(
@@ -251,18 +568,32 @@ class SharedSubnet(ComponentResource):
                 tags=common_tags_native(),
                 opts=ResourceOptions(parent=self, depends_on=[config.vpc.igw]),
             )
+            secondary_eips = [
+                ec2.Eip(
+                    append_resource_suffix(f"{self.resource_base_name}-nat-{index}", max_length=150),
+                    domain="vpc",
+                    tags=common_tags_native(),
+                    opts=ResourceOptions(parent=self, depends_on=[config.vpc.igw]),
+                )
+                for index in range(1, config.nat_secondary_eip_count + 1)
+            ]
             self.nat_gateway = ec2.NatGateway(
                 append_resource_suffix(self.resource_base_name, max_length=75),
                 allocation_id=nat_eip.allocation_id,
-                subnet_id=subnet.id,
+                secondary_allocation_ids=[eip.allocation_id for eip in secondary_eips] or None,
+                subnet_id=self.subnet.id,
                 tags=common_tags_native(),
                 opts=ResourceOptions(parent=self),
             )
+            if config.add_nat_to_pool is not None:
+                config.add_nat_to_pool.add(
+                    availability_zone_id=config.availability_zone_id, nat_gateway=self.nat_gateway
+                )
         create_ssm_param_in_all_accounts(
             providers=all_providers.all_native_providers,
             parent=self.subnet_share,
             resource_name_prefix=f"central-networking-subnet-id-{config.name}",
-            param_value=subnet.subnet_id,
+            param_value=self.subnet.subnet_id,
             param_name=f"{CENTRAL_NETWORKING_SSM_PREFIX}/subnets/{config.name}/id",
             include_this_account=True,
         )
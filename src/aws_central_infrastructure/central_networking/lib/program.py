@@ -1,24 +1,38 @@
 import logging
+import os
 
 import pulumi_aws
-from ephemeral_pulumi_deploy import append_resource_suffix
 from lab_auto_pulumi import GENERIC_CENTRAL_PRIVATE_SUBNET_NAME
 from lab_auto_pulumi import GENERIC_CENTRAL_PUBLIC_SUBNET_NAME
 from lab_auto_pulumi import GENERIC_CENTRAL_VPC_NAME
-from lab_auto_pulumi import AwsAccountInfo
-from pulumi import ResourceOptions
-from pulumi_aws.ec2 import InstanceMetadataDefaults
 from pulumi_aws.organizations import get_organization
 
 from aws_central_infrastructure.iac_management.lib import load_workload_info
 
 from ..subnets import define_subnets
 from .constants import CREATE_PRIVATE_SUBNET
+from .constants import CREATE_VPC_ENDPOINTS
+from .constants import CREATE_VPC_FLOW_LOGS
+from .constants import ENABLE_GENERIC_VPC_IPV6
+from .constants import IMDS_ADDITIONAL_REGIONS
+from .constants import IMDS_CONCURRENCY_BUDGET
+from .flow_logs import VpcFlowLogsConfig
+from .instance_metadata import InstanceMetadataDefaultsFanOut
+from .ipam import CIDR_ALLOCATIONS_PATH
+from .ipam import WRITE_CIDR_ALLOCATIONS_ENV_VAR
 from .network import AllAccountProviders
 from .network import CentralNetworkingVpc
 from .network import SharedSubnet
 from .network import SharedSubnetConfig
+from .network import assign_subnet_cidr_blocks
 from .network import tag_shared_resource
+from .route_analysis import check_default_routes
+from .subnet_group import SharedSubnetGroup
+from .subnet_group import SharedSubnetGroupConfig
+from .subnet_group import validate_subnet_group_nat_references
+from .transit_gateway import EgressHub
+from .transit_gateway import EgressHubConfig
+from .vpc_endpoints import VpcEndpointsConfig
 
 logger = logging.getLogger(__name__)
 
@@ -31,21 +45,29 @@ def pulumi_program() -> None:
     org_info = get_organization()
     # TODO: ensure all VPCs have unique names
     # TODO: ensure all subnets have unique names
-    # TODO: ensure CIDR ranges don't conflict between subnets (and are valid within the VPC)
-    # TODO: define ENUMs for cidr range sizes...in a private subnet, 5 of the IP addresses seem to be consumed by default already, so keep that in mind
     all_vpcs: dict[str, CentralNetworkingVpc] = {}
     all_subnets: dict[str, SharedSubnet] = {}
-    generic_vpc = CentralNetworkingVpc(name=GENERIC_CENTRAL_VPC_NAME, all_providers=all_providers, all_vpcs=all_vpcs)
+    generic_vpc = CentralNetworkingVpc(
+        name=GENERIC_CENTRAL_VPC_NAME,
+        all_providers=all_providers,
+        all_vpcs=all_vpcs,
+        endpoints_config=VpcEndpointsConfig(interface_subnet_names=[GENERIC_CENTRAL_PUBLIC_SUBNET_NAME])
+        if CREATE_VPC_ENDPOINTS
+        else None,
+        flow_logs_config=VpcFlowLogsConfig() if CREATE_VPC_FLOW_LOGS else None,
+        enable_ipv6=ENABLE_GENERIC_VPC_IPV6,
+    )
+    generic_public_config = SharedSubnetConfig(
+        name=GENERIC_CENTRAL_PUBLIC_SUBNET_NAME,
+        vpc=generic_vpc,
+        map_public_ip_on_launch=True,
+        cidr_block="10.0.1.0/28",
+        create_nat=CREATE_PRIVATE_SUBNET,
+        route_to_internet_gateway=True,
+        accounts_to_share_to=["all"],
+    )
     generic_public = SharedSubnet(
-        config=SharedSubnetConfig(
-            name=GENERIC_CENTRAL_PUBLIC_SUBNET_NAME,
-            vpc=generic_vpc,
-            map_public_ip_on_launch=True,
-            cidr_block="10.0.1.0/28",
-            create_nat=CREATE_PRIVATE_SUBNET,
-            route_to_internet_gateway=True,
-            accounts_to_share_to=["all"],
-        ),
+        config=generic_public_config,
         all_subnets=all_subnets,
         org_arn=org_info.arn,
         all_providers=all_providers,
@@ -61,46 +83,84 @@ def pulumi_program() -> None:
         ],  # the VPC itself isn't actually shared with the other accounts directly, it's only shared via the subnet, so need to wait for that RAM share to be created
         accounts_to_share_to=["all"],
     )
+    generic_private_config = SharedSubnetConfig(  # this should only be used for quick proof of concepts, dedicated subnets should be made for long term use
+        name=GENERIC_CENTRAL_PRIVATE_SUBNET_NAME,
+        vpc=generic_vpc,
+        cidr_block="10.0.1.16/28",
+        route_to_nat_gateway=generic_public.nat_gateway if CREATE_PRIVATE_SUBNET else None,
+        accounts_to_share_to=["all"],
+    )
     if CREATE_PRIVATE_SUBNET:
-        _ = SharedSubnet(  # this should only be used for quick proof of concepts, dedicated subnets should be made for long term use
-            config=SharedSubnetConfig(
-                name=GENERIC_CENTRAL_PRIVATE_SUBNET_NAME,
-                vpc=generic_vpc,
-                cidr_block="10.0.1.16/28",
-                route_to_nat_gateway=generic_public.nat_gateway,
-                accounts_to_share_to=["all"],
-            ),
+        _ = SharedSubnet(
+            config=generic_private_config,
             all_subnets=all_subnets,
             org_arn=org_info.arn,
             all_providers=all_providers,
         )
     subnet_configs: list[SharedSubnetConfig] = []
-    define_subnets(vpcs=all_vpcs, subnet_configs=subnet_configs, all_subnets=all_subnets, workloads_info=workloads_info)
+    subnet_group_configs: list[SharedSubnetGroupConfig] = []
+    egress_hub_configs: list[EgressHubConfig] = []
+    define_subnets(
+        vpcs=all_vpcs,
+        subnet_configs=subnet_configs,
+        subnet_group_configs=subnet_group_configs,
+        egress_hub_configs=egress_hub_configs,
+        all_subnets=all_subnets,
+        workloads_info=workloads_info,
+    )
+    validate_subnet_group_nat_references(subnet_group_configs)
+    expanded_subnet_groups = [(group_config, group_config.expand()) for group_config in subnet_group_configs]
+    assign_subnet_cidr_blocks(
+        vpcs=all_vpcs,
+        # the generic private subnet's block stays reserved even when it isn't created, so it's free whenever it's enabled
+        subnet_configs=[
+            generic_public_config,
+            generic_private_config,
+            *subnet_configs,
+            *(
+                subnet_config
+                for _, group_subnet_configs in expanded_subnet_groups
+                for subnet_config in group_subnet_configs
+            ),
+        ],
+        allocations_path=CIDR_ALLOCATIONS_PATH,
+        write_allocations=WRITE_CIDR_ALLOCATIONS_ENV_VAR in os.environ,
+    )
     for subnet_config in subnet_configs:
         _ = SharedSubnet(
             config=subnet_config, org_arn=org_info.arn, all_providers=all_providers, all_subnets=all_subnets
         )
+    all_subnet_groups: dict[str, SharedSubnetGroup] = {}
+    for group_config, group_subnet_configs in expanded_subnet_groups:
+        _ = SharedSubnetGroup(
+            config=group_config,
+            subnet_configs=group_subnet_configs,
+            org_arn=org_info.arn,
+            all_providers=all_providers,
+            all_subnets=all_subnets,
+            all_subnet_groups=all_subnet_groups,
+        )
+    for vpc in all_vpcs.values():
+        _ = vpc.create_endpoints(all_subnets=all_subnets)
+    for hub_config in egress_hub_configs:
+        _ = EgressHub(
+            config=hub_config,
+            org_arn=org_info.arn,
+            all_providers=all_providers,
+            all_vpcs=all_vpcs,
+            all_subnets=all_subnets,
+        )
+    for reachability in check_default_routes(all_subnets=all_subnets, egress_hubs=egress_hub_configs).values():
+        if reachability.reaches_internet:
+            logger.info(
+                f"Subnet {reachability.subnet_name} reaches the internet through {reachability.via_nat_subnet_name or reachability.egress_subnet_name}"
+            )
 
     # set EC2 instance metadata defaults
-    region = pulumi_aws.config.region
-    _ = InstanceMetadataDefaults(
-        append_resource_suffix(f"central-infra-{region}"),
-        http_tokens="required",  # enforce imdsv2
-        http_put_response_hop_limit=1,
+    _ = InstanceMetadataDefaultsFanOut(
+        workloads_info=workloads_info,
+        all_providers=all_providers,
+        home_region=str(pulumi_aws.config.region),
+        additional_regions=IMDS_ADDITIONAL_REGIONS,
+        concurrency_budget=IMDS_CONCURRENCY_BUDGET,
     )
-    for workload_info in workloads_info.values():
-        workload_name = workload_info.name
-        all_accounts: list[AwsAccountInfo] = []
-
-        all_accounts.extend(
-            [*workload_info.prod_accounts, *workload_info.staging_accounts, *workload_info.dev_accounts]
-        )
-        for account in all_accounts:
-            _ = InstanceMetadataDefaults(
-                append_resource_suffix(f"{workload_name}-{account.name}-{region}", max_length=150),
-                http_tokens="required",  # enforce imdsv2
-                http_put_response_hop_limit=1,  # enforce imdsv2
-                opts=ResourceOptions(
-                    provider=all_providers.all_classic_providers[account.id], delete_before_replace=True
-                ),
-            )
@@ -0,0 +1,210 @@
+import math
+from typing import Literal
+
+from pydantic import BaseModel
+
+from .network import SharedSubnet
+from .transit_gateway import EgressHubConfig
+
+type DefaultRouteTarget = Literal["internet_gateway", "nat_gateway", "transit_gateway", "none"]
+
+# the terminal states of a default route chain, stored in the next hop array alongside the (non-negative) subnet indexes
+_REACHES_INTERNET = -1
+_NO_DEFAULT_ROUTE = -2
+_BLACKHOLE = -3
+
+
+class SubnetDefaultRoute(BaseModel):
+    """Where a subnet's IPv4 default route (0.0.0.0/0) points, as declared in its config."""
+
+    subnet_name: str
+    vpc_name: str
+    availability_zone_id: str
+    target: DefaultRouteTarget
+    nat_subnet_name: str | None = None  # the subnet the routed NAT gateway lives in, when the target is a NAT gateway
+    hosts_nat: bool = False
+
+
+class SubnetReachability(BaseModel):
+    subnet_name: str
+    reaches_internet: bool
+    egress_subnet_name: str | None = None  # the subnet whose route table sends the traffic to the internet gateway
+    via_nat_subnet_name: str | None = None  # the subnet holding the NAT gateway the traffic leaves through, if any
+    blackhole_reason: str | None = None  # set when the default route leads somewhere that can't forward the traffic
+
+
+class BlackholeRoutesError(Exception):
+    def __init__(self, blackholes: list[SubnetReachability]):
+        details = "; ".join(
+            f"{reachability.subnet_name}: {reachability.blackhole_reason}" for reachability in blackholes
+        )
+        super().__init__(f"The default routes of {len(blackholes)} subnet(s) can't reach the internet: {details}")
+
+
+def describe_default_routes(all_subnets: dict[str, SharedSubnet]) -> list[SubnetDefaultRoute]:
+    """Read the default route of every subnet from the declared configs, before anything is deployed."""
+    nat_subnet_names = {
+        id(subnet.nat_gateway): subnet_name for subnet_name, subnet in all_subnets.items() if subnet.config.create_nat
+    }
+    routes: list[SubnetDefaultRoute] = []
+    for subnet_name, subnet in all_subnets.items():
+        target: DefaultRouteTarget = "none"
+        nat_subnet_name = None
+        if subnet.config.route_to_internet_gateway:
+            target = "internet_gateway"
+        elif subnet.routed_nat_gateway is not None:
+            target = "nat_gateway"
+            nat_subnet_name = nat_subnet_names.get(id(subnet.routed_nat_gateway))
+        elif subnet.config.route_to_transit_gateway:
+            target = "transit_gateway"
+        routes.append(
+            SubnetDefaultRoute(
+                subnet_name=subnet_name,
+                vpc_name=subnet.vpc.name,
+                availability_zone_id=subnet.availability_zone_id,
+                target=target,
+                nat_subnet_name=nat_subnet_name,
+                hosts_nat=subnet.config.create_nat,
+            )
+        )
+    return routes
+
+
+def _resolve_nat_hop(
+    *, route: SubnetDefaultRoute, routes: list[SubnetDefaultRoute], index_by_name: dict[str, int]
+) -> tuple[int, str | None]:
+    nat_route = None if route.nat_subnet_name is None else routes[index_by_name[route.nat_subnet_name]]
+    if nat_route is None or not nat_route.hosts_nat:
+        return _BLACKHOLE, "routes to a NAT gateway that isn't created by any subnet"
+    if nat_route.vpc_name != route.vpc_name:
+        return _BLACKHOLE, f"routes to the NAT gateway in {nat_route.subnet_name}, which is in another VPC"
+    return index_by_name[nat_route.subnet_name], None
+
+
+def _resolve_transit_gateway_hop(
+    *, route: SubnetDefaultRoute, index_by_name: dict[str, int], egress_attachment_subnets: list[SubnetDefaultRoute]
+) -> tuple[int, str | None]:
+    if not egress_attachment_subnets:
+        return _BLACKHOLE, f"routes to a transit gateway, but VPC {route.vpc_name} is not a spoke of any egress hub"
+    # the transit gateway keeps traffic in the same AZ when the egress VPC has an attachment there
+    same_az = [
+        subnet for subnet in egress_attachment_subnets if subnet.availability_zone_id == route.availability_zone_id
+    ]
+    return index_by_name[(same_az or egress_attachment_subnets)[0].subnet_name], None
+
+
+def _resolve_next_hop(
+    *,
+    route: SubnetDefaultRoute,
+    routes: list[SubnetDefaultRoute],
+    index_by_name: dict[str, int],
+    egress_attachment_subnets_by_spoke_vpc: dict[str, list[SubnetDefaultRoute]],
+) -> tuple[int, str | None]:
+    match route.target:
+        case "internet_gateway":
+            return _REACHES_INTERNET, None
+        case "none":
+            return _NO_DEFAULT_ROUTE, None
+        case "nat_gateway":
+            return _resolve_nat_hop(route=route, routes=routes, index_by_name=index_by_name)
+        case "transit_gateway":
+            return _resolve_transit_gateway_hop(
+                route=route,
+                index_by_name=index_by_name,
+                egress_attachment_subnets=egress_attachment_subnets_by_spoke_vpc.get(route.vpc_name, []),
+            )
+
+
+def _resolve_next_hops(
+    routes: list[SubnetDefaultRoute], egress_hubs: list[EgressHubConfig]
+) -> tuple[list[int], list[str | None]]:
+    """Turn each subnet's default route into the index of the subnet that forwards the traffic next (or a terminal state)."""
+    index_by_name = {route.subnet_name: index for index, route in enumerate(routes)}
+    egress_attachment_subnets_by_spoke_vpc: dict[str, list[SubnetDefaultRoute]] = {}
+    for hub in egress_hubs:
+        egress_attachment_subnets = [
+            routes[index_by_name[subnet_name]]
+            for subnet_name in hub.egress.subnet_names
+            if subnet_name in index_by_name
+        ]
+        for spoke in hub.spokes:
+            egress_attachment_subnets_by_spoke_vpc[spoke.vpc_name] = egress_attachment_subnets
+
+    next_hops: list[int] = []
+    reasons: list[str | None] = []
+    for route in routes:
+        next_hop, reason = _resolve_next_hop(
+            route=route,
+            routes=routes,
+            index_by_name=index_by_name,
+            egress_attachment_subnets_by_spoke_vpc=egress_attachment_subnets_by_spoke_vpc,
+        )
+        next_hops.append(next_hop)
+        reasons.append(reason)
+    return next_hops, reasons
+
+
+def analyze_reachability(
+    routes: list[SubnetDefaultRoute], egress_hubs: list[EgressHubConfig] | None = None
+) -> dict[str, SubnetReachability]:
+    """Follow the default route of every subnet at once, by pointer jumping over the array of next hops.
+
+    Each round replaces every subnet's next hop with its next hop's next hop, so after log2(n) rounds every chain has
+    collapsed onto its terminal state. Anything still pointing at a subnet is in a routing loop. A blackhole anywhere
+    along a chain is inherited by every subnet routing through it.
+    """
+    next_hops, reasons = _resolve_next_hops(routes, egress_hubs or [])
+    exit_nodes = list(range(len(routes)))  # the last subnet before the terminal state
+    for _ in range(math.ceil(math.log2(max(len(routes), 2))) + 1):
+        new_next_hops = list(next_hops)
+        new_exit_nodes = list(exit_nodes)
+        for index, next_hop in enumerate(next_hops):
+            if next_hop >= 0:
+                new_next_hops[index] = next_hops[next_hop]
+                new_exit_nodes[index] = exit_nodes[next_hop]
+        next_hops, exit_nodes = new_next_hops, new_exit_nodes
+
+    results: dict[str, SubnetReachability] = {}
+    for index, route in enumerate(routes):
+        next_hop = next_hops[index]
+        exit_node = exit_nodes[index]
+        if next_hop == _REACHES_INTERNET:
+            exit_route = routes[exit_node]
+            results[route.subnet_name] = SubnetReachability(
+                subnet_name=route.subnet_name,
+                reaches_internet=True,
+                egress_subnet_name=exit_route.subnet_name,
+                via_nat_subnet_name=exit_route.subnet_name if exit_node != index and exit_route.hosts_nat else None,
+            )
+        elif next_hop == _BLACKHOLE:
+            results[route.subnet_name] = SubnetReachability(
+                subnet_name=route.subnet_name,
+                reaches_internet=False,
+                blackhole_reason=reasons[index]
+                or f"routes through {routes[exit_node].subnet_name}, which {reasons[exit_node]}",
+            )
+        elif next_hop == _NO_DEFAULT_ROUTE:
+            # a subnet with no default route at all is isolated on purpose, but routing into one drops the traffic
+            results[route.subnet_name] = SubnetReachability(
+                subnet_name=route.subnet_name,
+                reaches_internet=False,
+                blackhole_reason=None
+                if exit_node == index
+                else f"routes through {routes[exit_node].subnet_name}, which has no default route",
+            )
+        else:
+            results[route.subnet_name] = SubnetReachability(
+                subnet_name=route.subnet_name, reaches_internet=False, blackhole_reason="is part of a routing loop"
+            )
+    return results
+
+
+def check_default_routes(
+    *, all_subnets: dict[str, SharedSubnet], egress_hubs: list[EgressHubConfig]
+) -> dict[str, SubnetReachability]:
+    """Fail before deploying if any subnet's default route leads somewhere that drops the traffic."""
+    results = analyze_reachability(describe_default_routes(all_subnets), egress_hubs)
+    blackholes = [reachability for reachability in results.values() if reachability.blackhole_reason is not None]
+    if blackholes:
+        raise BlackholeRoutesError(blackholes)
+    return results
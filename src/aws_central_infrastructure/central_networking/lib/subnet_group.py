@@ -0,0 +1,163 @@
+import math
+from ipaddress import IPv4Network
+from typing import TYPE_CHECKING
+from typing import Literal
+from typing import Self
+
+from ephemeral_pulumi_deploy import append_resource_suffix
+from lab_auto_pulumi import CENTRAL_NETWORKING_SSM_PREFIX
+from lab_auto_pulumi import AwsAccountId
+from pulumi import ComponentResource
+from pulumi import Output
+from pulumi import ResourceOptions
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+
+from .ipam import SubnetSize
+from .nat_pool import MAX_SECONDARY_EIPS_PER_NAT
+from .nat_pool import NatGatewayPool
+from .network import AllAccountProviders
+from .network import CentralNetworkingVpc
+from .network import SharedSubnet
+from .network import SharedSubnetConfig
+from .network import create_ssm_param_in_all_accounts
+
+if TYPE_CHECKING:
+    from pulumi_aws_native import ec2
+
+DEFAULT_AVAILABILITY_ZONE_IDS = ("use1-az1", "use1-az2", "use1-az4")
+
+
+class SubnetGroupNatMissingError(Exception):
+    def __init__(self, *, group_name: str, nat_group_name: str, availability_zone_id: str):
+        super().__init__(
+            f"Subnet group {group_name} routes to the NAT gateways of {nat_group_name}, but that group has no NAT gateway in {availability_zone_id}. Ensure {nat_group_name} has create_nat=True, covers the same availability zones, and is defined before {group_name}"
+        )
+
+
+class UnknownNatSubnetGroupError(Exception):
+    def __init__(self, *, group_name: str, nat_group_name: str):
+        super().__init__(
+            f"Subnet group {group_name} routes to the NAT gateways of {nat_group_name}, but no subnet group named {nat_group_name} is defined before it. Define {nat_group_name} earlier in the list"
+        )
+
+
+class SharedSubnetGroupConfig(BaseModel):
+    """One logical subnet spread across availability zones, with one subnet (and route table) per AZ."""
+
+    name: str
+    vpc: CentralNetworkingVpc
+    availability_zone_ids: list[str] = Field(default_factory=lambda: list(DEFAULT_AVAILABILITY_ZONE_IDS))
+    cidr_block: str | None = None  # when specified, it is split evenly between the AZs
+    size: SubnetSize = SubnetSize.ADDRESSES_16  # the size of each AZ's subnet, when cidr_block isn't specified
+    map_public_ip_on_launch: bool = False
+    route_to_internet_gateway: bool = False
+    create_nat: bool = False  # creates a NAT gateway in every AZ, so no traffic has to cross AZs to reach a NAT
+    nat_secondary_eip_count: int = Field(default=0, ge=0, le=MAX_SECONDARY_EIPS_PER_NAT)  # extra EIPs on each NAT
+    # the name of another subnet group (defined earlier) whose NAT gateway in the same AZ each subnet routes to
+    route_to_nat_gateways_of: str | None = None
+    allow_cross_az_nat: bool = False  # route AZs with no NAT in that group to one in another AZ, instead of erroring
+    route_to_transit_gateway: bool = False  # send internet bound traffic through the egress hub this VPC is a spoke of
+    assign_ipv6_cidr_block: bool = False  # dual-stack, with a /64 per AZ's subnet
+    accounts_to_share_to: list[
+        AwsAccountId | Literal["all"]
+    ]  # list of account IDs to share the subnets to, or 'all' to share to all accounts in the organization
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def subnet_name(self, availability_zone_id: str) -> str:
+        return f"{self.name}-{availability_zone_id}"
+
+    def split_cidr_block(self) -> list[str | None]:
+        if self.cidr_block is None:
+            return [None] * len(self.availability_zone_ids)
+        prefix_length_increase = math.ceil(math.log2(len(self.availability_zone_ids)))
+        blocks = IPv4Network(self.cidr_block).subnets(prefixlen_diff=prefix_length_increase)
+        return [str(block) for block, _ in zip(blocks, self.availability_zone_ids, strict=False)]
+
+    def expand(self) -> list[SharedSubnetConfig]:
+        """Create the config of each AZ's subnet (NAT routes are filled in when the group is created)."""
+        return [
+            SharedSubnetConfig(
+                name=self.subnet_name(availability_zone_id),
+                vpc=self.vpc,
+                cidr_block=cidr_block,
+                size=self.size,
+                map_public_ip_on_launch=self.map_public_ip_on_launch,
+                route_to_internet_gateway=self.route_to_internet_gateway,
+                route_to_transit_gateway=self.route_to_transit_gateway,
+                assign_ipv6_cidr_block=self.assign_ipv6_cidr_block,
+                create_nat=self.create_nat,
+                nat_secondary_eip_count=self.nat_secondary_eip_count,
+                allow_cross_az_nat=self.allow_cross_az_nat,
+                availability_zone_id=availability_zone_id,
+                accounts_to_share_to=self.accounts_to_share_to,
+            )
+            for availability_zone_id, cidr_block in zip(
+                self.availability_zone_ids, self.split_cidr_block(), strict=True
+            )
+        ]
+
+
+def validate_subnet_group_nat_references(configs: list[SharedSubnetGroupConfig]) -> None:
+    """Check each group's NAT gateways come from a group defined before it, since the groups are created in order."""
+    defined_group_names: set[str] = set()
+    for config in configs:
+        if config.route_to_nat_gateways_of is not None and config.route_to_nat_gateways_of not in defined_group_names:
+            raise UnknownNatSubnetGroupError(group_name=config.name, nat_group_name=config.route_to_nat_gateways_of)
+        defined_group_names.add(config.name)
+
+
+class SharedSubnetGroup(ComponentResource):
+    def __init__(  # noqa: PLR0913 # this is a lot of arguments, but they're all kwargs
+        self,
+        *,
+        config: SharedSubnetGroupConfig,
+        subnet_configs: list[SharedSubnetConfig],  # the expanded (and CIDR assigned) configs from `config.expand()`
+        org_arn: str,
+        all_providers: AllAccountProviders,
+        all_subnets: dict[str, SharedSubnet],
+        all_subnet_groups: dict[str, Self],
+    ):
+        super().__init__(
+            "labauto:CentralNetworkingSharedSubnetGroup",
+            append_resource_suffix(config.name),
+            None,
+            opts=ResourceOptions(parent=config.vpc),
+        )
+        all_subnet_groups[config.name] = self
+        self.subnets: dict[str, SharedSubnet] = {}  # keyed by AZ ID
+        self.nat_gateway_pool = NatGatewayPool(config.name)
+        self.nat_gateways: dict[str, ec2.NatGateway] = self.nat_gateway_pool.nat_gateways  # keyed by AZ ID
+        for subnet_config in subnet_configs:
+            availability_zone_id = subnet_config.availability_zone_id
+            if config.route_to_nat_gateways_of is not None:
+                nat_group = all_subnet_groups[config.route_to_nat_gateways_of]
+                if not config.allow_cross_az_nat and not nat_group.nat_gateway_pool.has_availability_zone(
+                    availability_zone_id
+                ):
+                    raise SubnetGroupNatMissingError(
+                        group_name=config.name,
+                        nat_group_name=config.route_to_nat_gateways_of,
+                        availability_zone_id=availability_zone_id,
+                    )
+                subnet_config.route_to_nat_gateway = nat_group.nat_gateway_pool
+            if subnet_config.create_nat:
+                subnet_config.add_nat_to_pool = self.nat_gateway_pool
+            subnet = SharedSubnet(
+                config=subnet_config,
+                org_arn=org_arn,
+                all_providers=all_providers,
+                all_subnets=all_subnets,
+                parent=self,
+            )
+            self.subnets[availability_zone_id] = subnet
+        create_ssm_param_in_all_accounts(
+            providers=all_providers.all_native_providers,
+            parent=self,
+            resource_name_prefix=f"central-networking-subnet-group-ids-{config.name}",
+            param_value=Output.all(*(subnet.subnet.subnet_id for subnet in self.subnets.values())).apply(",".join),
+            param_name=f"{CENTRAL_NETWORKING_SSM_PREFIX}/subnet-groups/{config.name}/ids",
+            include_this_account=True,
+        )
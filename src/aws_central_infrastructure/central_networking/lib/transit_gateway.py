@@ -0,0 +1,229 @@
+from ipaddress import IPv4Network
+
+from ephemeral_pulumi_deploy import append_resource_suffix
+from ephemeral_pulumi_deploy import common_tags_native
+from lab_auto_pulumi import CENTRAL_NETWORKING_SSM_PREFIX
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_aws_native import TagArgs
+from pulumi_aws_native import ec2
+from pulumi_aws_native import ram
+from pydantic import BaseModel
+from pydantic import Field
+
+from .network import AllAccountProviders
+from .network import CentralNetworkingVpc
+from .network import SharedSubnet
+from .network import create_ssm_param_in_all_accounts
+
+DEFAULT_TRANSIT_GATEWAY_ASN = 64512
+
+
+class UnknownHubVpcError(Exception):
+    def __init__(self, *, hub_name: str, vpc_name: str):
+        super().__init__(f"The egress hub {hub_name} refers to the VPC {vpc_name}, which is not in all_vpcs")
+
+
+class HubVpcAttachedTwiceError(Exception):
+    def __init__(self, *, hub_name: str, vpc_name: str):
+        super().__init__(f"The VPC {vpc_name} is attached to the egress hub {hub_name} more than once")
+
+
+class HubVpcCidrOverlapError(Exception):
+    def __init__(self, *, hub_name: str, vpc_name: str, cidr_block: str, other_vpc_name: str, other_cidr_block: str):
+        super().__init__(
+            f"The VPCs attached to the egress hub {hub_name} must not overlap, but {vpc_name} ({cidr_block}) overlaps {other_vpc_name} ({other_cidr_block})"
+        )
+
+
+class TransitGatewayVpcAttachmentConfig(BaseModel):
+    vpc_name: str
+    subnet_names: list[str]  # where the attachment's network interfaces go, one subnet per availability zone
+
+
+class EgressHubConfig(BaseModel):
+    """A Transit Gateway that sends the internet bound traffic of many (spoke) VPCs through one egress VPC.
+
+    The egress VPC's attachment subnets should route to its NAT gateways (e.g. `route_to_nat_gateways_of`), and spoke
+    subnets opt in with `route_to_transit_gateway=True` instead of having their own NAT. The egress VPC's NAT subnets
+    get return routes to every spoke's CIDR block, so the NAT capacity can be scaled without touching the spokes.
+    """
+
+    name: str
+    egress: TransitGatewayVpcAttachmentConfig
+    egress_return_route_subnet_names: list[str]  # the egress VPC's public (NAT) subnets
+    spokes: list[TransitGatewayVpcAttachmentConfig] = Field(default_factory=list)
+    amazon_side_asn: int = DEFAULT_TRANSIT_GATEWAY_ASN
+
+
+def plan_egress_hub_return_routes(*, config: EgressHubConfig, vpc_cidr_blocks: dict[str, str]) -> list[str]:
+    """Validate the VPCs attached to the hub and return the spoke CIDR blocks that need routes back through it.
+
+    The Transit Gateway routes by destination, so the attached VPCs must not overlap each other.
+    """
+    attached_networks: dict[str, IPv4Network] = {}
+    for attachment in [config.egress, *config.spokes]:
+        if attachment.vpc_name not in vpc_cidr_blocks:
+            raise UnknownHubVpcError(hub_name=config.name, vpc_name=attachment.vpc_name)
+        if attachment.vpc_name in attached_networks:
+            raise HubVpcAttachedTwiceError(hub_name=config.name, vpc_name=attachment.vpc_name)
+        network = IPv4Network(vpc_cidr_blocks[attachment.vpc_name])
+        for other_vpc_name, other_network in attached_networks.items():
+            if network.overlaps(other_network):
+                raise HubVpcCidrOverlapError(
+                    hub_name=config.name,
+                    vpc_name=attachment.vpc_name,
+                    cidr_block=str(network),
+                    other_vpc_name=other_vpc_name,
+                    other_cidr_block=str(other_network),
+                )
+        attached_networks[attachment.vpc_name] = network
+    return [str(attached_networks[spoke.vpc_name]) for spoke in config.spokes]
+
+
+class EgressHub(ComponentResource):
+    def __init__(
+        self,
+        *,
+        config: EgressHubConfig,
+        org_arn: str,
+        all_providers: AllAccountProviders,
+        all_vpcs: dict[str, CentralNetworkingVpc],
+        all_subnets: dict[str, SharedSubnet],
+    ):
+        super().__init__(
+            "labauto:CentralNetworkingEgressHub",
+            append_resource_suffix(config.name),
+            None,
+        )
+        spoke_cidr_blocks = plan_egress_hub_return_routes(
+            config=config, vpc_cidr_blocks={vpc_name: vpc.cidr_block for vpc_name, vpc in all_vpcs.items()}
+        )
+        self.transit_gateway = ec2.TransitGateway(
+            append_resource_suffix(config.name),
+            amazon_side_asn=config.amazon_side_asn,
+            # every attachment is explicitly associated below, so spokes can't reach each other, only the egress VPC
+            default_route_table_association="disable",
+            default_route_table_propagation="disable",
+            auto_accept_shared_attachments="disable",
+            tags=[TagArgs(key="Name", value=f"central-networking-{config.name}"), *common_tags_native()],
+            opts=ResourceOptions(parent=self),
+        )
+        # shared so that accounts in the organization can see it (and request attachments for their own VPCs)
+        _ = ram.ResourceShare(
+            append_resource_suffix(f"{config.name}-tgw", max_length=150),
+            resource_arns=[self.transit_gateway.transit_gateway_arn],
+            principals=[org_arn],
+            allow_external_principals=False,
+            tags=common_tags_native(),
+            opts=ResourceOptions(parent=self.transit_gateway),
+        )
+        self.spoke_route_table = ec2.TransitGatewayRouteTable(
+            append_resource_suffix(f"{config.name}-spokes", max_length=150),
+            transit_gateway_id=self.transit_gateway.aws_id,
+            tags=[TagArgs(key="Name", value=f"central-networking-{config.name}-spokes"), *common_tags_native()],
+            opts=ResourceOptions(parent=self.transit_gateway),
+        )
+        self.egress_route_table = ec2.TransitGatewayRouteTable(
+            append_resource_suffix(f"{config.name}-egress", max_length=150),
+            transit_gateway_id=self.transit_gateway.aws_id,
+            tags=[TagArgs(key="Name", value=f"central-networking-{config.name}-egress"), *common_tags_native()],
+            opts=ResourceOptions(parent=self.transit_gateway),
+        )
+
+        self.egress_attachment = self._attach_vpc(
+            hub_name=config.name, attachment=config.egress, all_vpcs=all_vpcs, all_subnets=all_subnets
+        )
+        _ = ec2.TransitGatewayRouteTableAssociation(
+            append_resource_suffix(f"{config.name}-egress", max_length=150),
+            transit_gateway_attachment_id=self.egress_attachment.aws_id,
+            transit_gateway_route_table_id=self.egress_route_table.transit_gateway_route_table_id,
+            opts=ResourceOptions(parent=self.egress_attachment),
+        )
+        _ = ec2.TransitGatewayRoute(
+            append_resource_suffix(f"{config.name}-default-to-egress", max_length=150),
+            destination_cidr_block="0.0.0.0/0",
+            transit_gateway_attachment_id=self.egress_attachment.aws_id,
+            transit_gateway_route_table_id=self.spoke_route_table.transit_gateway_route_table_id,
+            opts=ResourceOptions(parent=self.spoke_route_table),
+        )
+
+        self.spoke_attachments: dict[str, ec2.TransitGatewayAttachment] = {}  # keyed by VPC name
+        for spoke in config.spokes:
+            spoke_attachment = self._attach_vpc(
+                hub_name=config.name, attachment=spoke, all_vpcs=all_vpcs, all_subnets=all_subnets
+            )
+            self.spoke_attachments[spoke.vpc_name] = spoke_attachment
+            _ = ec2.TransitGatewayRouteTableAssociation(
+                append_resource_suffix(f"{config.name}-{spoke.vpc_name}", max_length=150),
+                transit_gateway_attachment_id=spoke_attachment.aws_id,
+                transit_gateway_route_table_id=self.spoke_route_table.transit_gateway_route_table_id,
+                opts=ResourceOptions(parent=spoke_attachment),
+            )
+            # the egress VPC learns each spoke's CIDR block, so return traffic finds its way back
+            _ = ec2.TransitGatewayRouteTablePropagation(
+                append_resource_suffix(f"{config.name}-{spoke.vpc_name}", max_length=150),
+                transit_gateway_attachment_id=spoke_attachment.aws_id,
+                transit_gateway_route_table_id=self.egress_route_table.transit_gateway_route_table_id,
+                opts=ResourceOptions(parent=spoke_attachment),
+            )
+            spoke_vpc = all_vpcs[spoke.vpc_name]
+            for subnet in all_subnets.values():
+                if subnet.vpc is not spoke_vpc or not subnet.route_to_transit_gateway:
+                    continue
+                _ = ec2.Route(
+                    append_resource_suffix(f"{subnet.resource_base_name}-to-tgw", max_length=150),
+                    route_table_id=subnet.route_table.id,
+                    destination_cidr_block="0.0.0.0/0",
+                    transit_gateway_id=self.transit_gateway.aws_id,
+                    opts=ResourceOptions(parent=subnet.route_table, depends_on=[spoke_attachment]),
+                )
+
+        for subnet_name in config.egress_return_route_subnet_names:
+            subnet = all_subnets[subnet_name]
+            for spoke, spoke_cidr_block in zip(config.spokes, spoke_cidr_blocks, strict=True):
+                _ = ec2.Route(
+                    append_resource_suffix(f"{subnet.resource_base_name}-to-{spoke.vpc_name}", max_length=150),
+                    route_table_id=subnet.route_table.id,
+                    destination_cidr_block=spoke_cidr_block,
+                    transit_gateway_id=self.transit_gateway.aws_id,
+                    opts=ResourceOptions(parent=subnet.route_table, depends_on=[self.egress_attachment]),
+                )
+
+        ssm_prefix = f"{CENTRAL_NETWORKING_SSM_PREFIX}/egress-hubs/{config.name}"
+        create_ssm_param_in_all_accounts(
+            providers=all_providers.all_native_providers,
+            parent=self.transit_gateway,
+            resource_name_prefix=f"central-networking-tgw-id-{config.name}",
+            param_value=self.transit_gateway.aws_id,
+            param_name=f"{ssm_prefix}/transit-gateway-id",
+            include_this_account=True,
+        )
+        create_ssm_param_in_all_accounts(
+            providers=all_providers.all_native_providers,
+            parent=self.spoke_route_table,
+            resource_name_prefix=f"central-networking-tgw-spoke-rtb-id-{config.name}",
+            param_value=self.spoke_route_table.transit_gateway_route_table_id,
+            param_name=f"{ssm_prefix}/spoke-route-table-id",
+            include_this_account=True,
+        )
+
+    def _attach_vpc(
+        self,
+        *,
+        hub_name: str,
+        attachment: TransitGatewayVpcAttachmentConfig,
+        all_vpcs: dict[str, CentralNetworkingVpc],
+        all_subnets: dict[str, SharedSubnet],
+    ) -> ec2.TransitGatewayAttachment:
+        return ec2.TransitGatewayAttachment(
+            append_resource_suffix(f"{hub_name}-{attachment.vpc_name}", max_length=150),
+            transit_gateway_id=self.transit_gateway.aws_id,
+            vpc_id=all_vpcs[attachment.vpc_name].vpc.id,
+            subnet_ids=[all_subnets[subnet_name].subnet.subnet_id for subnet_name in attachment.subnet_names],
+            tags=[
+                TagArgs(key="Name", value=f"central-networking-{hub_name}-{attachment.vpc_name}"),
+                *common_tags_native(),
+            ],
+            opts=ResourceOptions(parent=self.transit_gateway),
+        )
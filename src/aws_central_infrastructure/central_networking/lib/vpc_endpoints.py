@@ -0,0 +1,167 @@
+from typing import TYPE_CHECKING
+
+import pulumi_aws
+from ephemeral_pulumi_deploy import append_resource_suffix
+from ephemeral_pulumi_deploy import common_tags_native
+from lab_auto_pulumi import CENTRAL_NETWORKING_SSM_PREFIX
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_aws_native import TagArgs
+from pulumi_aws_native import ec2
+from pydantic import BaseModel
+from pydantic import Field
+
+if TYPE_CHECKING:
+    from .network import AllAccountProviders
+    from .network import CentralNetworkingVpc
+    from .network import SharedSubnet
+
+DEFAULT_GATEWAY_ENDPOINT_SERVICES = ("s3", "dynamodb")
+DEFAULT_INTERFACE_ENDPOINT_SERVICES = (
+    "ecr.api",
+    "ecr.dkr",  # image layers themselves are pulled from S3, via the gateway endpoint
+    "ssm",
+    "ssmmessages",  # Session Manager
+    "ec2messages",  # Session Manager
+    "codeartifact.api",
+    "codeartifact.repositories",
+    "sts",
+)
+HTTPS_PORT = 443
+
+
+class InterfaceEndpointSubnetsError(Exception):
+    def __init__(self, *, vpc_name: str, reason: str):
+        super().__init__(f"The interface endpoint subnets for VPC {vpc_name} are invalid: {reason}")
+
+
+class VpcEndpointsConfig(BaseModel):
+    """The AWS service endpoints to provision in a VPC, so traffic to them doesn't go through a NAT gateway.
+
+    Gateway endpoints are free and are added to the route table of every subnet in the VPC. Interface endpoints are
+    billed per AZ per hour, and each gets a network interface in every subnet listed in `interface_subnet_names`.
+    """
+
+    gateway_services: list[str] = Field(default_factory=lambda: list(DEFAULT_GATEWAY_ENDPOINT_SERVICES))
+    interface_services: list[str] = Field(default_factory=lambda: list(DEFAULT_INTERFACE_ENDPOINT_SERVICES))
+    # the subnets to place the interface endpoint network interfaces in, at most one per availability zone
+    interface_subnet_names: list[str] = Field(default_factory=list)
+
+
+def aws_service_endpoint_name(service: str) -> str:
+    return f"com.amazonaws.{pulumi_aws.config.region}.{service}"
+
+
+def validate_interface_endpoint_subnets(
+    *, vpc_name: str, subnet_availability_zone_ids: dict[str, str], has_interface_services: bool
+) -> None:
+    """Ensure the interface endpoints have somewhere to go, and no AZ is listed twice (AWS rejects that)."""
+    if not has_interface_services:
+        return
+    if not subnet_availability_zone_ids:
+        raise InterfaceEndpointSubnetsError(vpc_name=vpc_name, reason="no subnets were listed")
+    subnets_by_availability_zone_id: dict[str, str] = {}
+    for subnet_name, availability_zone_id in subnet_availability_zone_ids.items():
+        if availability_zone_id in subnets_by_availability_zone_id:
+            raise InterfaceEndpointSubnetsError(
+                vpc_name=vpc_name,
+                reason=f"{subnet_name} and {subnets_by_availability_zone_id[availability_zone_id]} are both in {availability_zone_id}",
+            )
+        subnets_by_availability_zone_id[availability_zone_id] = subnet_name
+
+
+class CentralNetworkingVpcEndpoints(ComponentResource):
+    def __init__(
+        self,
+        *,
+        vpc: "CentralNetworkingVpc",
+        config: VpcEndpointsConfig,
+        all_providers: "AllAccountProviders",
+        all_subnets: dict[str, "SharedSubnet"],
+    ):
+        super().__init__(
+            "labauto:CentralNetworkingVpcEndpoints",
+            append_resource_suffix(vpc.name),
+            None,
+            opts=ResourceOptions(parent=vpc),
+        )
+        from .network import create_ssm_param_in_all_accounts  # noqa: PLC0415 # network.py imports this module
+
+        interface_subnets = [all_subnets[subnet_name] for subnet_name in config.interface_subnet_names]
+        validate_interface_endpoint_subnets(
+            vpc_name=vpc.name,
+            subnet_availability_zone_ids={
+                subnet_name: subnet.availability_zone_id
+                for subnet_name, subnet in zip(config.interface_subnet_names, interface_subnets, strict=True)
+            },
+            has_interface_services=bool(config.interface_services),
+        )
+        ssm_prefix = f"{CENTRAL_NETWORKING_SSM_PREFIX}/vpcs/{vpc.name}/endpoints"
+        self.endpoints: dict[str, ec2.VpcEndpoint] = {}  # keyed by service
+        route_table_ids = [subnet.route_table.id for subnet in all_subnets.values() if subnet.vpc is vpc]
+        for service in config.gateway_services:
+            self.endpoints[service] = ec2.VpcEndpoint(
+                append_resource_suffix(f"{vpc.name}-{service}", max_length=150),
+                vpc_id=vpc.vpc.id,
+                service_name=aws_service_endpoint_name(service),
+                vpc_endpoint_type=ec2.VpcEndpointType.GATEWAY,
+                route_table_ids=route_table_ids,
+                tags=[TagArgs(key="Name", value=f"central-networking-{vpc.name}-{service}"), *common_tags_native()],
+                opts=ResourceOptions(parent=self),
+            )
+        if config.interface_services:
+            # shared by every interface endpoint, since they all only need HTTPS from within the VPC
+            self.security_group = ec2.SecurityGroup(
+                append_resource_suffix(f"{vpc.name}-endpoints", max_length=150),
+                group_description=f"HTTPS from within the {vpc.name} VPC to its interface endpoints",
+                vpc_id=vpc.vpc.id,
+                security_group_ingress=[
+                    ec2.SecurityGroupIngressArgs(
+                        ip_protocol="tcp", from_port=HTTPS_PORT, to_port=HTTPS_PORT, cidr_ip=vpc.cidr_block
+                    ),
+                    *(
+                        # so dual-stack subnets can reach the endpoints over IPv6 too
+                        [
+                            ec2.SecurityGroupIngressArgs(
+                                ip_protocol="tcp",
+                                from_port=HTTPS_PORT,
+                                to_port=HTTPS_PORT,
+                                cidr_ipv6=vpc.ipv6_cidr_block,
+                            )
+                        ]
+                        if vpc.ipv6_enabled
+                        else []
+                    ),
+                ],
+                tags=[TagArgs(key="Name", value=f"central-networking-{vpc.name}-endpoints"), *common_tags_native()],
+                opts=ResourceOptions(parent=self),
+            )
+            create_ssm_param_in_all_accounts(
+                providers=all_providers.all_native_providers,
+                parent=self.security_group,
+                resource_name_prefix=f"central-networking-endpoints-sg-id-{vpc.name}",
+                param_value=self.security_group.group_id,
+                param_name=f"{ssm_prefix}/security-group-id",
+                include_this_account=True,
+            )
+        for service in config.interface_services:
+            self.endpoints[service] = ec2.VpcEndpoint(
+                append_resource_suffix(f"{vpc.name}-{service}", max_length=150),
+                vpc_id=vpc.vpc.id,
+                service_name=aws_service_endpoint_name(service),
+                vpc_endpoint_type=ec2.VpcEndpointType.INTERFACE,
+                subnet_ids=[subnet.subnet.subnet_id for subnet in interface_subnets],
+                security_group_ids=[self.security_group.group_id],
+                private_dns_enabled=True,  # so the default SDK endpoints resolve to it everywhere in the VPC
+                tags=[TagArgs(key="Name", value=f"central-networking-{vpc.name}-{service}"), *common_tags_native()],
+                opts=ResourceOptions(parent=self),
+            )
+        for service, endpoint in self.endpoints.items():
+            create_ssm_param_in_all_accounts(
+                providers=all_providers.all_native_providers,
+                parent=endpoint,
+                resource_name_prefix=f"central-networking-endpoint-id-{vpc.name}-{service}",
+                param_value=endpoint.aws_id,
+                param_name=f"{ssm_prefix}/{service}/id",
+                include_this_account=True,
+            )
@@ -2,26 +2,72 @@ from lab_auto_pulumi import AwsLogicalWorkload
 from lab_auto_pulumi import WorkloadName
 
 from .lib import CentralNetworkingVpc
+from .lib import EgressHubConfig
 from .lib import SharedSubnet
 from .lib import SharedSubnetConfig
+from .lib import SharedSubnetGroupConfig
 
 
-def define_subnets(
+def define_subnets(  # noqa: PLR0913 # this is a lot of arguments, but they're all kwargs
     *,
     vpcs: dict[str, CentralNetworkingVpc],
     subnet_configs: list[SharedSubnetConfig],
+    subnet_group_configs: list[SharedSubnetGroupConfig],
+    egress_hub_configs: list[EgressHubConfig],
     all_subnets: dict[str, SharedSubnet],
     workloads_info: dict[WorkloadName, AwsLogicalWorkload],
 ) -> None:
     """Create subnets to share with accounts within the AWS organization.
 
+    CIDR blocks are allocated from the VPC's free space unless specified. After adding a subnet without one, run
+    `uv run python -m aws_central_infrastructure.central_networking.lib.allocate_cidr_blocks --stack <stack>` and commit
+    the updated `cidr_allocations.json`, deployments fail until the allocation is committed.
+
     Example:
     subnet_configs.append(
         SharedSubnetConfig(
             name="my-app",
             vpc=vpcs[GENERIC_VPC_NAME],
-            cidr_block="10.0.1.0/28",
+            size=SubnetSize.ADDRESSES_64,  # or an explicit cidr_block="10.0.2.0/26"
+            accounts_to_share_to=[workloads_info["my-app-workload"].prod_accounts[0].id],
+        )
+    )
+
+    To spread a subnet across availability zones (one subnet, route table and optional NAT gateway per AZ):
+    subnet_group_configs.append(
+        SharedSubnetGroupConfig(
+            name="my-app-private",
+            vpc=vpcs[GENERIC_VPC_NAME],
+            size=SubnetSize.ADDRESSES_64,  # per AZ
+            route_to_nat_gateways_of="my-app-public",  # another group defined earlier with create_nat=True
+            accounts_to_share_to=[workloads_info["my-app-workload"].prod_accounts[0].id],
+        )
+    )
+
+    To route standalone subnets to the NAT gateway in their own AZ, register the NATs in a pool (the subnets routing to
+    it must come after the ones adding to it):
+    nat_pool = NatGatewayPool("my-app")
+    subnet_configs.append(
+        SharedSubnetConfig(
+            name="my-app-public-use1-az1",
+            vpc=vpcs[GENERIC_VPC_NAME],
+            availability_zone_id="use1-az1",
+            route_to_internet_gateway=True,
+            create_nat=True,
+            add_nat_to_pool=nat_pool,
             accounts_to_share_to=[workloads_info["my-app-workload"].prod_accounts[0].id],
         )
     )
+    with `route_to_nat_gateway=nat_pool` on the private subnets.
+
+    To share one NAT egress path between VPCs (whose CIDR blocks must not overlap) through a Transit Gateway:
+    egress_hub_configs.append(
+        EgressHubConfig(
+            name="central-egress",
+            egress=TransitGatewayVpcAttachmentConfig(vpc_name="egress", subnet_names=["egress-tgw-use1-az1"]),
+            egress_return_route_subnet_names=["egress-public-use1-az1"],  # the subnets holding the NAT gateways
+            spokes=[TransitGatewayVpcAttachmentConfig(vpc_name="my-app", subnet_names=["my-app-tgw-use1-az1"])],
+        )
+    )
+    with `route_to_transit_gateway=True` on the spoke subnets that should egress through it.
     """
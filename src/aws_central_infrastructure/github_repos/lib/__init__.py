@@ -1,13 +1,30 @@
 from .collaborators import RepositoryCollaboratorConfig
 from .constants import ROOT_GITHUB_ADMIN_USERNAME
+from .github_api import GithubApiClient
+from .github_api import GithubApiResponse
+from .import_planner import MAX_RESOURCE_NAME_LENGTH
+from .import_planner import ImportResourceNameTooLongError
+from .import_planner import RepoImportPlan
+from .import_planner import RepoImportPlanner
+from .import_planner import render_repo_configs_module
+from .org_roster import GithubOrgRoster
+from .org_roster import GithubTeamRoster
+from .org_roster import fetch_org_roster
+from .org_roster import remove_inherited_members
+from .org_roster import render_team_configs_module
 from .repo import GLOBAL_AUTOLINKS
 from .repo import AutoLinkConfig
 from .repo import GithubRepo
 from .repo import GithubRepoConfig
 from .repo import create_repos
+from .repo import fully_configure_repos
+from .repo import plan_default_branch_rulesets
+from .rulesets import DefaultBranchRulesetSettings
+from .rulesets import partition_default_branch_rulesets
 from .teams import GithubOrgAdminAsTeamMemberError
 from .teams import GithubOrgMembers
 from .teams import GithubTeamConfig
 from .teams import GithubTeamMemberNotInOrgMembersError
 from .teams import RepositoryName
+from .teams import create_root_team_configs
 from .teams import fully_configure_teams
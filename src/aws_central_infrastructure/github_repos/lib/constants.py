@@ -5,3 +5,5 @@ AWS_ORGANIZATION_REPO_NAME = "aws-organization"
 ACTIVELY_IMPORT_AWS_ORG_REPOS = False
 AWS_ORG_REPOS_SUCCESSFULLY_IMPORTED = False
 ALLOW_ADMIN_BYPASS_FOR_AWS_ORG_REPOS = False
+# Repos sharing the most common default branch ruleset settings are protected by a single organization ruleset instead of one ruleset per repo
+USE_ORG_LEVEL_DEFAULT_BRANCH_RULESET = False
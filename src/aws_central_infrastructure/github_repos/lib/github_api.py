@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from .create_provider import TOKENS_ENV_VAR_NAME
+from .create_provider import GithubOrgName
+from .create_provider import IacGithubApiTokens
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_API_VERSION = "2022-11-28"
+MAX_PAGE_SIZE = 100  # the maximum `per_page` that the GitHub REST API allows
+# GitHub discourages large numbers of concurrent requests from a single token (secondary rate limits)
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+HTTP_NO_CONTENT = 204
+HTTP_NOT_FOUND = 404
+_NEXT_LINK_REGEX = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+class GithubApiResponse(BaseModel):
+    status: int
+    body: bytes = b""
+    headers: dict[str, str] = Field(default_factory=dict)
+
+    @property
+    def next_page_url(self) -> str | None:
+        match = _NEXT_LINK_REGEX.search(self.headers.get("link", ""))
+        return None if match is None else match.group(1)
+
+    def json_body(self) -> Any:  # noqa: ANN401 # the GitHub API returns arbitrary JSON
+        return json.loads(self.body) if self.body else None
+
+
+type GithubApiTransport = Callable[[urllib.request.Request], GithubApiResponse]
+
+
+class GithubApiError(Exception):
+    def __init__(self, *, url: str, status: int, body: bytes):
+        super().__init__(f"GitHub API request to {url} failed with status {status}: {body.decode(errors='replace')}")
+        self.status = status
+
+
+def urllib_transport(request: urllib.request.Request) -> GithubApiResponse:
+    try:
+        with urllib.request.urlopen(request) as response:  # noqa: S310 # the URL is always built from GITHUB_API_URL
+            return GithubApiResponse(
+                status=response.status,
+                body=response.read(),
+                headers={key.lower(): value for key, value in response.headers.items()},
+            )
+    except urllib.error.HTTPError as e:
+        return GithubApiResponse(
+            status=e.code, body=e.read(), headers={key.lower(): value for key, value in e.headers.items()}
+        )
+
+
+class GithubApiClient:
+    """Minimal async client for the GitHub REST API.
+
+    Requests are run in worker threads, and a semaphore bounds how many are in flight at once so that fanning out
+    over hundreds of members/repos doesn't trip GitHub's secondary rate limits.
+    """
+
+    def __init__(
+        self,
+        *,
+        token: str,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        base_url: str = GITHUB_API_URL,
+        transport: GithubApiTransport = urllib_transport,
+    ):
+        self._token = token
+        self._base_url = base_url.rstrip("/")
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    def _build_url(self, path: str, params: dict[str, str] | None = None) -> str:
+        url = path if path.startswith("http") else f"{self._base_url}/{path.lstrip('/')}"
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        return url
+
+    async def request(self, url: str) -> GithubApiResponse:
+        headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": GITHUB_API_VERSION}
+        if self._token:
+            headers["Authorization"] = f"Bearer {self._token}"
+        request = urllib.request.Request(url, headers=headers)  # noqa: S310 # the URL is always built from GITHUB_API_URL
+        async with self._semaphore:
+            return await asyncio.to_thread(self._transport, request)
+
+    async def get_json(self, path: str, params: dict[str, str] | None = None) -> Any:  # noqa: ANN401 # the GitHub API returns arbitrary JSON
+        url = self._build_url(path, params)
+        response = await self.request(url)
+        if response.status >= 300:  # noqa: PLR2004 # anything other than a 2xx is an error
+            raise GithubApiError(url=url, status=response.status, body=response.body)
+        return response.json_body()
+
+    async def exists(self, path: str) -> bool:
+        """Check one of the endpoints that signal a boolean setting with 204 vs 404 (e.g. vulnerability alerts)."""
+        url = self._build_url(path)
+        response = await self.request(url)
+        if response.status == HTTP_NO_CONTENT:
+            return True
+        if response.status == HTTP_NOT_FOUND:
+            return False
+        raise GithubApiError(url=url, status=response.status, body=response.body)
+
+    async def iter_pages(self, path: str, params: dict[str, str] | None = None) -> AsyncIterator[list[Any]]:
+        """Yield each page of a list endpoint as soon as it arrives, following the `Link: rel="next"` header."""
+        next_url: str | None = self._build_url(path, {"per_page": str(MAX_PAGE_SIZE), **(params or {})})
+        while next_url is not None:
+            response = await self.request(next_url)
+            if response.status >= 300:  # noqa: PLR2004 # anything other than a 2xx is an error
+                raise GithubApiError(url=next_url, status=response.status, body=response.body)
+            page = response.json_body()
+            assert isinstance(page, list), f"Expected a list from {next_url}, but got {type(page)}"
+            yield page
+            next_url = response.next_page_url
+
+    async def get_all(self, path: str, params: dict[str, str] | None = None) -> list[Any]:
+        items: list[Any] = []
+        async for page in self.iter_pages(path, params):
+            items.extend(page)
+        return items
+
+
+def get_github_api_token_from_env() -> tuple[GithubOrgName, str]:
+    """Read the same token JSON that the Pulumi provider uses (see `create_provider.py`) for local tooling."""
+    raw_json_token_info = os.environ.get(TOKENS_ENV_VAR_NAME, "")
+    if not raw_json_token_info:
+        raise Exception(  # noqa: TRY003,TRY002 # not worth custom exception
+            f"Set the {TOKENS_ENV_VAR_NAME} environment variable to the GitHub API token information before running this."
+        )
+    tokens = IacGithubApiTokens.model_validate_json(raw_json_token_info, strict=True)
+    if len(tokens.org_tokens) != 1:
+        raise NotImplementedError(f"More than one organization is not supported yet. Found: {tokens.org_tokens.keys()}")
+    org_name, token_info = tokens.org_tokens.popitem()
+    return org_name, token_info.deploy_token
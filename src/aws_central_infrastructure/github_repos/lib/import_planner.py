@@ -0,0 +1,342 @@
+"""Plan the adoption of many existing GitHub repositories in a single `pulumi import` run.
+
+The actual settings of every repo are fetched concurrently and turned into `GithubRepoConfig`s whose
+`import_existing_repo_using_config` exactly matches GitHub, along with a Pulumi bulk import file covering each repo's
+default branch `RepositoryRuleset` (unless the org level ruleset will cover the repo instead) and its
+`RepositoryAutolinkReference`s. The `Repository` itself is not in the file, since `GithubRepo` already imports it
+whenever `import_existing_repo_using_config` is set.
+
+Example:
+`uv run python -m aws_central_infrastructure.github_repos.lib.import_planner --stack=prod --repo=my-repo --repo=other-repo`
+then `pulumi import --file=github-import.json` and call `create_imported_repo_configs` from `repos.py`.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any
+from typing import Literal
+
+from ephemeral_pulumi_deploy.utils import RESOURCE_SUFFIX_DELIMITER
+from pydantic import BaseModel
+from pydantic import Field
+
+from .constants import USE_ORG_LEVEL_DEFAULT_BRANCH_RULESET
+from .github_api import DEFAULT_MAX_CONCURRENT_REQUESTS
+from .github_api import GithubApiClient
+from .github_api import get_github_api_token_from_env
+from .repo import GLOBAL_AUTOLINKS
+from .repo import AutoLinkConfig
+from .repo import GithubRepoConfig
+from .repo import autolink_resource_base_name
+from .repo import fully_configure_repos
+from .repo import plan_default_branch_rulesets
+from .rulesets import DEFAULT_BRANCH_RULESET_NAME
+from .rulesets import GITHUB_ACTIONS_INTEGRATION_ID
+from .rulesets import REQUIRED_CHECK_CONTEXT
+from .rulesets import WRITE_REPOSITORY_ROLE_ID
+
+logger = logging.getLogger(__name__)
+
+GITHUB_REPOS_PULUMI_PROJECT_NAME = "github-repos"  # matches `pulumi_deploy.generate_stack_config`
+GITHUB_PROVIDER_RESOURCE_NAME = "default"  # matches `create_provider.create_github_provider`
+RULESET_IMPORT_TYPE = "github:index/repositoryRuleset:RepositoryRuleset"
+_ALL_MERGE_METHODS = ("merge", "rebase", "squash")
+MAX_RESOURCE_NAME_LENGTH = 150  # the max_length `GithubRepo` passes to `append_resource_suffix`
+
+
+class ImportResourceNameTooLongError(Exception):
+    def __init__(self, resource_name: str):
+        super().__init__(
+            f"The resource name {resource_name} is too long (limit is {MAX_RESOURCE_NAME_LENGTH}): {len(resource_name)} characters"
+        )
+
+
+class PulumiImportResource(BaseModel):
+    type: str
+    name: str  # the key used to reference the resource within the import file, so it must be unique in the file
+    logical_name: str | None = Field(default=None, serialization_alias="logicalName")  # the name in the Pulumi state
+    id: str | None = None
+    parent: str | None = None
+    provider: str | None = None
+    component: bool | None = None  # component resources are created by the import (they have no ID in the cloud)
+
+
+class RepoImportPlan(BaseModel):
+    config: GithubRepoConfig
+    import_resources: list[PulumiImportResource] = Field(default_factory=list[PulumiImportResource])
+    warnings: list[str] = Field(default_factory=list)
+
+
+class RepoImportPlanner:
+    def __init__(self, *, client: GithubApiClient, org_name: str, stack_name: str):
+        self._client = client
+        self._org_name = org_name
+        self._stack_name = stack_name
+
+    def _resource_name(self, base_name: str) -> str:
+        # mirrors `append_resource_suffix`, which can only be called from inside a running Pulumi program
+        resource_name = RESOURCE_SUFFIX_DELIMITER.join(
+            (base_name, GITHUB_REPOS_PULUMI_PROJECT_NAME, self._stack_name[:7].lower())
+        )
+        if len(resource_name) > MAX_RESOURCE_NAME_LENGTH:
+            raise ImportResourceNameTooLongError(resource_name)
+        return resource_name
+
+    def _urn(self, resource_type: str, resource_name: str) -> str:
+        return f"urn:pulumi:{self._stack_name}::{GITHUB_REPOS_PULUMI_PROJECT_NAME}::{resource_type}::{resource_name}"
+
+    async def list_org_repo_names(self) -> list[str]:
+        repos = await self._client.get_all(f"/orgs/{self._org_name}/repos", {"type": "all"})
+        return sorted(str(repo["name"]) for repo in repos if not repo.get("archived"))
+
+    async def plan_repo(self, repo_name: str) -> RepoImportPlan:
+        repo_path = f"/repos/{self._org_name}/{repo_name}"
+        repo, vulnerability_alerts, rulesets, autolinks = await asyncio.gather(
+            self._client.get_json(repo_path),
+            self._client.exists(f"{repo_path}/vulnerability-alerts"),
+            self._client.get_all(f"{repo_path}/rulesets", {"includes_parents": "false"}),
+            self._client.get_all(f"{repo_path}/autolinks"),
+        )
+        warnings: list[str] = []
+        existing_settings = GithubRepoConfig(
+            name=repo_name,
+            visibility=repo["visibility"],
+            description=repo.get("description") or "",
+            allow_merge_commit=repo["allow_merge_commit"],
+            allow_rebase_merge=repo["allow_rebase_merge"],
+            delete_branch_on_merge=repo["delete_branch_on_merge"],
+            has_issues=repo["has_issues"],
+            has_projects=repo["has_projects"],
+            has_wiki=repo["has_wiki"],
+            has_downloads=repo.get("has_downloads", False),
+            allow_auto_merge=repo["allow_auto_merge"],
+            squash_merge_commit_title=repo["squash_merge_commit_title"],
+            squash_merge_commit_message=repo["squash_merge_commit_message"],
+            allow_update_branch=repo["allow_update_branch"],
+            vulnerability_alerts=vulnerability_alerts,
+            topics=list(repo.get("topics", [])),
+        )
+        config = existing_settings.model_copy(update={"import_existing_repo_using_config": existing_settings})
+        parent_name = f"{repo_name}-component"
+        # the Repository is imported by `GithubRepo` itself through `import_existing_repo_using_config`
+        import_resources: list[PulumiImportResource] = []
+
+        ruleset_summary = next(
+            (ruleset for ruleset in rulesets if ruleset["name"] == DEFAULT_BRANCH_RULESET_NAME), None
+        )
+        if ruleset_summary is None:
+            warnings.append(f"No '{DEFAULT_BRANCH_RULESET_NAME}' ruleset exists yet, it will be created")
+        else:
+            ruleset = await self._client.get_json(f"{repo_path}/rulesets/{ruleset_summary['id']}")
+            config = config.model_copy(update=_ruleset_settings(ruleset, warnings))
+            import_resources.append(
+                PulumiImportResource(
+                    type=RULESET_IMPORT_TYPE,
+                    name=f"{repo_name}-ruleset",
+                    logical_name=self._resource_name(repo_name),
+                    id=f"{repo_name}:{ruleset['id']}",
+                    parent=parent_name,
+                    provider=GITHUB_PROVIDER_RESOURCE_NAME,
+                )
+            )
+        warnings.extend(
+            f"Ruleset '{ruleset['name']}' is not managed by this repository and will be left as-is"
+            for ruleset in rulesets
+            if ruleset["name"] != DEFAULT_BRANCH_RULESET_NAME
+        )
+
+        autolink_references: list[AutoLinkConfig] = []
+        for autolink in autolinks:
+            autolink_config = AutoLinkConfig(ticket_prefix=autolink["key_prefix"], url=autolink["url_template"])
+            autolink_base_name = autolink_resource_base_name(
+                repo_name=repo_name, ticket_prefix=autolink_config.ticket_prefix
+            )
+            if autolink_config not in GLOBAL_AUTOLINKS:
+                autolink_references.append(autolink_config)
+            import_resources.append(
+                PulumiImportResource(
+                    type="github:index/repositoryAutolinkReference:RepositoryAutolinkReference",
+                    name=autolink_base_name,
+                    logical_name=self._resource_name(autolink_base_name),
+                    id=f"{repo_name}/{autolink['id']}",
+                    parent=parent_name,
+                    provider=GITHUB_PROVIDER_RESOURCE_NAME,
+                )
+            )
+        config.autolink_references = autolink_references
+        return RepoImportPlan(config=config, import_resources=import_resources, warnings=warnings)
+
+    async def plan_repos(
+        self,
+        repo_names: list[str],
+        *,
+        managed_configs: list[GithubRepoConfig] | None = None,  # the repos already in repos.py
+        use_org_level_ruleset: bool = USE_ORG_LEVEL_DEFAULT_BRANCH_RULESET,
+    ) -> list[RepoImportPlan]:
+        plans: list[RepoImportPlan] = list(
+            await asyncio.gather(*(self.plan_repo(repo_name) for repo_name in repo_names))
+        )
+        # `create_repos` won't declare a repo level ruleset for the repos the org level one covers, so don't import it
+        imported_names = {plan.config.name for plan in plans}
+        partition = plan_default_branch_rulesets(
+            [
+                *(config for config in managed_configs or [] if config.name not in imported_names),
+                *(plan.config for plan in plans),
+            ],
+            use_org_level_ruleset=use_org_level_ruleset,
+        )
+        for plan in plans:
+            if plan.config.name not in partition.shared_repo_names:
+                continue
+            if any(resource.type == RULESET_IMPORT_TYPE for resource in plan.import_resources):
+                plan.warnings.append(
+                    f"The '{DEFAULT_BRANCH_RULESET_NAME}' ruleset will be left as-is, since the org level ruleset covers this repo"
+                )
+            plan.import_resources = [
+                resource for resource in plan.import_resources if resource.type != RULESET_IMPORT_TYPE
+            ]
+        return plans
+
+    def create_import_file(self, plans: list[RepoImportPlan]) -> dict[str, Any]:
+        """Create the JSON document for `pulumi import --file`."""
+        name_table = {
+            GITHUB_PROVIDER_RESOURCE_NAME: self._urn("pulumi:providers:github", GITHUB_PROVIDER_RESOURCE_NAME)
+        }
+        resources: list[dict[str, Any]] = []
+        for plan in plans:
+            component = PulumiImportResource(
+                type="labauto:GithubRepo",
+                name=f"{plan.config.name}-component",
+                logical_name=self._resource_name(plan.config.name),
+                component=True,
+            )
+            resources.append(component.model_dump(exclude_none=True, by_alias=True))
+            resources.extend(
+                resource.model_dump(exclude_none=True, by_alias=True) for resource in plan.import_resources
+            )
+        return {"nameTable": name_table, "resources": resources}
+
+
+def _ruleset_settings(ruleset: dict[str, Any], warnings: list[str]) -> dict[str, Any]:
+    """Translate the existing default branch ruleset into the `GithubRepoConfig` fields that control it."""
+    actor_types = {(actor["actor_type"], actor.get("actor_id")) for actor in ruleset.get("bypass_actors", [])}
+    settings: dict[str, Any] = {
+        "org_admin_rule_bypass": any(actor_type == "OrganizationAdmin" for actor_type, _ in actor_types),
+        "repo_write_role_rule_bypass": ("RepositoryRole", WRITE_REPOSITORY_ROLE_ID) in actor_types,
+    }
+    rules = {rule["type"]: rule.get("parameters", {}) for rule in ruleset.get("rules", [])}
+    status_checks = rules.get("required_status_checks")
+    if status_checks is None:
+        warnings.append("The ruleset does not require status checks yet, they will be added")
+    else:
+        settings["require_branch_to_be_up_to_date_before_merge"] = status_checks.get(
+            "strict_required_status_checks_policy", True
+        )
+        checks = {
+            (check["context"], check.get("integration_id")) for check in status_checks.get("required_status_checks", [])
+        }
+        if checks != {(REQUIRED_CHECK_CONTEXT, GITHUB_ACTIONS_INTEGRATION_ID)}:
+            warnings.append(
+                f"The ruleset's required checks {sorted(checks)} will be replaced by '{REQUIRED_CHECK_CONTEXT}'"
+            )
+    pull_request = rules.get("pull_request")
+    if pull_request is None:
+        warnings.append("The ruleset does not have pull request rules yet, they will be added")
+    else:
+        settings["require_code_owner_review"] = pull_request.get("require_code_owner_review", True)
+        merge_methods: list[Literal["merge", "squash", "rebase"]] = sorted(
+            pull_request.get("allowed_merge_methods", [])
+        )
+        settings["allowed_merge_methods"] = (
+            None if not merge_methods or tuple(merge_methods) == _ALL_MERGE_METHODS else merge_methods
+        )
+    return settings
+
+
+def _render_value(value: Any, indent: str) -> str:  # noqa: ANN401 # renders any value a `GithubRepoConfig` field can hold
+    if isinstance(value, BaseModel):
+        return _render_model(value, indent)
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        items = [f"{indent}    {_render_value(item, indent + '    ')}," for item in value]  # pyright: ignore[reportUnknownVariableType] # generic renderer
+        return "[\n" + "\n".join(items) + f"\n{indent}]"
+    if isinstance(value, bool) or value is None:
+        return repr(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _render_model(model: BaseModel, indent: str) -> str:
+    fields = model.model_dump(exclude_defaults=True)
+    lines = [f"{type(model).__name__}("]
+    lines.extend(
+        f"{indent}    {field_name}={_render_value(getattr(model, field_name), indent + '    ')},"
+        for field_name in fields
+    )
+    lines.append(f"{indent})")
+    return "\n".join(lines)
+
+
+def render_repo_configs_module(plans: list[RepoImportPlan]) -> str:
+    lines = [
+        '"""Generated by `aws_central_infrastructure.github_repos.lib.import_planner`.',
+        "",
+        "Call `create_imported_repo_configs(configs)` from `create_repo_configs` in `repos.py`.",
+        '"""',
+        "",
+        "from .lib import AutoLinkConfig",
+        "from .lib import GithubRepoConfig",
+        "",
+        "",
+        "def create_imported_repo_configs(configs: list[GithubRepoConfig]) -> None:",
+    ]
+    for plan in plans:
+        lines.extend(f"    # NOTE: {warning}" for warning in plan.warnings)
+        lines.append(f"    configs.append({_render_model(plan.config, '    ')})")
+    if not plans:
+        lines.append("    _ = configs")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument("--stack", required=True, help="The github-repos stack the resources will be imported into")
+    _ = parser.add_argument("--repo", action="append", default=[], help="Can be repeated. Defaults to all repos")
+    _ = parser.add_argument(
+        "--org", help="Defaults to the organization in the IAC_GITHUB_API_TOKENS environment variable"
+    )
+    _ = parser.add_argument("--output-module", type=Path, default=Path("imported_repos.py"))
+    _ = parser.add_argument("--output-import-file", type=Path, default=Path("github-import.json"))
+    _ = parser.add_argument("--max-concurrent-requests", type=int, default=DEFAULT_MAX_CONCURRENT_REQUESTS)
+    args = parser.parse_args()
+    token_org_name, token = get_github_api_token_from_env()
+    planner = RepoImportPlanner(
+        client=GithubApiClient(token=token, max_concurrent_requests=args.max_concurrent_requests),
+        org_name=args.org or token_org_name,
+        stack_name=args.stack,
+    )
+
+    from aws_central_infrastructure.github_repos.repos import create_repo_configs  # noqa: PLC0415 # repos.py imports this package, so it can't be imported at the top
+
+    managed_configs: list[GithubRepoConfig] = []
+    create_repo_configs(managed_configs)
+    fully_configure_repos(managed_configs)
+
+    async def plan() -> list[RepoImportPlan]:
+        repo_names: list[str] = args.repo or await planner.list_org_repo_names()
+        return await planner.plan_repos(repo_names, managed_configs=managed_configs)
+
+    plans = asyncio.run(plan())
+    for repo_plan in plans:
+        for warning in repo_plan.warnings:
+            logger.warning(f"{repo_plan.config.name}: {warning}")
+    _ = args.output_module.write_text(render_repo_configs_module(plans))
+    _ = args.output_import_file.write_text(json.dumps(planner.create_import_file(plans), indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Import an existing GitHub Organization's members and teams into the config format used by `teams.py`.
+
+Example (writes a module that can replace `github_repos/teams.py` plus a cached JSON copy of the roster):
+`uv run python -m aws_central_infrastructure.github_repos.lib.org_roster --output-module=imported_teams.py`
+"""
+
+import argparse
+import asyncio
+import json
+import keyword
+import logging
+import re
+from pathlib import Path
+from typing import Any
+from typing import Literal
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from .github_api import DEFAULT_MAX_CONCURRENT_REQUESTS
+from .github_api import GithubApiClient
+from .github_api import get_github_api_token_from_env
+from .teams import GithubOrgMembers
+from .teams import GithubRepositoryPermission
+
+logger = logging.getLogger(__name__)
+
+ROOT_TEAM_NAME = "Everyone"  # created directly in `program.py`, so never included in the generated team configs
+DEV_SEC_OPS_TEAM_NAME = "DevSecOps"  # created in `program.py` and passed in to `define_team_configs` for adjustments
+DEFAULT_ROSTER_CACHE_PATH = Path(".github-org-roster.json")
+# highest first, so a team's permission on a repo is the first one GitHub reports as granted
+_REPOSITORY_PERMISSIONS: tuple[GithubRepositoryPermission, ...] = ("admin", "maintain", "push", "triage", "pull")
+
+
+class GithubTeamRoster(BaseModel):
+    name: str
+    slug: str
+    description: str = ""
+    privacy: Literal["secret", "closed"] = "closed"
+    parent_slug: str | None = None
+    maintainers: list[str] = Field(default_factory=list)
+    members: list[str] = Field(default_factory=list)
+    repo_permissions: dict[str, GithubRepositoryPermission] = Field(default_factory=dict)
+
+
+class GithubOrgRoster(BaseModel):
+    org_name: str
+    org_admins: list[str] = Field(default_factory=list)
+    everyone: list[str] = Field(default_factory=list)  # non-admin members, matching `GithubOrgMembers.everyone`
+    teams: list[GithubTeamRoster] = Field(default_factory=list)
+
+    def to_org_members(self) -> GithubOrgMembers:
+        return GithubOrgMembers(org_admins=list(self.org_admins), everyone=list(self.everyone))
+
+
+async def _fetch_logins(client: GithubApiClient, path: str, params: dict[str, str] | None = None) -> list[str]:
+    # only the logins are kept from each page, rather than every user object of a large org
+    logins: list[str] = []
+    async for page in client.iter_pages(path, params):
+        logins.extend(str(item["login"]) for item in page)
+    return sorted(logins)
+
+
+def _repository_permission(permissions: dict[str, bool]) -> GithubRepositoryPermission:
+    return next((permission for permission in _REPOSITORY_PERMISSIONS if permissions.get(permission)), "pull")
+
+
+async def _fetch_team_repo_permissions(
+    client: GithubApiClient, *, org_name: str, slug: str
+) -> dict[str, GithubRepositoryPermission]:
+    repo_permissions: dict[str, GithubRepositoryPermission] = {}
+    async for page in client.iter_pages(f"/orgs/{org_name}/teams/{slug}/repos"):
+        for repo in page:
+            repo_permissions[str(repo["name"])] = _repository_permission(repo.get("permissions") or {})
+    return dict(sorted(repo_permissions.items()))
+
+
+async def _fetch_team(*, client: GithubApiClient, org_name: str, team: dict[str, Any]) -> GithubTeamRoster:
+    slug = str(team["slug"])
+    maintainers, members, repo_permissions = await asyncio.gather(
+        _fetch_logins(client, f"/orgs/{org_name}/teams/{slug}/members", {"role": "maintainer"}),
+        _fetch_logins(client, f"/orgs/{org_name}/teams/{slug}/members", {"role": "member"}),
+        _fetch_team_repo_permissions(client, org_name=org_name, slug=slug),
+    )
+    parent = team.get("parent")
+    return GithubTeamRoster(
+        name=str(team["name"]),
+        slug=slug,
+        description=str(team.get("description") or ""),
+        privacy="secret" if team.get("privacy") == "secret" else "closed",
+        parent_slug=None if not parent else str(parent["slug"]),
+        maintainers=maintainers,
+        members=members,
+        repo_permissions=repo_permissions,
+    )
+
+
+def remove_inherited_members(teams: list[GithubTeamRoster]) -> list[GithubTeamRoster]:
+    """Keep only each team's direct members, since the GitHub API also lists everyone in its child teams.
+
+    A child team's listing already includes its own descendants, so removing the immediate children's members is
+    enough. Someone added both directly to a team and to one of its children only keeps the child membership, which
+    still gives them the parent team's access.
+    """
+    children_by_parent: dict[str, list[GithubTeamRoster]] = {}
+    for team in teams:
+        if team.parent_slug is not None:
+            children_by_parent.setdefault(team.parent_slug, []).append(team)
+    direct_teams: list[GithubTeamRoster] = []
+    for team in teams:
+        children = children_by_parent.get(team.slug, [])
+        child_maintainers = {login for child in children for login in child.maintainers}
+        child_logins = child_maintainers | {login for child in children for login in child.members}
+        direct_teams.append(
+            team.model_copy(
+                update={
+                    "maintainers": [login for login in team.maintainers if login not in child_maintainers],
+                    "members": [login for login in team.members if login not in child_logins],
+                }
+            )
+        )
+    return direct_teams
+
+
+async def fetch_org_roster(*, client: GithubApiClient, org_name: str) -> GithubOrgRoster:
+    """Page through the org's members, admins and teams, then fetch every team's membership concurrently."""
+    org_admins, everyone, teams = await asyncio.gather(
+        _fetch_logins(client, f"/orgs/{org_name}/members", {"role": "admin"}),
+        _fetch_logins(client, f"/orgs/{org_name}/members", {"role": "member"}),
+        client.get_all(f"/orgs/{org_name}/teams"),  # the team objects themselves are needed to fetch each team
+    )
+    team_rosters = await asyncio.gather(*(_fetch_team(client=client, org_name=org_name, team=team) for team in teams))
+    logger.info(f"Fetched {len(org_admins) + len(everyone)} members and {len(team_rosters)} teams from {org_name}")
+    return GithubOrgRoster(
+        org_name=org_name,
+        org_admins=org_admins,
+        everyone=everyone,
+        teams=sorted(remove_inherited_members(list(team_rosters)), key=lambda team: team.slug),
+    )
+
+
+def write_roster_cache(*, roster: GithubOrgRoster, path: Path) -> None:
+    _ = path.write_text(roster.model_dump_json(indent=2) + "\n")
+
+
+def load_roster_cache(path: Path) -> GithubOrgRoster:
+    return GithubOrgRoster.model_validate_json(path.read_text())
+
+
+def _literal(value: str | list[str] | dict[str, GithubRepositoryPermission]) -> str:
+    # JSON strings (and lists and string-keyed dicts of them) are valid, double-quoted, Python literals
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _python_identifier(slug: str, used: set[str]) -> str:
+    base = re.sub(r"\W", "_", slug).strip("_").lower() or "team"
+    if base[0].isdigit() or keyword.iskeyword(base):
+        base = f"team_{base}"
+    identifier = base
+    suffix = 2
+    while identifier in used:
+        identifier = f"{base}_{suffix}"
+        suffix += 1
+    used.add(identifier)
+    return identifier
+
+
+def _sorted_parents_first(teams: list[GithubTeamRoster]) -> list[GithubTeamRoster]:
+    by_slug = {team.slug: team for team in teams}
+    ordered: list[GithubTeamRoster] = []
+    visited: set[str] = set()
+
+    def visit(team: GithubTeamRoster) -> None:
+        if team.slug in visited:
+            return
+        visited.add(team.slug)
+        if team.parent_slug is not None and team.parent_slug in by_slug:
+            visit(by_slug[team.parent_slug])
+        ordered.append(team)
+
+    for team in teams:
+        visit(team)
+    return ordered
+
+
+def render_team_configs_module(roster: GithubOrgRoster) -> str:
+    """Render a drop-in replacement for `github_repos/teams.py` that reproduces the roster."""
+    lines = [
+        f'"""Generated from the {roster.org_name} GitHub Organization by `aws_central_infrastructure.github_repos.lib.org_roster`.',
+        "",
+        "Review it, then maintain it by hand like any other config file.",
+        '"""',
+        "",
+        "from .lib import GithubOrgMembers",
+        "from .lib import GithubTeamConfig",
+        "",
+        "",
+        "def define_team_configs(",
+        "    *, configs: list[GithubTeamConfig], dev_sec_ops_team_config: GithubTeamConfig",
+        ") -> GithubOrgMembers:",
+        f"    org_members = GithubOrgMembers(org_admins={_literal(roster.org_admins)}, everyone={_literal(roster.everyone)})",
+    ]
+    variable_names: dict[str, str] = {}
+    used_identifiers = {"configs", "dev_sec_ops_team_config", "org_members"}
+    for team in _sorted_parents_first(roster.teams):
+        if team.name == ROOT_TEAM_NAME:
+            continue
+        if team.name == DEV_SEC_OPS_TEAM_NAME:
+            variable_names[team.slug] = "dev_sec_ops_team_config"
+            lines.append(f"    dev_sec_ops_team_config.maintainers.extend({_literal(team.maintainers)})")
+            lines.append(f"    dev_sec_ops_team_config.members.extend({_literal(team.members)})")
+            if team.repo_permissions:
+                lines.append(f"    dev_sec_ops_team_config.repo_permissions.update({_literal(team.repo_permissions)})")
+            continue
+        variable_name = _python_identifier(team.slug, used_identifiers)
+        variable_names[team.slug] = variable_name
+        lines.extend(
+            [
+                f"    {variable_name} = GithubTeamConfig(",
+                f"        name={_literal(team.name)},",
+                f"        description={_literal(team.description)},",
+                f"        privacy={_literal(team.privacy)},",
+                f"        maintainers={_literal(team.maintainers)},",
+                f"        members={_literal(team.members)},",
+            ]
+        )
+        if team.repo_permissions:
+            lines.append(f"        repo_permissions={_literal(team.repo_permissions)},")
+        # teams directly under the root team are left without an explicit parent, `create_teams` assigns the root team to them
+        if team.parent_slug is not None and team.parent_slug in variable_names:
+            lines.append(f"        parent_team={variable_names[team.parent_slug]},")
+        lines.extend(["    )", f"    configs.append({variable_name})"])
+    lines.extend(["    return org_members", ""])
+    return "\n".join(lines)
+
+
+async def import_org_roster(
+    *, org_name: str, token: str, roster_cache_path: Path, max_concurrent_requests: int
+) -> GithubOrgRoster:
+    client = GithubApiClient(token=token, max_concurrent_requests=max_concurrent_requests)
+    roster = await fetch_org_roster(client=client, org_name=org_name)
+    write_roster_cache(roster=roster, path=roster_cache_path)
+    return roster
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument(
+        "--org", help="Defaults to the organization in the IAC_GITHUB_API_TOKENS environment variable"
+    )
+    _ = parser.add_argument("--output-module", type=Path, required=True)
+    _ = parser.add_argument("--roster-cache", type=Path, default=DEFAULT_ROSTER_CACHE_PATH)
+    _ = parser.add_argument("--max-concurrent-requests", type=int, default=DEFAULT_MAX_CONCURRENT_REQUESTS)
+    _ = parser.add_argument("--use-cache", action="store_true", help="Skip the GitHub API if the roster cache exists")
+    args = parser.parse_args()
+    if args.use_cache and args.roster_cache.exists():
+        logger.info(f"Using cached roster at {args.roster_cache}")
+        roster = load_roster_cache(args.roster_cache)
+    else:
+        token_org_name, token = get_github_api_token_from_env()
+        roster = asyncio.run(
+            import_org_roster(
+                org_name=args.org or token_org_name,
+                token=token,
+                roster_cache_path=args.roster_cache,
+                max_concurrent_requests=args.max_concurrent_requests,
+            )
+        )
+    _ = args.output_module.write_text(render_team_configs_module(roster))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 from collections.abc import Sequence
-from typing import TYPE_CHECKING
 from typing import Literal
 from typing import Self
 from typing import override
@@ -25,16 +24,25 @@ from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import Field
 
-from aws_central_infrastructure.artifact_stores.internal_packages import create_internal_packages_configs
+from aws_central_infrastructure.artifact_stores.lib import CODE_ARTIFACT_PUBLISHING_ENVIRONMENT
+from aws_central_infrastructure.artifact_stores.lib import USE_SINGLE_CODE_ARTIFACT_PUBLISHING_ROLE
+from aws_central_infrastructure.artifact_stores.lib import get_package_claims_index
+from aws_central_infrastructure.iac_management.lib import CENTRAL_INFRA_GITHUB_ORG_NAME
 from aws_central_infrastructure.iac_management.lib import CENTRAL_INFRA_REPO_NAME
 
 from .constants import ACTIVELY_IMPORT_AWS_ORG_REPOS
 from .constants import ALLOW_ADMIN_BYPASS_FOR_AWS_ORG_REPOS
 from .constants import AWS_ORG_REPOS_SUCCESSFULLY_IMPORTED
 from .constants import AWS_ORGANIZATION_REPO_NAME
-
-if TYPE_CHECKING:
-    from aws_central_infrastructure.artifact_stores.lib import RepoPackageClaims
+from .constants import USE_ORG_LEVEL_DEFAULT_BRANCH_RULESET
+from .rulesets import DEFAULT_BRANCH_RULESET_NAME
+from .rulesets import GITHUB_ACTIONS_INTEGRATION_ID
+from .rulesets import REQUIRED_CHECK_CONTEXT
+from .rulesets import WRITE_REPOSITORY_ROLE_ID
+from .rulesets import DefaultBranchRulesetPartition
+from .rulesets import DefaultBranchRulesetSettings
+from .rulesets import OrgDefaultBranchRuleset
+from .rulesets import partition_default_branch_rulesets
 
 
 class AutoLinkConfig(BaseModel):
@@ -51,9 +59,15 @@ class AutoLinkConfig(BaseModel):
 GLOBAL_AUTOLINKS: set[AutoLinkConfig] = set()
 
 
+def autolink_resource_base_name(*, repo_name: str, ticket_prefix: str) -> str:
+    return f"{repo_name}-{ticket_prefix}-autolink"
+
+
 class GithubRepoConfig(BaseModel):
     name: str
-    visibility: Literal["private", "public"] = "private"
+    visibility: Literal["private", "public", "internal"] = (
+        "private"  # internal is only available in GitHub Enterprise orgs
+    )
     description: str
     allow_merge_commit: bool = False
     allow_rebase_merge: bool = False
@@ -85,9 +99,24 @@ class GithubRepoConfig(BaseModel):
         description="When left as None, this just uses the boolean flags for allow_merge_commit etc. But it can be set to an explicit list, usually in an attempt to prevent all types of merge commits and only allow fast-forward merges ('merge' cannot be allowed as a value here in that case, typically 'rebase' is used for this field)",
     )
 
+    def default_branch_ruleset_settings(self) -> DefaultBranchRulesetSettings:
+        return DefaultBranchRulesetSettings(
+            org_admin_rule_bypass=self.org_admin_rule_bypass,
+            repo_write_role_rule_bypass=self.repo_write_role_rule_bypass,
+            require_branch_to_be_up_to_date_before_merge=self.require_branch_to_be_up_to_date_before_merge,
+            require_code_owner_review=self.require_code_owner_review,
+            allowed_merge_methods=None if self.allowed_merge_methods is None else tuple(self.allowed_merge_methods),
+        )
+
 
 class GithubRepo(ComponentResource):
-    def __init__(self, *, config: GithubRepoConfig, provider: Provider | None = None):
+    def __init__(
+        self,
+        *,
+        config: GithubRepoConfig,
+        provider: Provider | None = None,
+        create_default_branch_ruleset: bool = True,  # set to False when an org level ruleset already covers this repo
+    ):
         super().__init__("labauto:GithubRepo", append_resource_suffix(config.name, max_length=150), None)
         if config.create_repo:
             repo_topics = ["managed-by-aws-central-infrastructure-iac-repo"]
@@ -170,64 +199,87 @@ class GithubRepo(ComponentResource):
                 environment="testpypi",
                 opts=ResourceOptions(parent=self, provider=provider),
             )
-
-        bypass_actors: Sequence[RepositoryRulesetBypassActorArgs] = []
-        if config.org_admin_rule_bypass:
-            bypass_actors.append(
-                RepositoryRulesetBypassActorArgs(
-                    actor_type="OrganizationAdmin",
-                    bypass_mode="pull_request",
-                    actor_id=0,  # Pulumi requires some value for actor_id, but it doesn't seem to be used when actor_type is set to Org Admin
-                )
+        if config.create_pypi_publishing_environments and USE_SINGLE_CODE_ARTIFACT_PUBLISHING_ROLE:
+            # the publishing role can publish to primary, so only main can use the environment that assumes it
+            code_artifact_publishing_env = RepositoryEnvironment(
+                append_resource_suffix(f"{config.name}-codeartifact-publishing", max_length=150),
+                repository=config.name,
+                environment=CODE_ARTIFACT_PUBLISHING_ENVIRONMENT,
+                deployment_branch_policy=RepositoryEnvironmentDeploymentBranchPolicyArgs(
+                    custom_branch_policies=True,
+                    protected_branches=False,  # github does not allow setting protected branches to True when custom_branch_policies is True
+                ),
+                opts=ResourceOptions(parent=self, provider=provider),
             )
-        if config.repo_write_role_rule_bypass:
-            bypass_actors.append(
-                RepositoryRulesetBypassActorArgs(
-                    actor_type="RepositoryRole",
-                    bypass_mode="pull_request",
-                    actor_id=4,  # the ID for the Write Repository Role
-                )
+            _ = RepositoryEnvironmentDeploymentPolicy(
+                append_resource_suffix(f"{config.name}-codeartifact-publishing", max_length=150),
+                repository=config.name,
+                environment=code_artifact_publishing_env.environment,
+                branch_pattern="main",
+                opts=ResourceOptions(parent=code_artifact_publishing_env, provider=provider),
             )
+
         conditional_repo_depends = [] if not config.create_repo else [repo]  # type: ignore[reportPossiblyUnboundVariable] # this is a false positive, due to the conditionals in this ternary and the logic above
-        _ = RepositoryRuleset(
-            append_resource_suffix(config.name, max_length=150),
-            bypass_actors=bypass_actors
-            or None,  # supplying an empty list seems to cause problems, so explicitly pass None if no bypass
-            name="Protect Default Branch",
-            repository=config.name,
-            target="branch",
-            enforcement="active",
-            conditions=RepositoryRulesetConditionsArgs(
-                ref_name=RepositoryRulesetConditionsRefNameArgs(includes=["~DEFAULT_BRANCH"], excludes=[])
-            ),
-            rules=RepositoryRulesetRulesArgs(
-                deletion=True,
-                non_fast_forward=True,
-                required_status_checks=RepositoryRulesetRulesRequiredStatusChecksArgs(
-                    required_checks=[
-                        RepositoryRulesetRulesRequiredStatusChecksRequiredCheckArgs(
-                            context="required-check",
-                            integration_id=15368,  # the ID for Github Actions
-                        )
-                    ],
-                    strict_required_status_checks_policy=config.require_branch_to_be_up_to_date_before_merge,
+        if create_default_branch_ruleset:
+            bypass_actors: Sequence[RepositoryRulesetBypassActorArgs] = []
+            if config.org_admin_rule_bypass:
+                bypass_actors.append(
+                    RepositoryRulesetBypassActorArgs(
+                        actor_type="OrganizationAdmin",
+                        bypass_mode="pull_request",
+                        actor_id=0,  # Pulumi requires some value for actor_id, but it doesn't seem to be used when actor_type is set to Org Admin
+                    )
+                )
+            if config.repo_write_role_rule_bypass:
+                bypass_actors.append(
+                    RepositoryRulesetBypassActorArgs(
+                        actor_type="RepositoryRole",
+                        bypass_mode="pull_request",
+                        actor_id=WRITE_REPOSITORY_ROLE_ID,
+                    )
+                )
+            _ = RepositoryRuleset(
+                append_resource_suffix(config.name, max_length=150),
+                bypass_actors=bypass_actors
+                or None,  # supplying an empty list seems to cause problems, so explicitly pass None if no bypass
+                name=DEFAULT_BRANCH_RULESET_NAME,
+                repository=config.name,
+                target="branch",
+                enforcement="active",
+                conditions=RepositoryRulesetConditionsArgs(
+                    ref_name=RepositoryRulesetConditionsRefNameArgs(includes=["~DEFAULT_BRANCH"], excludes=[])
                 ),
-                pull_request=RepositoryRulesetRulesPullRequestArgs(
-                    allowed_merge_methods=config.allowed_merge_methods,
-                    dismiss_stale_reviews_on_push=True,
-                    require_last_push_approval=True,
-                    required_approving_review_count=1,
-                    require_code_owner_review=config.require_code_owner_review,
+                rules=RepositoryRulesetRulesArgs(
+                    deletion=True,
+                    non_fast_forward=True,
+                    required_status_checks=RepositoryRulesetRulesRequiredStatusChecksArgs(
+                        required_checks=[
+                            RepositoryRulesetRulesRequiredStatusChecksRequiredCheckArgs(
+                                context=REQUIRED_CHECK_CONTEXT,
+                                integration_id=GITHUB_ACTIONS_INTEGRATION_ID,
+                            )
+                        ],
+                        strict_required_status_checks_policy=config.require_branch_to_be_up_to_date_before_merge,
+                    ),
+                    pull_request=RepositoryRulesetRulesPullRequestArgs(
+                        allowed_merge_methods=config.allowed_merge_methods,
+                        dismiss_stale_reviews_on_push=True,
+                        require_last_push_approval=True,
+                        required_approving_review_count=1,
+                        require_code_owner_review=config.require_code_owner_review,
+                    ),
                 ),
-            ),
-            opts=ResourceOptions(provider=provider, parent=self, depends_on=conditional_repo_depends),
-        )
+                opts=ResourceOptions(provider=provider, parent=self, depends_on=conditional_repo_depends),
+            )
 
         autolinks = GLOBAL_AUTOLINKS | set(config.autolink_references)
 
         for autolink in autolinks:
             _ = RepositoryAutolinkReference(
-                append_resource_suffix(f"{config.name}-{autolink.ticket_prefix}-autolink", max_length=150),
+                append_resource_suffix(
+                    autolink_resource_base_name(repo_name=config.name, ticket_prefix=autolink.ticket_prefix),
+                    max_length=150,
+                ),
                 repository=config.name,
                 key_prefix=autolink.ticket_prefix,
                 target_url_template=autolink.url,
@@ -235,9 +287,8 @@ class GithubRepo(ComponentResource):
             )
 
 
-def create_repos(*, configs: list[GithubRepoConfig] | None = None, provider: Provider) -> None:
-    if configs is None:
-        configs = []
+def fully_configure_repos(configs: list[GithubRepoConfig]) -> None:
+    """Add the repos managed implicitly by this project and apply the settings derived from other config files."""
     if not configs:
         return
     if ACTIVELY_IMPORT_AWS_ORG_REPOS or AWS_ORG_REPOS_SUCCESSFULLY_IMPORTED:
@@ -274,12 +325,38 @@ def create_repos(*, configs: list[GithubRepoConfig] | None = None, provider: Pro
                 ),
             ]
         )
-    package_claims_list: list[RepoPackageClaims] = []
-    create_internal_packages_configs(package_claims_list)
-    for package_claim in package_claims_list:
-        for config in configs:
-            if config.name == package_claim.repo_name:
-                config.create_pypi_publishing_environments = True
-                break
+    package_claims_index = get_package_claims_index()
+    _ = package_claims_index.warn_about_unknown_repos(config.name for config in configs)
+    for config in configs:
+        if (CENTRAL_INFRA_GITHUB_ORG_NAME, config.name) in package_claims_index:
+            config.create_pypi_publishing_environments = True
+
+
+def plan_default_branch_rulesets(
+    configs: list[GithubRepoConfig], *, use_org_level_ruleset: bool = USE_ORG_LEVEL_DEFAULT_BRANCH_RULESET
+) -> DefaultBranchRulesetPartition:
+    """Decide which repos the org level ruleset covers, the rest (or all, when it isn't used) keep their own ruleset."""
+    if not use_org_level_ruleset:
+        return DefaultBranchRulesetPartition(
+            shared_repo_names=[], divergent_repo_names=[config.name for config in configs]
+        )
+    return partition_default_branch_rulesets(
+        {config.name: config.default_branch_ruleset_settings() for config in configs}
+    )
+
+
+def create_repos(*, configs: list[GithubRepoConfig], provider: Provider) -> None:
+    """Create the repos, from configs that `fully_configure_repos` has already been applied to (e.g. the org model's)."""
+    if not configs:
+        return
+    partition = plan_default_branch_rulesets(configs)
+    if partition.shared_settings is not None:
+        _ = OrgDefaultBranchRuleset(
+            settings=partition.shared_settings, repo_names=partition.shared_repo_names, provider=provider
+        )
     for config in configs:
-        _ = GithubRepo(config=config, provider=provider)
+        _ = GithubRepo(
+            config=config,
+            provider=provider,
+            create_default_branch_ruleset=config.name not in partition.shared_repo_names,
+        )
@@ -0,0 +1,128 @@
+from collections import Counter
+from collections.abc import Mapping
+from typing import Literal
+
+from ephemeral_pulumi_deploy import append_resource_suffix
+from pulumi import ComponentResource
+from pulumi import ResourceOptions
+from pulumi_github import OrganizationRuleset
+from pulumi_github import OrganizationRulesetBypassActorArgs
+from pulumi_github import OrganizationRulesetConditionsArgs
+from pulumi_github import OrganizationRulesetConditionsRefNameArgs
+from pulumi_github import OrganizationRulesetConditionsRepositoryNameArgs
+from pulumi_github import OrganizationRulesetRulesArgs
+from pulumi_github import OrganizationRulesetRulesPullRequestArgs
+from pulumi_github import OrganizationRulesetRulesRequiredStatusChecksArgs
+from pulumi_github import OrganizationRulesetRulesRequiredStatusChecksRequiredCheckArgs
+from pulumi_github import Provider
+from pydantic import BaseModel
+from pydantic import ConfigDict
+
+DEFAULT_BRANCH_RULESET_NAME = "Protect Default Branch"
+GITHUB_ACTIONS_INTEGRATION_ID = 15368  # the ID for Github Actions
+REQUIRED_CHECK_CONTEXT = "required-check"
+WRITE_REPOSITORY_ROLE_ID = 4  # the ID for the Write Repository Role
+MIN_REPOS_FOR_ORG_RULESET = 2  # a single repo gains nothing from being moved to an org level ruleset
+
+
+class DefaultBranchRulesetSettings(BaseModel):
+    """The parts of the default branch ruleset that can vary between repos."""
+
+    model_config = ConfigDict(frozen=True)
+
+    org_admin_rule_bypass: bool
+    repo_write_role_rule_bypass: bool
+    require_branch_to_be_up_to_date_before_merge: bool
+    require_code_owner_review: bool
+    allowed_merge_methods: tuple[Literal["merge", "squash", "rebase"], ...] | None
+
+
+class DefaultBranchRulesetPartition(BaseModel):
+    shared_settings: DefaultBranchRulesetSettings | None = None
+    shared_repo_names: list[str]  # covered by the org level ruleset
+    divergent_repo_names: list[str]  # still need their own repository level ruleset
+
+
+def partition_default_branch_rulesets(
+    repo_settings: Mapping[str, DefaultBranchRulesetSettings],
+) -> DefaultBranchRulesetPartition:
+    """Find the ruleset settings used by the most repos, so they can share one org level ruleset.
+
+    Ties are broken by the first repo listed, so the result is stable across deployments.
+    """
+    counts = Counter(repo_settings.values())
+    if not counts:
+        return DefaultBranchRulesetPartition(shared_repo_names=[], divergent_repo_names=[])
+    most_common_count = max(counts.values())
+    if most_common_count < MIN_REPOS_FOR_ORG_RULESET:
+        return DefaultBranchRulesetPartition(shared_repo_names=[], divergent_repo_names=list(repo_settings))
+    shared_settings = next(settings for settings in repo_settings.values() if counts[settings] == most_common_count)
+    return DefaultBranchRulesetPartition(
+        shared_settings=shared_settings,
+        shared_repo_names=sorted(name for name, settings in repo_settings.items() if settings == shared_settings),
+        divergent_repo_names=[name for name, settings in repo_settings.items() if settings != shared_settings],
+    )
+
+
+class OrgDefaultBranchRuleset(ComponentResource):
+    """One organization ruleset protecting the default branch of every repo that uses the same settings.
+
+    Requires a GitHub plan that supports organization rulesets for the visibility of the included repos.
+    """
+
+    def __init__(
+        self, *, settings: DefaultBranchRulesetSettings, repo_names: list[str], provider: Provider | None = None
+    ):
+        super().__init__(
+            "labauto:OrgDefaultBranchRuleset", append_resource_suffix("default-branch", max_length=150), None
+        )
+        bypass_actors: list[OrganizationRulesetBypassActorArgs] = []
+        if settings.org_admin_rule_bypass:
+            bypass_actors.append(
+                OrganizationRulesetBypassActorArgs(
+                    actor_type="OrganizationAdmin",
+                    bypass_mode="pull_request",
+                    actor_id=0,  # Pulumi requires some value for actor_id, but it doesn't seem to be used when actor_type is set to Org Admin
+                )
+            )
+        if settings.repo_write_role_rule_bypass:
+            bypass_actors.append(
+                OrganizationRulesetBypassActorArgs(
+                    actor_type="RepositoryRole", bypass_mode="pull_request", actor_id=WRITE_REPOSITORY_ROLE_ID
+                )
+            )
+        _ = OrganizationRuleset(
+            append_resource_suffix("default-branch", max_length=150),
+            bypass_actors=bypass_actors
+            or None,  # supplying an empty list seems to cause problems, so explicitly pass None if no bypass
+            name=DEFAULT_BRANCH_RULESET_NAME,
+            target="branch",
+            enforcement="active",
+            conditions=OrganizationRulesetConditionsArgs(
+                ref_name=OrganizationRulesetConditionsRefNameArgs(includes=["~DEFAULT_BRANCH"], excludes=[]),
+                repository_name=OrganizationRulesetConditionsRepositoryNameArgs(includes=repo_names, excludes=[]),
+            ),
+            rules=OrganizationRulesetRulesArgs(
+                deletion=True,
+                non_fast_forward=True,
+                required_status_checks=OrganizationRulesetRulesRequiredStatusChecksArgs(
+                    required_checks=[
+                        OrganizationRulesetRulesRequiredStatusChecksRequiredCheckArgs(
+                            context=REQUIRED_CHECK_CONTEXT,
+                            integration_id=GITHUB_ACTIONS_INTEGRATION_ID,
+                        )
+                    ],
+                    strict_required_status_checks_policy=settings.require_branch_to_be_up_to_date_before_merge,
+                ),
+                pull_request=OrganizationRulesetRulesPullRequestArgs(
+                    allowed_merge_methods=None
+                    if settings.allowed_merge_methods is None
+                    else list(settings.allowed_merge_methods),
+                    dismiss_stale_reviews_on_push=True,
+                    require_last_push_approval=True,
+                    required_approving_review_count=1,
+                    require_code_owner_review=settings.require_code_owner_review,
+                ),
+            ),
+            opts=ResourceOptions(provider=provider, parent=self),
+        )
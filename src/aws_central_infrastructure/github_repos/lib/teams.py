@@ -126,6 +126,13 @@ def _validate_team_members_in_org(configs: list[GithubTeamConfig], org_members:
                 raise GithubTeamMemberNotInOrgMembersError(username=member, team_name=config.name)
 
 
+def create_root_team_configs() -> tuple[GithubTeamConfig, GithubTeamConfig]:
+    """Create the root `Everyone` team and the `DevSecOps` team, which always exist in the organization."""
+    root_team = GithubTeamConfig(name="Everyone", description="Everyone in the organization, the root of all teams.")
+    dev_sec_ops_team_config = GithubTeamConfig(name="DevSecOps", description="DevSecOps Team", parent_team=root_team)
+    return root_team, dev_sec_ops_team_config
+
+
 def fully_configure_teams(
     *, configs: list[GithubTeamConfig], org_members: GithubOrgMembers, root_team: GithubTeamConfig
 ) -> None:
@@ -153,15 +160,15 @@ def create_teams(
     *,
     configs: list[GithubTeamConfig],
     provider: Provider,
-    org_members: GithubOrgMembers,
-    root_team: GithubTeamConfig,
+    root_team_slug: str,
 ) -> None:
+    """Create the teams, from configs that `fully_configure_teams` has already been applied to (e.g. the org model's)."""
     # Additional Token permissions needed beyond repo: Organization-Members Read/Write
-    fully_configure_teams(configs=configs, org_members=org_members, root_team=root_team)
+    root_team = next(config for config in configs if config.slug == root_team_slug)
 
     # TODO: confirm all team slugs are unique
     # TODO: confirm there's no duplicate repos listed in the GithubTeamConfig repo permissions (prefer over dict so that there's no silent overriding of permissions)
     for config in configs:
         if config.parent_team is None and config is not root_team:
-            config.parent_team = root_team
+            config = config.model_copy(update={"parent_team": root_team})  # noqa: PLW2901 # the configs are shared by everything using the org model, so they're not modified
         _ = GithubTeam(config=config, provider=provider)
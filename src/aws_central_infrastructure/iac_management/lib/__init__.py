@@ -9,7 +9,12 @@ from .github_oidc_lib import GithubOidcConfig
 from .github_oidc_lib import create_oidc_assume_role_policy
 from .github_oidc_lib import create_oidc_for_single_account_workload
 from .github_oidc_lib import create_oidc_for_standard_workload
+from .github_oidc_lib import create_oidc_sub_condition
 from .github_oidc_lib import principal_in_org_condition
+from .pulumi_bootstrap import central_infra_role_arn
+from .pulumi_bootstrap import create_central_classic_provider
+from .pulumi_bootstrap import create_central_native_provider
+from .pulumi_bootstrap import create_classic_provider
 from .pulumi_bootstrap import create_classic_providers
 from .pulumi_bootstrap import create_providers
 from .workload_params import get_management_account_id
@@ -79,6 +79,9 @@ class GithubOidcConfig(BaseModel):
     repo_name: str
     managed_policy_arns: list[str] = Field(default_factory=list)
     restrictions: str | None = None
+    environments: list[str] = Field(
+        default_factory=list
+    )  # when set, only jobs running in one of these GitHub environments can assume the role, and restrictions is ignored
     role_policy: iam.RolePolicyArgs | None = None
     role_resource_name_prefix: str = "github-oidc--"
 
@@ -100,6 +103,26 @@ class GithubOidcConfig(BaseModel):
         )
 
 
+def create_oidc_sub_condition(oidc_config: GithubOidcConfig) -> GetPolicyDocumentStatementConditionArgs:
+    if oidc_config.environments:
+        # IAM only exposes the sub and aud claims, so the environment is matched through the sub
+        return GetPolicyDocumentStatementConditionArgs(
+            test="StringEquals",
+            variable="token.actions.githubusercontent.com:sub",
+            values=[
+                f"repo:{oidc_config.repo_org}/{oidc_config.repo_name}:environment:{environment}"
+                for environment in oidc_config.environments
+            ],
+        )
+    return GetPolicyDocumentStatementConditionArgs(
+        test="StringLike" if oidc_config.restrictions is None or oidc_config.restrictions == "*" else "StringEquals",
+        variable="token.actions.githubusercontent.com:sub",
+        values=[
+            f"repo:{oidc_config.repo_org}/{oidc_config.repo_name}:{'*' if oidc_config.restrictions is None else oidc_config.restrictions}"
+        ],
+    )
+
+
 def create_oidc_assume_role_policy(
     *, oidc_config: GithubOidcConfig, provider_arn: str
 ) -> AwaitableGetPolicyDocumentResult:
@@ -110,15 +133,7 @@ def create_oidc_assume_role_policy(
                 principals=[GetPolicyDocumentStatementPrincipalArgs(type="Federated", identifiers=[provider_arn])],
                 actions=["sts:AssumeRoleWithWebIdentity"],
                 conditions=[
-                    GetPolicyDocumentStatementConditionArgs(
-                        test="StringLike"
-                        if oidc_config.restrictions is None or oidc_config.restrictions == "*"
-                        else "StringEquals",
-                        variable="token.actions.githubusercontent.com:sub",
-                        values=[
-                            f"repo:{oidc_config.repo_org}/{oidc_config.repo_name}:{'*' if oidc_config.restrictions is None else oidc_config.restrictions}"
-                        ],
-                    ),
+                    create_oidc_sub_condition(oidc_config),
                     GetPolicyDocumentStatementConditionArgs(
                         test="StringEquals",
                         variable="token.actions.githubusercontent.com:aud",
@@ -1,8 +1,10 @@
 import logging
+from typing import Literal
 
 import pulumi_aws
 from ephemeral_pulumi_deploy import get_config_str
 from ephemeral_pulumi_deploy.utils import common_tags
+from ephemeral_pulumi_deploy.utils import get_aws_account_id
 from lab_auto_pulumi import ORG_MANAGED_SSM_PARAM_PREFIX
 from lab_auto_pulumi import AwsAccountId
 from lab_auto_pulumi import AwsAccountInfo
@@ -25,35 +27,67 @@ from .constants import CENTRAL_INFRA_REPO_NAME
 logger = logging.getLogger(__name__)
 
 
+def central_infra_role_arn(account_id: AwsAccountId, *, role_type: Literal["Preview", "Deploy"] | None = None) -> str:
+    """Get the role this repo assumes in other accounts, by default the Preview or Deploy variant matching the Pulumi run."""
+    if role_type is None:
+        role_type = "Preview" if is_dry_run() else "Deploy"
+    return f"arn:aws:iam::{account_id}:role/Infra{role_type}--{CENTRAL_INFRA_REPO_NAME}"
+
+
+def create_classic_provider(
+    *, account: AwsAccountInfo, parent: Resource, region: str | None = None
+) -> pulumi_aws.Provider:
+    """Create a provider assuming the central infra role in the account, in the org home region unless one is given."""
+    organization_home_region = get_config_str("proj:aws_org_home_region")
+    role_arn = central_infra_role_arn(account.id)
+    assume_role = pulumi_aws.ProviderAssumeRoleArgs(role_arn=role_arn, session_name="pulumi")
+    return pulumi_aws.Provider(
+        # the home region's providers keep their original names, so existing stacks don't replace them
+        f"central-infra-classic-provider-for-{account.name}"
+        if region in (None, organization_home_region)
+        else f"central-infra-classic-provider-for-{account.name}-{region}",
+        assume_roles=[assume_role],
+        allowed_account_ids=[account.id],
+        region=region or organization_home_region,
+        opts=ResourceOptions(
+            parent=parent
+        ),  # TODO: figure out how to stop so much false positive diff showing up in Pulumi Preview. Using ignore_changes doesn't work for this provider, even though it seems to for Native Provider
+    )
+
+
 def create_classic_providers(
-    *, aws_accounts: list[AwsAccountInfo], parent: Resource
+    *, aws_accounts: list[AwsAccountInfo], parent: Resource, region: str | None = None
 ) -> dict[AwsAccountId, pulumi_aws.Provider]:
-    providers: dict[AwsAccountId, pulumi_aws.Provider] = {}
-    organization_home_region = get_config_str("proj:aws_org_home_region")
-    role_type = "Preview" if is_dry_run() else "Deploy"
-    for account in aws_accounts:
-        role_arn = f"arn:aws:iam::{account.id}:role/Infra{role_type}--{CENTRAL_INFRA_REPO_NAME}"
-        assume_role = pulumi_aws.ProviderAssumeRoleArgs(role_arn=role_arn, session_name="pulumi")
-        provider = pulumi_aws.Provider(
-            f"central-infra-classic-provider-for-{account.name}",
-            assume_roles=[assume_role],
-            allowed_account_ids=[account.id],
-            region=organization_home_region,
-            opts=ResourceOptions(
-                parent=parent
-            ),  # TODO: figure out how to stop so much false positive diff showing up in Pulumi Preview. Using ignore_changes doesn't work for this provider, even though it seems to for Native Provider
-        )
-        providers[account.id] = provider
+    return {
+        account.id: create_classic_provider(account=account, parent=parent, region=region) for account in aws_accounts
+    }
 
-    return providers
+
+def create_central_classic_provider(*, region: str, parent: Resource) -> pulumi_aws.Provider:
+    """Create a provider for this (central infra) account in another region, with the credentials Pulumi runs with."""
+    return pulumi_aws.Provider(
+        f"central-infra-classic-provider-{region}",
+        allowed_account_ids=[get_aws_account_id()],
+        region=region,
+        opts=ResourceOptions(parent=parent),
+    )
+
+
+def create_central_native_provider(*, region: str, parent: Resource) -> Provider:
+    """Create a native provider for this (central infra) account in another region, with the credentials Pulumi runs with."""
+    return Provider(
+        f"central-infra-native-provider-{region}",
+        allowed_account_ids=[get_aws_account_id()],
+        region=region,
+        opts=ResourceOptions(parent=parent),
+    )
 
 
 def create_providers(*, aws_accounts: list[AwsAccountInfo], parent: Resource) -> dict[AwsAccountId, Provider]:
     providers: dict[AwsAccountId, Provider] = {}
     organization_home_region = get_config_str("proj:aws_org_home_region")
-    role_type = "Preview" if is_dry_run() else "Deploy"
     for account in aws_accounts:
-        role_arn = f"arn:aws:iam::{account.id}:role/Infra{role_type}--{CENTRAL_INFRA_REPO_NAME}"
+        role_arn = central_infra_role_arn(account.id)
         assume_role = ProviderAssumeRoleArgs(role_arn=role_arn, session_name="pulumi")
         provider = Provider(
             f"central-infra-native-provider-for-{account.name}",
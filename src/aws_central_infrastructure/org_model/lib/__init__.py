@@ -0,0 +1,4 @@
+from .org_model import OrgModel
+from .org_model import compile_org_model
+from .org_model import get_org_model
+from .org_model import load_or_compile_org_model
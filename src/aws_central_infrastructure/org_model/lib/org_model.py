@@ -0,0 +1,201 @@
+"""Compile the declarative config files of every stack into a single typed, indexed model of the organization.
+
+The compiled model is cached as JSON named by a hash of the source it was compiled from, so it is only rebuilt when a
+config file (or this package's code) changes.
+
+Example (compiles the model, or confirms the cached one is current, and prints where it is):
+`uv run python -m aws_central_infrastructure.org_model.lib.org_model`
+"""
+
+import argparse
+import hashlib
+import logging
+import tempfile
+from functools import cache
+from importlib import metadata
+from pathlib import Path
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+
+import aws_central_infrastructure
+from aws_central_infrastructure.artifact_stores.ami_sharing import define_image_builders
+from aws_central_infrastructure.artifact_stores.container_registries import define_container_registries
+from aws_central_infrastructure.artifact_stores.lib import EcrConfig
+from aws_central_infrastructure.artifact_stores.lib import ImageBuilderConfig
+from aws_central_infrastructure.artifact_stores.lib import RepoPackageClaims
+from aws_central_infrastructure.artifact_stores.lib import get_package_claims_index
+from aws_central_infrastructure.github_repos.collaborators import define_repository_collaborators
+from aws_central_infrastructure.github_repos.lib import GithubOrgMembers
+from aws_central_infrastructure.github_repos.lib import GithubRepoConfig
+from aws_central_infrastructure.github_repos.lib import GithubTeamConfig
+from aws_central_infrastructure.github_repos.lib import RepositoryCollaboratorConfig
+from aws_central_infrastructure.github_repos.lib import RepositoryName
+from aws_central_infrastructure.github_repos.lib import create_root_team_configs
+from aws_central_infrastructure.github_repos.lib import fully_configure_repos
+from aws_central_infrastructure.github_repos.lib import fully_configure_teams
+from aws_central_infrastructure.github_repos.repos import create_repo_configs
+from aws_central_infrastructure.github_repos.teams import define_team_configs
+from aws_central_infrastructure.iac_management.lib import CENTRAL_INFRA_GITHUB_ORG_NAME
+
+logger = logging.getLogger(__name__)
+
+# outside the source tree, so that compiling the model never adds files to the repo being deployed
+DEFAULT_ORG_MODEL_CACHE_DIR = Path(tempfile.gettempdir()) / "aws-central-infrastructure-org-model"
+# the installed versions of these affect the compiled model (e.g. constants and default values), so they're part of the hash
+_VERSIONED_DEPENDENCIES = ("lab-auto-pulumi", "ephemeral-pulumi-deploy", "pydantic")
+
+
+class OrgModel(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    source_hash: str
+    repos: dict[RepositoryName, GithubRepoConfig]
+    package_claims: dict[RepositoryName, RepoPackageClaims]  # repos in other orgs are keyed as org/name
+    ecr_configs: list[EcrConfig]
+    ecr_repo_names_by_git_repo: dict[RepositoryName, list[str]]
+    image_builders: list[ImageBuilderConfig]
+    org_members: GithubOrgMembers
+    teams: dict[str, GithubTeamConfig]  # keyed by slug, the root team included
+    team_permissions_by_repo: dict[RepositoryName, dict[str, str]]  # team slug -> permission
+    collaborators: dict[str, RepositoryCollaboratorConfig]  # keyed by username
+    collaborator_permissions_by_repo: dict[RepositoryName, dict[str, str]]  # username -> permission
+    unknown_repo_references: list[str] = Field(
+        default_factory=list, description="References from other config files to repos in this org that are not managed"
+    )
+
+
+def compute_source_hash() -> str:
+    """Hash every module in the package (the config files and the code that interprets them)."""
+    package_dir = Path(aws_central_infrastructure.__file__).parent
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.rglob("*.py")):
+        digest.update(path.relative_to(package_dir).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    for dependency in _VERSIONED_DEPENDENCIES:
+        digest.update(f"{dependency}=={metadata.version(dependency)}\0".encode())
+    return digest.hexdigest()
+
+
+def _local_repo_name(repo_name: str) -> str | None:
+    """Strip this org's prefix from a repo name, or return None if the repo is in a different org."""
+    if "/" not in repo_name:
+        return repo_name
+    org_name, _, name = repo_name.partition("/")
+    return name if org_name == CENTRAL_INFRA_GITHUB_ORG_NAME else None
+
+
+def compile_org_model(*, source_hash: str | None = None) -> OrgModel:
+    """Load every declarative config file once and resolve the references between them."""
+    repo_configs: list[GithubRepoConfig] = []
+    create_repo_configs(repo_configs)
+    fully_configure_repos(repo_configs)
+    repos = {config.name: config for config in repo_configs}
+
+    package_claims_index = get_package_claims_index()
+    unknown_repo_references = [
+        f"Package claims for {repo_name}" for repo_name in package_claims_index.find_unknown_repo_names(repos)
+    ]
+
+    ecr_configs: list[EcrConfig] = []
+    define_container_registries(ecr_configs)
+    ecr_repo_names_by_git_repo: dict[RepositoryName, list[str]] = {}
+    for ecr_config in ecr_configs:
+        if ecr_config.git_repo_name is None:
+            continue
+        ecr_repo_names_by_git_repo.setdefault(ecr_config.git_repo_name, []).append(
+            ecr_config.ecr_repo_full_name_for_arn
+        )
+        if ecr_config.git_repo_org == CENTRAL_INFRA_GITHUB_ORG_NAME and ecr_config.git_repo_name not in repos:
+            unknown_repo_references.append(
+                f"ECR {ecr_config.ecr_repo_full_name_for_arn} pushed to by {ecr_config.git_repo_name}"
+            )
+
+    image_builders: list[ImageBuilderConfig] = []
+    define_image_builders(image_builders)
+
+    root_team, dev_sec_ops_team_config = create_root_team_configs()
+    team_configs: list[GithubTeamConfig] = [dev_sec_ops_team_config]
+    org_members = define_team_configs(configs=team_configs, dev_sec_ops_team_config=dev_sec_ops_team_config)
+    fully_configure_teams(configs=team_configs, org_members=org_members, root_team=root_team)
+    team_permissions_by_repo: dict[RepositoryName, dict[str, str]] = {}
+    for team_config in team_configs:
+        for repo_name, permission in team_config.repo_permissions.items():
+            local_repo_name = _local_repo_name(repo_name)
+            team_permissions_by_repo.setdefault(local_repo_name or repo_name, {})[team_config.slug] = permission
+            if local_repo_name is not None and local_repo_name not in repos:
+                unknown_repo_references.append(f"Team {team_config.name} permission on {repo_name}")
+
+    collaborator_configs: list[RepositoryCollaboratorConfig] = []
+    define_repository_collaborators(configs=collaborator_configs)
+    collaborator_permissions_by_repo: dict[RepositoryName, dict[str, str]] = {}
+    for collaborator in collaborator_configs:
+        for repo_name, permission in collaborator.repo_permissions.items():
+            collaborator_permissions_by_repo.setdefault(repo_name, {})[collaborator.username] = permission
+            if repo_name not in repos:
+                unknown_repo_references.append(f"Collaborator {collaborator.username} permission on {repo_name}")
+
+    return OrgModel(
+        source_hash=source_hash or compute_source_hash(),
+        repos=repos,
+        package_claims={
+            _local_repo_name(f"{claims.repo_org}/{claims.repo_name}") or f"{claims.repo_org}/{claims.repo_name}": claims
+            for claims in package_claims_index.claims
+        },
+        ecr_configs=ecr_configs,
+        ecr_repo_names_by_git_repo=ecr_repo_names_by_git_repo,
+        image_builders=image_builders,
+        org_members=org_members,
+        teams={team_config.slug: team_config for team_config in team_configs},
+        team_permissions_by_repo=team_permissions_by_repo,
+        collaborators={collaborator.username: collaborator for collaborator in collaborator_configs},
+        collaborator_permissions_by_repo=collaborator_permissions_by_repo,
+        unknown_repo_references=unknown_repo_references,
+    )
+
+
+def org_model_cache_path(*, cache_dir: Path, source_hash: str) -> Path:
+    return cache_dir / f"org-model-{source_hash}.json"
+
+
+def load_or_compile_org_model(*, cache_dir: Path = DEFAULT_ORG_MODEL_CACHE_DIR) -> OrgModel:
+    """Read the cached model for the current source, compiling (and caching) it first if needed."""
+    source_hash = compute_source_hash()
+    cache_path = org_model_cache_path(cache_dir=cache_dir, source_hash=source_hash)
+    if cache_path.exists():
+        return OrgModel.model_validate_json(cache_path.read_bytes())
+    org_model = compile_org_model(source_hash=source_hash)
+    for reference in org_model.unknown_repo_references:
+        logger.warning(f"{reference} refers to a repo that is not managed in github_repos/repos.py")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for stale_cache_path in cache_dir.glob(org_model_cache_path(cache_dir=cache_dir, source_hash="*").name):
+        stale_cache_path.unlink(missing_ok=True)  # another process may have just removed it
+    # write to a file unique to this process then rename, so that a concurrently running stack never reads (or writes
+    # into) a partially written file
+    with tempfile.NamedTemporaryFile(
+        "w", dir=cache_dir, prefix=f"{cache_path.stem}-", suffix=".tmp", delete=False
+    ) as temp_file:
+        _ = temp_file.write(org_model.model_dump_json())
+    _ = Path(temp_file.name).replace(cache_path)
+    return org_model
+
+
+@cache
+def get_org_model() -> OrgModel:
+    """Load the model once per process, for the stacks that deploy the resources it describes."""
+    return load_or_compile_org_model()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument("--cache-dir", type=Path, default=DEFAULT_ORG_MODEL_CACHE_DIR)
+    args = parser.parse_args()
+    org_model = load_or_compile_org_model(cache_dir=args.cache_dir)
+    print(org_model_cache_path(cache_dir=args.cache_dir, source_hash=org_model.source_hash))  # noqa: T201 # this is a CLI
+
+
+if __name__ == "__main__":
+    main()
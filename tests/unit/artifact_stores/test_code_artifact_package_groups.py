@@ -0,0 +1,55 @@
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import PackageClaimsIndex
+from aws_central_infrastructure.artifact_stores.lib import RepoPackageClaims
+from aws_central_infrastructure.artifact_stores.lib import package_group_pattern
+from aws_central_infrastructure.artifact_stores.lib import plan_claimed_package_patterns
+
+
+def test_Given_pypi_name_with_separators__When_pattern__Then_normalized():
+    assert package_group_pattern(package_type="pypi", package_name="My_Package.Name") == "/pypi//my-package-name$"
+
+
+def test_Given_scoped_npm_name__When_pattern__Then_scope_is_the_namespace():
+    scope = str(uuid4())
+    name = str(uuid4())
+
+    assert package_group_pattern(package_type="npm", package_name=f"@{scope}/{name}") == f"/npm/{scope}/{name}$"
+
+
+def test_Given_unscoped_npm_name__When_pattern__Then_no_namespace():
+    name = str(uuid4())
+
+    assert package_group_pattern(package_type="npm", package_name=name) == f"/npm//{name}$"
+
+
+def test_Given_internal_and_public_claims__When_planned__Then_only_internal_names_blocked():
+    internal_name = str(uuid4())
+    nuget_name = str(uuid4())
+    public_name = str(uuid4())
+    index = PackageClaimsIndex(
+        [
+            RepoPackageClaims(
+                repo_name=str(uuid4()), pypi_package_names={internal_name}, nuget_package_names={nuget_name}
+            ),
+            RepoPackageClaims(
+                repo_name=str(uuid4()), publish_to_public_registry=True, pypi_package_names={public_name}
+            ),
+        ]
+    )
+
+    patterns = plan_claimed_package_patterns(index)
+
+    assert patterns == sorted([f"/pypi//{internal_name}$", f"/nuget//{nuget_name}$"])
+
+
+def test_Given_same_name_claimed_in_two_spellings__When_planned__Then_one_pattern():
+    index = PackageClaimsIndex(
+        [
+            RepoPackageClaims(repo_name=str(uuid4()), pypi_package_names={"my_package"}),
+            RepoPackageClaims(repo_name=str(uuid4()), pypi_package_names={"My-Package"}),
+        ]
+    )
+
+    assert plan_claimed_package_patterns(index) == ["/pypi//my-package$"]
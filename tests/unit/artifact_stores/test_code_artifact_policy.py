@@ -0,0 +1,108 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import ConflictingNpmScopeClaimError
+from aws_central_infrastructure.artifact_stores.lib import PackageClaimsIndex
+from aws_central_infrastructure.artifact_stores.lib import PackageResourcePattern
+from aws_central_infrastructure.artifact_stores.lib import PublishingPolicyTooLargeError
+from aws_central_infrastructure.artifact_stores.lib import RepoPackageClaims
+from aws_central_infrastructure.artifact_stores.lib import plan_claimed_package_patterns
+from aws_central_infrastructure.artifact_stores.lib import plan_package_resource_arns
+from aws_central_infrastructure.artifact_stores.lib import plan_package_resource_patterns
+
+
+def _to_arn(pattern: PackageResourcePattern) -> str:
+    return f"arn:aws:codeartifact:us-east-1:123456789012:package/domain/repo/{pattern.package_type}/{pattern.namespace}/{pattern.name}"
+
+
+def test_Given_scoped_npm_names__When_planned__Then_namespace_split_from_name():
+    scope = str(uuid4())
+    claims = RepoPackageClaims(repo_name=str(uuid4()), npm_package_names={f"@{scope}/core", "unscoped"})
+
+    patterns = plan_package_resource_patterns(claims, other_claims=[], to_arn=_to_arn)
+
+    assert set(patterns) == {
+        PackageResourcePattern(package_type="npm", namespace=scope, name="core"),
+        PackageResourcePattern(package_type="npm", name="unscoped"),
+    }
+
+
+def test_Given_claimed_scope__When_planned__Then_one_wildcard_covers_its_packages():
+    scope = str(uuid4())
+    claims = RepoPackageClaims(
+        repo_name=str(uuid4()),
+        npm_scopes={scope},
+        npm_package_names={f"@{scope}/{uuid4()}" for _ in range(5)},
+    )
+
+    patterns = plan_package_resource_patterns(claims, other_claims=[], to_arn=_to_arn)
+
+    assert patterns == [PackageResourcePattern(package_type="npm", namespace=scope, name="*")]
+
+
+def test_Given_few_packages_with_shared_prefix__When_planned__Then_exact_names_kept():
+    package_names = {"mylib-core", "mylib-cli"}
+    claims = RepoPackageClaims(repo_name=str(uuid4()), pypi_package_names=package_names)
+
+    patterns = plan_package_resource_patterns(claims, other_claims=[], to_arn=_to_arn)
+
+    assert {pattern.name for pattern in patterns} == package_names
+
+
+def test_Given_many_packages_over_budget__When_planned__Then_shared_prefix_collapsed():
+    claims = RepoPackageClaims(
+        repo_name=str(uuid4()), pypi_package_names={f"mylib-{uuid4()}" for _ in range(50)} | {"standalone"}
+    )
+
+    patterns = plan_package_resource_patterns(claims, other_claims=[], to_arn=_to_arn)
+
+    assert sorted(pattern.name for pattern in patterns) == ["mylib-*", "standalone"]
+
+
+def test_Given_prefix_shared_with_other_repo__When_over_budget__Then_error_instead_of_wildcard():
+    claims = RepoPackageClaims(repo_name=str(uuid4()), pypi_package_names={f"mylib-{uuid4()}" for _ in range(50)})
+    other = RepoPackageClaims(repo_name=str(uuid4()), pypi_package_names={"mylib-other"})
+
+    with pytest.raises(PublishingPolicyTooLargeError, match=claims.repo_name):
+        _ = plan_package_resource_patterns(claims, other_claims=[other], to_arn=_to_arn)
+
+
+def _to_repo_arn(ca_repo_name: str, pattern: PackageResourcePattern) -> str:
+    return f"{ca_repo_name}/{pattern.package_type}/{pattern.namespace}/{pattern.name}"
+
+
+def test_Given_several_code_artifact_repos__When_arns_planned__Then_each_claimed_package_listed_in_every_repo():
+    package_name = str(uuid4())
+    claims = RepoPackageClaims(repo_name=str(uuid4()), pypi_package_names={package_name})
+    ca_repo_names = [str(uuid4()), str(uuid4())]
+
+    arns = plan_package_resource_arns(claims, other_claims=[], ca_repo_names=ca_repo_names, to_arn=_to_repo_arn)
+
+    assert arns == [f"{ca_repo_name}/pypi//{package_name}" for ca_repo_name in ca_repo_names]
+
+
+def test_Given_no_code_artifact_repos__When_arns_planned__Then_none_listed():
+    claims = RepoPackageClaims(repo_name=str(uuid4()), pypi_package_names={str(uuid4())})
+
+    assert plan_package_resource_arns(claims, other_claims=[], ca_repo_names=[], to_arn=_to_repo_arn) == []
+
+
+def test_Given_scope_claimed_whole_and_package_in_it_claimed_elsewhere__When_indexed__Then_error():
+    scope = str(uuid4())
+
+    with pytest.raises(ConflictingNpmScopeClaimError, match=scope):
+        _ = PackageClaimsIndex(
+            [
+                RepoPackageClaims(repo_name=str(uuid4()), npm_scopes={scope}),
+                RepoPackageClaims(repo_name=str(uuid4()), npm_package_names={f"@{scope}/{uuid4()}"}),
+            ]
+        )
+
+
+def test_Given_claimed_scope__When_package_groups_planned__Then_whole_scope_blocked():
+    scope = str(uuid4())
+    index = PackageClaimsIndex([RepoPackageClaims(repo_name=str(uuid4()), npm_scopes={scope})])
+
+    assert plan_claimed_package_patterns(index) == [f"/npm/{scope}/*"]
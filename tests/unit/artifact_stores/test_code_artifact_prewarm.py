@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from pathlib import PurePosixPath
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import LockedPackage
+from aws_central_infrastructure.artifact_stores.lib import parse_simple_index_links
+from aws_central_infrastructure.artifact_stores.lib import parse_uv_lock
+from aws_central_infrastructure.artifact_stores.lib import prewarm_packages
+from aws_central_infrastructure.artifact_stores.lib import simple_index_url
+
+_UV_LOCK = """
+version = 1
+
+[[package]]
+name = "my-project"
+version = "0.1.0"
+source = { editable = "." }
+
+[[package]]
+name = "Internal_Lib"
+version = "1.0.0"
+source = { registry = "https://example.com/simple" }
+sdist = { url = "https://example.com/internal_lib-1.0.0.tar.gz", hash = "sha256:00" }
+
+[[package]]
+name = "from-git"
+version = "2.0.0"
+source = { git = "https://github.com/example/from-git" }
+
+[[package]]
+name = "requests"
+version = "2.32.3"
+source = { registry = "https://pypi.org/simple" }
+sdist = { url = "https://files.example.com/requests-2.32.3.tar.gz", hash = "sha256:01", size = 100 }
+wheels = [
+    { url = "https://files.example.com/requests-2.32.3-py3-none-any.whl", hash = "sha256:02", size = 200 },
+]
+"""
+
+
+def test_Given_uv_lock__When_parsed__Then_only_unclaimed_registry_packages_with_smallest_file_first():
+    packages = parse_uv_lock(_UV_LOCK, skip_package_names={"internal-lib"})
+
+    assert packages == [
+        LockedPackage(
+            name="requests",
+            version="2.32.3",
+            filenames=["requests-2.32.3.tar.gz", "requests-2.32.3-py3-none-any.whl"],
+        )
+    ]
+
+
+def test_Given_simple_index_page__When_parsed__Then_relative_links_resolved_by_filename():
+    page_url = "https://example.com/pypi/repo/simple/requests/"
+    html = '<a href="../../files/requests-2.32.3.tar.gz#sha256=01">requests-2.32.3.tar.gz</a>'
+
+    links = parse_simple_index_links(html, page_url=page_url)
+
+    assert links == {"requests-2.32.3.tar.gz": "https://example.com/pypi/repo/files/requests-2.32.3.tar.gz#sha256=01"}
+
+
+def _page_for(filenames: list[str]) -> bytes:
+    return "".join(f'<a href="files/{filename}">{filename}</a>' for filename in filenames).encode()
+
+
+def test_Given_locked_packages__When_prewarmed__Then_smallest_offered_file_downloaded_once_per_version():
+    endpoint = f"https://{uuid4()}.example.com/pypi/primary/"
+    present = LockedPackage(name="present", version="1", filenames=["present-1-py3-none-any.whl", "present-1.tar.gz"])
+    partial = LockedPackage(name="partial", version="1", filenames=["partial-1-py3-none-any.whl", "partial-1.tar.gz"])
+    pages = {
+        simple_index_url(repository_endpoint=endpoint, package_name="present"): _page_for(present.filenames),
+        simple_index_url(repository_endpoint=endpoint, package_name="partial"): _page_for(["partial-1.tar.gz"]),
+    }
+    downloaded: list[str] = []
+
+    report = asyncio.run(
+        prewarm_packages(
+            [present, partial],
+            repository_endpoint=endpoint,
+            fetch=lambda url: pages.get(url, b""),
+            download=downloaded.append,
+        )
+    )
+
+    assert report.warmed_filenames == ["partial-1.tar.gz", "present-1-py3-none-any.whl"]
+    assert report.missing_filenames == ["partial-1-py3-none-any.whl"]
+    assert sorted(downloaded) == [
+        f"{endpoint}simple/partial/files/partial-1.tar.gz",
+        f"{endpoint}simple/present/files/present-1-py3-none-any.whl",
+    ]
+
+
+def test_Given_failing_package__When_prewarmed__Then_others_still_warmed():
+    endpoint = f"https://{uuid4()}.example.com/pypi/primary/"
+    good = LockedPackage(name="good", version="1", filenames=["good-1.tar.gz"])
+    bad = LockedPackage(name="bad", version="1", filenames=["bad-1.tar.gz"])
+    good_page = simple_index_url(repository_endpoint=endpoint, package_name="good")
+
+    def fetch(url: str) -> bytes:
+        if "/bad/" in url:
+            raise ConnectionError(url)
+        return _page_for(["good-1.tar.gz"]) if url == good_page else b""
+
+    report = asyncio.run(
+        prewarm_packages([bad, good], repository_endpoint=endpoint, fetch=fetch, download=lambda _: None)
+    )
+
+    assert report.warmed_filenames == ["good-1.tar.gz"]
+    assert list(report.failed_packages) == ["bad"]
+
+
+def test_Given_concurrency_budget__When_prewarmed__Then_never_exceeded():
+    endpoint = f"https://{uuid4()}.example.com/pypi/primary/"
+    concurrency = 3
+    packages = [LockedPackage(name=f"package-{i}", version="1", filenames=[f"package-{i}-1.tar.gz"]) for i in range(10)]
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def download(_: str) -> None:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+
+    def fetch(url: str) -> bytes:
+        download(url)
+        return _page_for([f"{PurePosixPath(url).name}-1.tar.gz"])
+
+    report = asyncio.run(
+        prewarm_packages(
+            packages, repository_endpoint=endpoint, fetch=fetch, download=download, concurrency=concurrency
+        )
+    )
+
+    assert len(report.warmed_filenames) == len(packages)
+    assert max_in_flight <= concurrency
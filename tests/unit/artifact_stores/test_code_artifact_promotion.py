@@ -0,0 +1,226 @@
+import threading
+from collections.abc import Iterator
+from typing import Any
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import PackagePromotion
+from aws_central_infrastructure.artifact_stores.lib import PromotionTarget
+from aws_central_infrastructure.artifact_stores.lib import plan_promotion_batches
+from aws_central_infrastructure.artifact_stores.lib import promote_package_versions
+
+
+class _ResourceNotFoundError(Exception):
+    pass
+
+
+class _FakeExceptions:
+    ResourceNotFoundException = _ResourceNotFoundError
+
+
+class _FakePaginator:
+    def __init__(self, client: "_FakeCodeArtifactClient"):
+        self._client = client
+
+    def paginate(self, **kwargs: Any) -> Iterator[dict[str, Any]]:  # noqa: ANN401 # the same kwargs as boto3 paginators
+        key = (kwargs["repository"], kwargs.get("namespace", ""), kwargs["package"])
+        if self._client.list_error is not None:
+            raise self._client.list_error
+        if key not in self._client.versions:
+            raise _ResourceNotFoundError
+        yield {"versions": [{"version": version} for version in sorted(self._client.versions[key])]}
+
+
+class _FakeCodeArtifactClient:
+    exceptions = _FakeExceptions
+
+    def __init__(
+        self,
+        versions: dict[tuple[str, str, str], set[str]],
+        *,
+        copy_error: ClientError | None = None,
+        list_error: ClientError | None = None,
+    ):
+        self.versions = versions  # keyed by (repository, namespace, package)
+        self.copy_error = copy_error
+        self.list_error = list_error
+        self.copy_calls: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def get_paginator(self, operation_name: str) -> _FakePaginator:
+        assert operation_name == "list_package_versions"
+        return _FakePaginator(self)
+
+    def copy_package_versions(self, **kwargs: Any) -> dict[str, Any]:  # noqa: ANN401 # the same kwargs as boto3
+        with self._lock:
+            self.copy_calls.append(kwargs)
+        if self.copy_error is not None:
+            raise self.copy_error
+        namespace = kwargs.get("namespace", "")
+        source_key = (kwargs["sourceRepository"], namespace, kwargs["package"])
+        if source_key not in self.versions:
+            raise _ResourceNotFoundError
+        source = self.versions[source_key]
+        destination = self.versions.setdefault((kwargs["destinationRepository"], namespace, kwargs["package"]), set())
+        successful: dict[str, Any] = {}
+        failed: dict[str, Any] = {}
+        for version in kwargs["versions"]:
+            if version in destination:
+                failed[version] = {"errorCode": "ALREADY_EXISTS", "errorMessage": "exists"}
+            elif version not in source:
+                failed[version] = {"errorCode": "NOT_FOUND", "errorMessage": "missing"}
+            else:
+                destination.add(version)
+                successful[version] = {"revision": str(uuid4()), "status": "Published"}
+        return {"successfulVersions": successful, "failedVersions": failed}
+
+
+_TARGET = PromotionTarget(domain="domain", source_repository="staging", destination_repository="primary")
+
+
+def test_Given_many_versions__When_batched__Then_each_batch_within_size():
+    batch_size = 3
+    promotion = PackagePromotion(
+        package_type="pypi", package_name=str(uuid4()), versions=[f"1.{i}.0" for i in range(7)]
+    )
+
+    batches = plan_promotion_batches([promotion], batch_size=batch_size)
+
+    assert [len(batch.versions) for batch in batches] == [3, 3, 1]
+    assert sorted(version for batch in batches for version in batch.versions) == sorted(promotion.versions)
+
+
+def test_Given_versions_in_both_repos__When_dry_run__Then_report_without_copying():
+    package_name = str(uuid4())
+    client = _FakeCodeArtifactClient(
+        {("staging", "", package_name): {"1.0.0", "1.1.0"}, ("primary", "", package_name): {"1.0.0"}}
+    )
+
+    report = promote_package_versions(
+        client,  # pyright: ignore[reportArgumentType] # a fake of the boto3 client
+        [PackagePromotion(package_type="pypi", package_name=package_name, versions=["1.0.0", "1.1.0", "2.0.0"])],
+        target=_TARGET,
+        dry_run=True,
+    )
+
+    assert report.dry_run is True
+    assert report.promoted == [f"pypi:{package_name}@1.1.0"]
+    assert report.already_promoted == [f"pypi:{package_name}@1.0.0"]
+    assert report.missing_from_source == [f"pypi:{package_name}@2.0.0"]
+    assert client.copy_calls == []
+
+
+def test_Given_package_never_in_primary__When_dry_run__Then_all_would_be_promoted():
+    package_name = str(uuid4())
+    client = _FakeCodeArtifactClient({("staging", "", package_name): {"1.0.0"}})
+
+    report = promote_package_versions(
+        client,  # pyright: ignore[reportArgumentType] # a fake of the boto3 client
+        [PackagePromotion(package_type="pypi", package_name=package_name, versions=["1.0.0"])],
+        target=_TARGET,
+        dry_run=True,
+    )
+
+    assert report.promoted == [f"pypi:{package_name}@1.0.0"]
+
+
+def test_Given_scoped_npm_package__When_promoted__Then_copied_with_namespace_and_no_overwrite():
+    scope = str(uuid4())
+    name = str(uuid4())
+    client = _FakeCodeArtifactClient({("staging", scope, name): {"1.0.0"}})
+
+    report = promote_package_versions(
+        client,  # pyright: ignore[reportArgumentType] # a fake of the boto3 client
+        [PackagePromotion(package_type="npm", package_name=f"@{scope}/{name}", versions=["1.0.0"])],
+        target=_TARGET,
+    )
+
+    assert report.promoted == [f"npm:@{scope}/{name}@1.0.0"]
+    assert client.versions[("primary", scope, name)] == {"1.0.0"}
+    assert client.copy_calls[0]["namespace"] == scope
+    assert client.copy_calls[0]["allowOverwrite"] is False
+
+
+def test_Given_several_packages__When_promoted__Then_one_copy_per_package_and_existing_reported():
+    package_names = [str(uuid4()) for _ in range(3)]
+    client = _FakeCodeArtifactClient(
+        {
+            **{("staging", "", package_name): {"1.0.0", "1.1.0"} for package_name in package_names},
+            ("primary", "", package_names[0]): {"1.0.0"},
+        }
+    )
+
+    report = promote_package_versions(
+        client,  # pyright: ignore[reportArgumentType] # a fake of the boto3 client
+        [
+            PackagePromotion(package_type="pypi", package_name=package_name, versions=["1.0.0", "1.1.0"])
+            for package_name in package_names
+        ],
+        target=_TARGET,
+        max_workers=2,
+    )
+
+    assert len(client.copy_calls) == len(package_names)
+    assert report.already_promoted == [f"pypi:{package_names[0]}@1.0.0"]
+    assert len(report.promoted) == 2 * len(package_names) - 1
+    assert report.failed == {}
+
+
+def test_Given_package_never_in_staging__When_promoted__Then_reported_missing_from_source():
+    package_name = str(uuid4())
+    client = _FakeCodeArtifactClient({})
+
+    report = promote_package_versions(
+        client,  # pyright: ignore[reportArgumentType] # a fake of the boto3 client
+        [PackagePromotion(package_type="pypi", package_name=package_name, versions=["1.0.0", "1.1.0"])],
+        target=_TARGET,
+    )
+
+    assert report.missing_from_source == [f"pypi:{package_name}@1.0.0", f"pypi:{package_name}@1.1.0"]
+    assert report.promoted == []
+    assert report.failed == {}
+
+
+def test_Given_copy_throttled__When_promoted__Then_batch_reported_failed():
+    package_name = str(uuid4())
+    error_message = str(uuid4())
+    client = _FakeCodeArtifactClient(
+        {("staging", "", package_name): {"1.0.0"}},
+        copy_error=ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": error_message}}, "CopyPackageVersions"
+        ),
+    )
+
+    report = promote_package_versions(
+        client,  # pyright: ignore[reportArgumentType] # a fake of the boto3 client
+        [PackagePromotion(package_type="pypi", package_name=package_name, versions=["1.0.0"])],
+        target=_TARGET,
+    )
+
+    assert list(report.failed) == [f"pypi:{package_name}@1.0.0"]
+    assert error_message in report.failed[f"pypi:{package_name}@1.0.0"]
+
+
+def test_Given_listing_denied__When_dry_run__Then_batch_reported_failed():
+    package_name = str(uuid4())
+    error_message = str(uuid4())
+    client = _FakeCodeArtifactClient(
+        {("staging", "", package_name): {"1.0.0"}},
+        list_error=ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": error_message}}, "ListPackageVersions"
+        ),
+    )
+
+    report = promote_package_versions(
+        client,  # pyright: ignore[reportArgumentType] # a fake of the boto3 client
+        [PackagePromotion(package_type="pypi", package_name=package_name, versions=["1.0.0", "1.1.0"])],
+        target=_TARGET,
+        dry_run=True,
+    )
+
+    assert report.dry_run
+    assert sorted(report.failed) == [f"pypi:{package_name}@1.0.0", f"pypi:{package_name}@1.1.0"]
+    assert error_message in report.failed[f"pypi:{package_name}@1.0.0"]
+    assert client.copy_calls == []
@@ -0,0 +1,44 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import ConflictingEcrRepoOrgsError
+from aws_central_infrastructure.artifact_stores.lib import EcrConfig
+from aws_central_infrastructure.artifact_stores.lib import group_ecr_claims
+
+
+def test_Given_git_repo_pushing_several_images__When_grouped__Then_one_claims_with_all_full_names():
+    git_repo_name = str(uuid4())
+    namespace = str(uuid4())
+    expected_claims_count = 2  # one per git repo
+
+    claims = group_ecr_claims(
+        [
+            EcrConfig(git_repo_name=git_repo_name, ecr_repo_name="backend", ecr_repo_namespace=namespace),
+            EcrConfig(git_repo_name=git_repo_name, ecr_repo_name="frontend", ecr_repo_namespace=namespace),
+            EcrConfig(git_repo_name=str(uuid4()), ecr_repo_name="other"),
+        ]
+    )
+
+    assert len(claims) == expected_claims_count
+    assert claims[0].repo_name == git_repo_name
+    assert claims[0].ecr_repo_names == {f"{namespace}/backend", f"{namespace}/frontend"}
+
+
+def test_Given_repo_without_git_repo__When_grouped__Then_no_claims():
+    claims = group_ecr_claims([EcrConfig(ecr_repo_name="manual-artifacts")])
+
+    assert claims == []
+
+
+def test_Given_git_repo_listed_under_two_orgs__When_grouped__Then_error():
+    git_repo_name = str(uuid4())
+
+    with pytest.raises(ConflictingEcrRepoOrgsError, match=git_repo_name):
+        _ = group_ecr_claims(
+            [
+                EcrConfig(git_repo_name=git_repo_name, git_repo_org=str(uuid4()), ecr_repo_name="backend"),
+                EcrConfig(git_repo_name=git_repo_name, git_repo_org=str(uuid4()), ecr_repo_name="frontend"),
+            ]
+        )
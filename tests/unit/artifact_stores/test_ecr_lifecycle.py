@@ -0,0 +1,124 @@
+import json
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import EcrImage
+from aws_central_infrastructure.artifact_stores.lib import EcrLifecycleConfig
+from aws_central_infrastructure.artifact_stores.lib import EcrLifecycleRule
+from aws_central_infrastructure.artifact_stores.lib import EcrTagPrefixRetention
+from aws_central_infrastructure.artifact_stores.lib import TaggedRuleWithoutPrefixesError
+from aws_central_infrastructure.artifact_stores.lib import lifecycle_policy_text
+from aws_central_infrastructure.artifact_stores.lib import parse_describe_images
+from aws_central_infrastructure.artifact_stores.lib import simulate_lifecycle_policy
+
+NOW = datetime(2026, 10, 19, tzinfo=UTC)
+
+
+def _image(*, days_ago: int, tags: list[str] | None = None) -> EcrImage:
+    return EcrImage(digest=f"sha256:{uuid4().hex}", tags=tags or [], pushed_at=NOW - timedelta(days=days_ago))
+
+
+def test_Given_config__When_converted_to_policy__Then_prefix_rules_before_untagged_before_any():
+    config = EcrLifecycleConfig(
+        tag_prefix_rules=[EcrTagPrefixRetention(tag_prefixes=["release-"], keep_last=5)],
+        expire_untagged_after_days=3,
+        keep_last=20,
+    )
+
+    policy = json.loads(lifecycle_policy_text(config.to_rules()))
+
+    assert [rule["rulePriority"] for rule in policy["rules"]] == [1, 2, 3]
+    assert [rule["selection"]["tagStatus"] for rule in policy["rules"]] == ["tagged", "untagged", "any"]
+    assert policy["rules"][0]["selection"]["tagPrefixList"] == ["release-"]
+    assert policy["rules"][1]["selection"]["countUnit"] == "days"
+    assert "countUnit" not in policy["rules"][2]["selection"]
+
+
+def test_Given_tagged_rule_without_prefixes__When_converted_to_policy__Then_error():
+    description = str(uuid4())
+
+    with pytest.raises(TaggedRuleWithoutPrefixesError, match=description):
+        _ = lifecycle_policy_text(
+            [
+                EcrLifecycleRule(
+                    description=description, tag_status="tagged", count_type="imageCountMoreThan", count_number=1
+                )
+            ]
+        )
+
+
+def test_Given_untagged_images__When_simulated__Then_only_old_ones_expired():
+    old_untagged = _image(days_ago=10)
+    new_untagged = _image(days_ago=1)
+    old_tagged = _image(days_ago=30, tags=["v1"])
+
+    simulation = simulate_lifecycle_policy(
+        EcrLifecycleConfig(expire_untagged_after_days=7).to_rules(), [old_untagged, new_untagged, old_tagged], now=NOW
+    )
+
+    assert simulation.expired == [old_untagged]
+    assert simulation.retained == [new_untagged, old_tagged]
+
+
+def test_Given_more_prefixed_images_than_kept__When_simulated__Then_oldest_expired_and_not_counted_by_later_rules():
+    releases = [_image(days_ago=days_ago, tags=[f"release-{days_ago}"]) for days_ago in range(1, 5)]
+    other = _image(days_ago=50, tags=["main"])
+    expected_release_count = 2
+
+    simulation = simulate_lifecycle_policy(
+        EcrLifecycleConfig(
+            tag_prefix_rules=[EcrTagPrefixRetention(tag_prefixes=["release-"], keep_last=expected_release_count)],
+            keep_last=1,
+        ).to_rules(),
+        [*releases, other],
+        now=NOW,
+    )
+
+    assert {image.digest for image in simulation.expired} == {image.digest for image in releases[2:]}
+    assert len([image for image in simulation.retained if image.tags[0].startswith("release-")]) == (
+        expected_release_count
+    )
+    assert other in simulation.retained  # the only image left for the keep_last rule
+
+
+def test_Given_rule_with_several_prefixes__When_simulated__Then_only_images_matching_all_selected():
+    both = _image(days_ago=5, tags=["prod-1", "signed-1"])
+    only_prod = _image(days_ago=6, tags=["prod-2"])
+
+    simulation = simulate_lifecycle_policy(
+        [
+            EcrLifecycleRule(
+                description=str(uuid4()),
+                tag_status="tagged",
+                tag_prefixes=["prod-", "signed-"],
+                count_type="sinceImagePushed",
+                count_number=1,
+            )
+        ],
+        [both, only_prod],
+        now=NOW,
+    )
+
+    assert simulation.expired == [both]
+
+
+def test_Given_describe_images_output__When_parsed__Then_images_returned():
+    digest = f"sha256:{uuid4().hex}"
+
+    images = parse_describe_images(
+        {
+            "imageDetails": [
+                {"imageDigest": digest, "imageTags": ["v1"], "imagePushedAt": "2026-10-01T12:00:00+00:00"},
+                {"imageDigest": f"sha256:{uuid4().hex}", "imagePushedAt": "2026-10-02T12:00:00+00:00"},
+            ]
+        }
+    )
+
+    assert images[0].digest == digest
+    assert images[0].tags == ["v1"]
+    assert images[1].tags == []
@@ -0,0 +1,49 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import DuplicatePullThroughCachePrefixError
+from aws_central_infrastructure.artifact_stores.lib import InvalidPullThroughCacheSecretNameError
+from aws_central_infrastructure.artifact_stores.lib import PullThroughCacheConfig
+from aws_central_infrastructure.artifact_stores.lib import validate_pull_through_cache_configs
+
+
+def test_Given_distinct_prefixes_and_valid_secret__When_validated__Then_no_error():
+    validate_pull_through_cache_configs(
+        [
+            PullThroughCacheConfig(ecr_repository_prefix=str(uuid4()), upstream_registry_url="public.ecr.aws"),
+            PullThroughCacheConfig(
+                ecr_repository_prefix=str(uuid4()),
+                upstream_registry_url="ghcr.io",
+                credential_secret_name=f"ecr-pullthroughcache/{uuid4()}",
+            ),
+        ]
+    )
+
+
+def test_Given_prefix_used_twice__When_validated__Then_error():
+    prefix = str(uuid4())
+
+    with pytest.raises(DuplicatePullThroughCachePrefixError, match=prefix):
+        validate_pull_through_cache_configs(
+            [
+                PullThroughCacheConfig(ecr_repository_prefix=prefix, upstream_registry_url="public.ecr.aws"),
+                PullThroughCacheConfig(ecr_repository_prefix=prefix, upstream_registry_url="quay.io"),
+            ]
+        )
+
+
+def test_Given_secret_without_required_prefix__When_validated__Then_error():
+    secret_name = str(uuid4())
+
+    with pytest.raises(InvalidPullThroughCacheSecretNameError, match=secret_name):
+        validate_pull_through_cache_configs(
+            [
+                PullThroughCacheConfig(
+                    ecr_repository_prefix=str(uuid4()),
+                    upstream_registry_url="registry-1.docker.io",
+                    credential_secret_name=secret_name,
+                )
+            ]
+        )
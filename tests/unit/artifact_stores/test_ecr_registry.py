@@ -0,0 +1,68 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import ContinuousScanRequiresEnhancedScanningError
+from aws_central_infrastructure.artifact_stores.lib import EcrConfig
+from aws_central_infrastructure.artifact_stores.lib import TooManyScanningFiltersError
+from aws_central_infrastructure.artifact_stores.lib import plan_registry_scanning_rules
+from aws_central_infrastructure.artifact_stores.lib import plan_registry_signing_rules
+
+
+def test_Given_repos_with_and_without_scan_on_push__When_planned__Then_only_scanned_repos_in_rule():
+    rules = plan_registry_scanning_rules(
+        configs=[
+            EcrConfig(ecr_repo_name="scanned", ecr_repo_namespace="team"),
+            EcrConfig(ecr_repo_name="not-scanned", scan_on_push=False),
+        ],
+        scan_type="BASIC",
+    )
+
+    assert len(rules) == 1
+    assert rules[0].scan_frequency == "SCAN_ON_PUSH"
+    assert rules[0].ecr_repo_names == ["team/scanned"]
+
+
+def test_Given_continuous_scan_with_enhanced_scanning__When_planned__Then_separate_continuous_rule():
+    rules = plan_registry_scanning_rules(
+        configs=[EcrConfig(ecr_repo_name="on-push"), EcrConfig(ecr_repo_name="continuous", continuous_scan=True)],
+        scan_type="ENHANCED",
+    )
+
+    assert [(rule.scan_frequency, rule.ecr_repo_names) for rule in rules] == [
+        ("SCAN_ON_PUSH", ["on-push"]),
+        ("CONTINUOUS_SCAN", ["continuous"]),
+    ]
+
+
+def test_Given_continuous_scan_with_basic_scanning__When_planned__Then_error():
+    ecr_repo_name = str(uuid4())
+
+    with pytest.raises(ContinuousScanRequiresEnhancedScanningError, match=ecr_repo_name):
+        _ = plan_registry_scanning_rules(
+            configs=[EcrConfig(ecr_repo_name=ecr_repo_name, continuous_scan=True)], scan_type="BASIC"
+        )
+
+
+def test_Given_more_repos_than_filters_allowed__When_planned__Then_error():
+    with pytest.raises(TooManyScanningFiltersError, match="101"):
+        _ = plan_registry_scanning_rules(
+            configs=[EcrConfig(ecr_repo_name=str(uuid4())) for _ in range(101)], scan_type="BASIC"
+        )
+
+
+def test_Given_repos_sharing_signing_profile__When_planned__Then_one_rule_per_profile():
+    profile_arn = f"arn:aws:signer:us-east-1:123456789012:/signing-profiles/{uuid4().hex}"
+
+    rules = plan_registry_signing_rules(
+        [
+            EcrConfig(ecr_repo_name="b", signing_profile_arn=profile_arn),
+            EcrConfig(ecr_repo_name="a", signing_profile_arn=profile_arn),
+            EcrConfig(ecr_repo_name="unsigned"),
+        ]
+    )
+
+    assert len(rules) == 1
+    assert rules[0].signing_profile_arn == profile_arn
+    assert rules[0].ecr_repo_names == ["a", "b"]
@@ -0,0 +1,81 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import ROOT_CREATION_TEMPLATE_PREFIX
+from aws_central_infrastructure.artifact_stores.lib import EcrConfig
+from aws_central_infrastructure.artifact_stores.lib import InvalidReplicationRegionsError
+from aws_central_infrastructure.artifact_stores.lib import TooManyReplicationFiltersError
+from aws_central_infrastructure.artifact_stores.lib import plan_replication_filters
+from aws_central_infrastructure.artifact_stores.lib import plan_replication_template_prefixes
+from aws_central_infrastructure.artifact_stores.lib import validate_replication_regions
+
+
+def test_Given_repos_sharing_a_namespace__When_planned__Then_one_filter_per_namespace():
+    namespace = str(uuid4())
+
+    filters = plan_replication_filters(
+        [
+            EcrConfig(ecr_repo_name="backend", ecr_repo_namespace=namespace),
+            EcrConfig(ecr_repo_name="frontend", ecr_repo_namespace=namespace),
+        ]
+    )
+
+    assert filters == [f"{namespace}/"]
+
+
+def test_Given_repo_without_namespace__When_planned__Then_filtered_by_its_name():
+    filters = plan_replication_filters([EcrConfig(ecr_repo_name="manual-artifacts")])
+
+    assert filters == ["manual-artifacts"]
+
+
+def test_Given_repo_opted_out__When_planned__Then_not_replicated():
+    filters = plan_replication_filters(
+        [EcrConfig(ecr_repo_name="kept", replicate=False), EcrConfig(ecr_repo_name="replicated")]
+    )
+
+    assert filters == ["replicated"]
+
+
+def test_Given_prefix_covered_by_shorter_prefix__When_planned__Then_only_shorter_kept():
+    filters = plan_replication_filters(
+        [EcrConfig(ecr_repo_name="app"), EcrConfig(ecr_repo_name="backend", ecr_repo_namespace="app-team")]
+    )
+
+    assert filters == ["app"]
+
+
+def test_Given_too_many_distinct_namespaces__When_planned__Then_error():
+    with pytest.raises(TooManyReplicationFiltersError, match="101"):
+        _ = plan_replication_filters(
+            [EcrConfig(ecr_repo_name="repo", ecr_repo_namespace=f"{index:03}-{uuid4()}") for index in range(101)]
+        )
+
+
+def test_Given_namespace_collapsed_into_shorter_filter__When_templates_planned__Then_namespace_still_has_template():
+    configs = [
+        EcrConfig(ecr_repo_name="app"),
+        EcrConfig(ecr_repo_name="backend", ecr_repo_namespace="app-team"),
+        EcrConfig(ecr_repo_name="manual-artifacts"),
+        EcrConfig(ecr_repo_name="kept", ecr_repo_namespace="local-only", replicate=False),
+    ]
+
+    prefixes = plan_replication_template_prefixes(configs)
+
+    assert prefixes == ["app-team", ROOT_CREATION_TEMPLATE_PREFIX]
+
+
+def test_Given_only_namespaced_repos__When_templates_planned__Then_no_root_template():
+    namespace = str(uuid4())
+
+    prefixes = plan_replication_template_prefixes([EcrConfig(ecr_repo_name="backend", ecr_repo_namespace=namespace)])
+
+    assert prefixes == [namespace]
+
+
+@pytest.mark.parametrize("regions", [["us-east-1"], ["us-west-2", "us-west-2"]])
+def test_Given_home_or_duplicate_region__When_validated__Then_error(regions: list[str]):
+    with pytest.raises(InvalidReplicationRegionsError, match="us-east-1"):
+        validate_replication_regions(home_region="us-east-1", regions=regions)
@@ -0,0 +1,126 @@
+from collections.abc import Iterator
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import build_scan_findings_report
+from aws_central_infrastructure.artifact_stores.lib import collect_scan_findings
+from aws_central_infrastructure.artifact_stores.lib import summarize_image_scan_findings
+
+
+class _FakePaginator:
+    def __init__(self, pages_by_key: dict[str, list[dict[str, Any]]], key_from_kwargs: str):
+        self._pages_by_key = pages_by_key
+        self._key_from_kwargs = key_from_kwargs
+
+    def paginate(self, **kwargs: Any) -> Iterator[dict[str, Any]]:  # noqa: ANN401 # the same kwargs as boto3 paginators
+        key = kwargs["imageId"]["imageDigest"] if self._key_from_kwargs == "imageId" else kwargs["repositoryName"]
+        yield from self._pages_by_key.get(key, [])
+
+
+class _FakeEcrClient:
+    def __init__(
+        self,
+        *,
+        image_pages_by_repo: dict[str, list[dict[str, Any]]],
+        finding_pages_by_digest: dict[str, list[dict[str, Any]]],
+    ):
+        self._paginators = {
+            "describe_images": _FakePaginator(image_pages_by_repo, "repositoryName"),
+            "describe_image_scan_findings": _FakePaginator(finding_pages_by_digest, "imageId"),
+        }
+
+    def get_paginator(self, operation_name: str) -> _FakePaginator:
+        return self._paginators[operation_name]
+
+
+def _findings_page(*vulnerability_ids: str, severity_counts: dict[str, int]) -> dict[str, Any]:
+    return {
+        "imageScanStatus": {"status": "COMPLETE"},
+        "imageScanFindings": {
+            "findingSeverityCounts": severity_counts,
+            "findings": [{"name": vulnerability_id, "severity": "HIGH"} for vulnerability_id in vulnerability_ids],
+        },
+    }
+
+
+def test_Given_paged_basic_and_enhanced_findings__When_summarized__Then_distinct_ids_and_counts():
+    summary = summarize_image_scan_findings(
+        repository_name=str(uuid4()),
+        image_digest=str(uuid4()),
+        image_tags=[],
+        pages=[
+            _findings_page("CVE-1", "CVE-2", severity_counts={"HIGH": 3}),
+            {
+                "imageScanFindings": {
+                    "findingSeverityCounts": {"HIGH": 3},
+                    "enhancedFindings": [{"packageVulnerabilityDetails": {"vulnerabilityId": "CVE-1"}}],
+                }
+            },
+        ],
+    )
+
+    assert summary.scan_status == "COMPLETE"
+    assert summary.severity_counts == {"HIGH": 3}
+    assert summary.vulnerability_ids == ["CVE-1", "CVE-2"]
+
+
+def test_Given_repos_with_images__When_collected__Then_latest_images_summarized_and_report_aggregated():
+    now = datetime.now(tz=UTC)
+    repo_names = [str(uuid4()), str(uuid4())]
+    old_digest, new_digest, other_digest = (f"sha256:{uuid4().hex}" for _ in range(3))
+    client = _FakeEcrClient(
+        image_pages_by_repo={
+            repo_names[0]: [
+                {"imageDetails": [{"imageDigest": old_digest, "imagePushedAt": now - timedelta(days=3)}]},
+                {
+                    "imageDetails": [
+                        {
+                            "imageDigest": new_digest,
+                            "imageTags": ["v2"],
+                            "imagePushedAt": now,
+                            "imageScanStatus": {"status": "COMPLETE"},
+                        }
+                    ]
+                },
+            ],
+            repo_names[1]: [
+                {
+                    "imageDetails": [
+                        {"imageDigest": other_digest, "imagePushedAt": now, "imageScanStatus": {"status": "COMPLETE"}}
+                    ]
+                }
+            ],
+        },
+        finding_pages_by_digest={
+            new_digest: [_findings_page("CVE-1", severity_counts={"HIGH": 1})],
+            other_digest: [_findings_page("CVE-1", "CVE-2", severity_counts={"HIGH": 1, "LOW": 1})],
+        },
+    )
+
+    images = collect_scan_findings(client, repo_names, images_per_repo=1, max_workers=2)  # pyright: ignore[reportArgumentType] # a fake client
+    report = build_scan_findings_report(images)
+
+    assert [image.image_digest for image in images] == [new_digest, other_digest]
+    assert images[0].image_tags == ["v2"]
+    assert report.total_severity_counts == {"HIGH": 2, "LOW": 1}
+    assert report.top_vulnerabilities == [("CVE-1", 2), ("CVE-2", 1)]
+
+
+def test_Given_image_never_scanned__When_collected__Then_not_scanned_without_findings():
+    repo_name = str(uuid4())
+    digest = f"sha256:{uuid4().hex}"
+    client = _FakeEcrClient(
+        image_pages_by_repo={
+            repo_name: [{"imageDetails": [{"imageDigest": digest, "imagePushedAt": datetime.now(tz=UTC)}]}]
+        },
+        finding_pages_by_digest={digest: [_findings_page("CVE-1", severity_counts={"HIGH": 1})]},
+    )
+
+    images = collect_scan_findings(client, [repo_name])  # pyright: ignore[reportArgumentType] # a fake client
+
+    assert images[0].scan_status == "NOT_SCANNED"
+    assert images[0].vulnerability_ids == []
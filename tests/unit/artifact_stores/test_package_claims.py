@@ -0,0 +1,61 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.artifact_stores.lib import DuplicateRepoPackageClaimsError
+from aws_central_infrastructure.artifact_stores.lib import PackageClaimsIndex
+from aws_central_infrastructure.artifact_stores.lib import RepoPackageClaims
+from aws_central_infrastructure.artifact_stores.lib import get_package_claims_index
+from aws_central_infrastructure.iac_management.lib import CENTRAL_INFRA_GITHUB_ORG_NAME
+
+
+def test_Given_claims__When_indexed__Then_looked_up_by_repo_name():
+    repo_names = [str(uuid4()) for _ in range(3)]
+    claims = [RepoPackageClaims(repo_name=repo_name, pypi_package_names={repo_name}) for repo_name in repo_names]
+
+    index = PackageClaimsIndex(claims)
+
+    assert (CENTRAL_INFRA_GITHUB_ORG_NAME, repo_names[1]) in index
+    assert repo_names[1] not in index
+    assert index.get(repo_names[1]) is claims[1]
+    assert index.get(str(uuid4())) is None
+    assert index.claims == claims
+
+
+def test_Given_same_repo_name_in_two_orgs__When_indexed__Then_both_kept():
+    repo_name = str(uuid4())
+    other_org = str(uuid4())
+    claims = RepoPackageClaims(repo_name=repo_name)
+    other_org_claims = RepoPackageClaims(repo_name=repo_name, repo_org=other_org)
+
+    index = PackageClaimsIndex([claims, other_org_claims])
+
+    assert index.get(repo_name) is claims
+    assert index.get(repo_name, repo_org=other_org) is other_org_claims
+    assert (other_org, repo_name) in index
+
+
+def test_Given_repo_claimed_twice__When_indexed__Then_error():
+    repo_name = str(uuid4())
+
+    with pytest.raises(DuplicateRepoPackageClaimsError, match=repo_name):
+        _ = PackageClaimsIndex([RepoPackageClaims(repo_name=repo_name), RepoPackageClaims(repo_name=repo_name)])
+
+
+def test_Given_claims_for_unmanaged_repos__When_checked__Then_only_repos_in_this_org_reported():
+    known_repo_name = str(uuid4())
+    unknown_repo_name = str(uuid4())
+    index = PackageClaimsIndex(
+        [
+            RepoPackageClaims(repo_name=known_repo_name),
+            RepoPackageClaims(repo_name=unknown_repo_name),
+            RepoPackageClaims(repo_name=str(uuid4()), repo_org=str(uuid4())),
+        ]
+    )
+
+    assert index.warn_about_unknown_repos([known_repo_name]) == [unknown_repo_name]
+
+
+def test_When_index_requested_twice__Then_built_once():
+    assert get_package_claims_index() is get_package_claims_index()
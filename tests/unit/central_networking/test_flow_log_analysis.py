@@ -0,0 +1,145 @@
+import gzip
+from pathlib import Path
+
+import pyarrow as pa
+from pyarrow import parquet
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import FLOW_LOG_FIELDS
+from aws_central_infrastructure.central_networking.lib import FlowLogAggregator
+from aws_central_infrastructure.central_networking.lib import iter_text_flow_log_records
+from aws_central_infrastructure.central_networking.lib import summarize_flow_logs
+
+
+def _flow_log_line(  # noqa: PLR0913 # this is a lot of arguments, but they're all kwargs
+    *,
+    subnet_id: str,
+    srcaddr: str,
+    dstaddr: str,
+    num_bytes: int,
+    action: str = "ACCEPT",
+    pkt_srcaddr: str = "-",
+    pkt_dstaddr: str = "-",
+) -> str:
+    values = {
+        "version": "5",
+        "account-id": "123456789012",
+        "interface-id": "eni-0123",
+        "srcaddr": srcaddr,
+        "dstaddr": dstaddr,
+        "srcport": "443",
+        "dstport": "50000",
+        "protocol": "6",
+        "packets": "10",
+        "bytes": str(num_bytes),
+        "start": "1760000000",
+        "end": "1760000060",
+        "action": action,
+        "log-status": "OK",
+        "vpc-id": "vpc-0123",
+        "subnet-id": subnet_id,
+        "az-id": "use1-az1",
+        "flow-direction": "egress",
+        "pkt-srcaddr": pkt_srcaddr,
+        "pkt-dstaddr": pkt_dstaddr,
+        "traffic-path": "8",
+    }
+    return " ".join(values[field] for field in FLOW_LOG_FIELDS)
+
+
+def _write_sample(path: Path, lines: list[str]) -> Path:
+    content = "\n".join([" ".join(FLOW_LOG_FIELDS), *lines]) + "\n"
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt") as file:
+            _ = file.write(content)
+    else:
+        _ = path.write_text(content)
+    return path
+
+
+def test_Given_text_flow_log__When_read__Then_fields_use_underscores_and_dashes_are_none(tmp_path: Path):
+    path = _write_sample(
+        tmp_path / "sample.log",
+        [_flow_log_line(subnet_id="subnet-a", srcaddr="10.0.1.5", dstaddr="1.1.1.1", num_bytes=7)],
+    )
+
+    records = list(iter_text_flow_log_records(path))
+
+    assert len(records) == 1
+    assert records[0]["subnet_id"] == "subnet-a"
+    assert records[0]["pkt_srcaddr"] is None
+
+
+def test_Given_sample_files__When_summarized__Then_bytes_aggregated_per_talker_and_subnet_destination(tmp_path: Path):
+    _ = _write_sample(
+        tmp_path / "hour-01.log.gz",
+        [
+            _flow_log_line(subnet_id="subnet-a", srcaddr="10.0.1.5", dstaddr="1.1.1.1", num_bytes=100),
+            _flow_log_line(subnet_id="subnet-a", srcaddr="10.0.1.5", dstaddr="1.1.1.1", num_bytes=50),
+            _flow_log_line(subnet_id="subnet-b", srcaddr="10.0.2.5", dstaddr="1.1.1.1", num_bytes=20),
+        ],
+    )
+    (tmp_path / "nested").mkdir()
+    _ = _write_sample(
+        tmp_path / "nested" / "hour-02.log",
+        [
+            _flow_log_line(subnet_id="subnet-b", srcaddr="10.0.2.5", dstaddr="8.8.8.8", num_bytes=500),
+            _flow_log_line(subnet_id="subnet-b", srcaddr="10.0.2.5", dstaddr="8.8.8.8", num_bytes=999, action="REJECT"),
+        ],
+    )
+
+    expected_record_count = 5
+    expected_accepted_bytes = 100 + 50 + 20 + 500
+
+    summary = summarize_flow_logs([tmp_path], top=2)
+
+    assert summary.record_count == expected_record_count
+    assert summary.total_bytes == expected_accepted_bytes
+    assert [(total.key, total.bytes) for total in summary.top_talkers] == [
+        (("10.0.2.5", "8.8.8.8"), 500),
+        (("10.0.1.5", "1.1.1.1"), 150),
+    ]
+    assert [(total.key, total.bytes) for total in summary.top_subnet_destinations] == [
+        (("subnet-b", "8.8.8.8"), 500),
+        (("subnet-a", "1.1.1.1"), 150),
+    ]
+
+
+def test_Given_traffic_through_nat__When_aggregated__Then_attributed_to_original_packet_addresses():
+    aggregator = FlowLogAggregator()
+
+    aggregator.add(
+        {
+            "srcaddr": "10.0.1.4",  # the NAT gateway's interface
+            "dstaddr": "1.1.1.1",
+            "pkt_srcaddr": "10.0.3.9",  # the instance behind it
+            "pkt_dstaddr": "1.1.1.1",
+            "subnet_id": "subnet-public",
+            "bytes": 42,
+            "action": "ACCEPT",
+        }
+    )
+
+    assert aggregator.summarize().top_talkers[0].key == ("10.0.3.9", "1.1.1.1")
+
+
+def test_Given_parquet_file__When_summarized__Then_same_totals_as_text(tmp_path: Path):
+    table = pa.table(
+        {
+            "srcaddr": ["10.0.1.5", "10.0.1.5"],
+            "dstaddr": ["1.1.1.1", "1.1.1.1"],
+            "pkt_srcaddr": [None, None],
+            "pkt_dstaddr": [None, None],
+            "subnet_id": ["subnet-a", "subnet-a"],
+            "bytes": [100, 50],
+            "action": ["ACCEPT", "ACCEPT"],
+        }
+    )
+    parquet.write_table(table, tmp_path / "hour-01.parquet")
+
+    expected_bytes = 100 + 50
+
+    summary = summarize_flow_logs([tmp_path])
+
+    assert summary.total_bytes == expected_bytes
+    assert summary.top_subnet_destinations[0].key == ("subnet-a", "1.1.1.1")
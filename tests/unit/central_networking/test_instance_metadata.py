@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import InvalidConcurrencyBudgetError
+from aws_central_infrastructure.central_networking.lib import plan_concurrency_lanes
+
+
+def test_Given_fewer_operations_than_budget__When_planned__Then_all_start_right_away():
+    budget = random.randint(5, 10)
+
+    lanes = plan_concurrency_lanes(budget - 1, budget=budget)
+
+    assert lanes == [None] * (budget - 1)
+
+
+def test_Given_more_operations_than_budget__When_planned__Then_each_waits_for_the_one_a_budget_earlier():
+    lanes = plan_concurrency_lanes(7, budget=3)
+
+    assert lanes == [None, None, None, 0, 1, 2, 3]
+
+
+def test_Given_operations__When_planned__Then_never_more_in_flight_than_budget():
+    budget = random.randint(1, 5)
+    count = random.randint(10, 30)
+
+    lanes = plan_concurrency_lanes(count, budget=budget)
+
+    assert lanes.count(None) == budget
+    assert all(wait_for is None or index - wait_for == budget for index, wait_for in enumerate(lanes))
+
+
+@pytest.mark.parametrize("budget", [0, -1])
+def test_Given_budget_below_one__When_planned__Then_error(budget: int):
+    with pytest.raises(InvalidConcurrencyBudgetError, match=str(budget)):
+        _ = plan_concurrency_lanes(3, budget=budget)
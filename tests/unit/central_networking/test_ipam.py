@@ -0,0 +1,184 @@
+import itertools
+from ipaddress import IPv4Network
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import CidrAllocations
+from aws_central_infrastructure.central_networking.lib import CidrBlockConflictError
+from aws_central_infrastructure.central_networking.lib import CidrBlockIndex
+from aws_central_infrastructure.central_networking.lib import CidrBlockOutsideVpcError
+from aws_central_infrastructure.central_networking.lib import SubnetCidrRequest
+from aws_central_infrastructure.central_networking.lib import SubnetSize
+from aws_central_infrastructure.central_networking.lib import VpcAddressSpaceExhaustedError
+from aws_central_infrastructure.central_networking.lib import VpcIpv6SubnetsExhaustedError
+from aws_central_infrastructure.central_networking.lib import find_uncommitted_subnets
+from aws_central_infrastructure.central_networking.lib import ipv6_subnet_cidr_block
+from aws_central_infrastructure.central_networking.lib import plan_ipv6_subnet_indexes
+from aws_central_infrastructure.central_networking.lib import plan_subnet_cidr_blocks
+
+
+class TestCidrBlockIndex:
+    def test_Given_overlapping_block__When_added__Then_error_names_existing_owner(self):
+        index = CidrBlockIndex("10.0.0.0/16")
+        existing_owner = str(uuid4())
+        _ = index.add(owner=existing_owner, cidr_block="10.0.1.0/24")
+
+        with pytest.raises(CidrBlockConflictError, match=existing_owner):
+            _ = index.add(owner=str(uuid4()), cidr_block="10.0.1.16/28")
+
+    def test_Given_block_outside_vpc__When_added__Then_error(self):
+        index = CidrBlockIndex("10.0.0.0/16")
+        owner = str(uuid4())
+
+        with pytest.raises(CidrBlockOutsideVpcError, match=owner):
+            _ = index.add(owner=owner, cidr_block="10.1.0.0/28")
+
+    def test_Given_gaps__When_allocated__Then_lowest_aligned_free_block_used(self):
+        index = CidrBlockIndex("10.0.0.0/16")
+        _ = index.add(owner=str(uuid4()), cidr_block="10.0.0.0/28")
+        _ = index.add(owner=str(uuid4()), cidr_block="10.0.0.64/26")
+
+        small = index.allocate(owner=str(uuid4()), prefix_length=SubnetSize.ADDRESSES_16)
+        medium = index.allocate(owner=str(uuid4()), prefix_length=SubnetSize.ADDRESSES_32)
+        large = index.allocate(owner=str(uuid4()), prefix_length=SubnetSize.ADDRESSES_64)
+
+        assert small == IPv4Network("10.0.0.16/28")
+        assert medium == IPv4Network("10.0.0.32/27")
+        assert large == IPv4Network("10.0.0.128/26")
+
+    def test_Given_full_vpc__When_allocated__Then_error(self):
+        index = CidrBlockIndex("10.0.0.0/27")
+        _ = index.add(owner=str(uuid4()), cidr_block="10.0.0.0/28")
+        _ = index.allocate(owner=str(uuid4()), prefix_length=SubnetSize.ADDRESSES_16)
+        owner = str(uuid4())
+
+        with pytest.raises(VpcAddressSpaceExhaustedError, match=owner):
+            _ = index.allocate(owner=owner, prefix_length=SubnetSize.ADDRESSES_16)
+
+    def test_Given_hundreds_of_subnets__When_allocated__Then_none_overlap(self):
+        index = CidrBlockIndex("10.0.0.0/16")
+        sizes = [SubnetSize.ADDRESSES_16, SubnetSize.ADDRESSES_64, SubnetSize.ADDRESSES_32, SubnetSize.ADDRESSES_256]
+        expected_subnet_count = 400
+
+        networks = [
+            index.allocate(owner=str(i), prefix_length=sizes[i % len(sizes)]) for i in range(expected_subnet_count)
+        ]
+
+        assert len(index) == expected_subnet_count
+        ordered = sorted(networks)
+        assert all(not first.overlaps(second) for first, second in itertools.pairwise(ordered))
+
+
+class TestPlanSubnetCidrBlocks:
+    def test_Given_previous_allocations__When_subnet_added_before_them__Then_existing_blocks_do_not_move(self):
+        vpc_name = str(uuid4())
+        first = SubnetCidrRequest(vpc_name=vpc_name, subnet_name="first", size=SubnetSize.ADDRESSES_64)
+        second = SubnetCidrRequest(vpc_name=vpc_name, subnet_name="second")
+        previous = plan_subnet_cidr_blocks(
+            vpc_cidr_blocks={vpc_name: "10.0.0.0/16"}, requests=[first, second], previous=CidrAllocations()
+        )
+        added = SubnetCidrRequest(vpc_name=vpc_name, subnet_name="added", size=SubnetSize.ADDRESSES_16)
+
+        allocations = plan_subnet_cidr_blocks(
+            vpc_cidr_blocks={vpc_name: "10.0.0.0/16"}, requests=[added, first, second], previous=previous
+        )
+
+        assert allocations.vpcs[vpc_name]["first"] == previous.vpcs[vpc_name]["first"]
+        assert allocations.vpcs[vpc_name]["second"] == previous.vpcs[vpc_name]["second"]
+        assert allocations.vpcs[vpc_name]["added"] == "10.0.0.80/28"
+
+    def test_Given_explicit_blocks_conflicting__When_planned__Then_error(self):
+        vpc_name = str(uuid4())
+        conflicting_subnet_name = str(uuid4())
+
+        with pytest.raises(CidrBlockConflictError, match=conflicting_subnet_name):
+            _ = plan_subnet_cidr_blocks(
+                vpc_cidr_blocks={vpc_name: "10.0.0.0/16"},
+                requests=[
+                    SubnetCidrRequest(vpc_name=vpc_name, subnet_name=str(uuid4()), cidr_block="10.0.1.0/28"),
+                    SubnetCidrRequest(vpc_name=vpc_name, subnet_name=conflicting_subnet_name, cidr_block="10.0.0.0/23"),
+                ],
+                previous=CidrAllocations(),
+            )
+
+    def test_Given_removed_subnet__When_planned__Then_dropped_from_allocations(self):
+        vpc_name = str(uuid4())
+        previous = CidrAllocations(vpcs={vpc_name: {"removed": "10.0.0.0/28"}})
+
+        allocations = plan_subnet_cidr_blocks(
+            vpc_cidr_blocks={vpc_name: "10.0.0.0/16"},
+            requests=[SubnetCidrRequest(vpc_name=vpc_name, subnet_name="kept")],
+            previous=previous,
+        )
+
+        assert allocations.vpcs == {vpc_name: {"kept": "10.0.0.0/28"}}
+
+
+class TestFindUncommittedSubnets:
+    def test_Given_new_and_committed_subnets__When_checked__Then_only_newly_allocated_ones_reported(self):
+        vpc_name = str(uuid4())
+        committed = SubnetCidrRequest(vpc_name=vpc_name, subnet_name="committed")
+        explicit = SubnetCidrRequest(vpc_name=vpc_name, subnet_name="explicit", cidr_block="10.0.1.0/28")
+        added = SubnetCidrRequest(vpc_name=vpc_name, subnet_name="added")
+        added_ipv6 = SubnetCidrRequest(vpc_name=vpc_name, subnet_name="committed-ipv4", ipv6=True)
+        previous = plan_subnet_cidr_blocks(
+            vpc_cidr_blocks={vpc_name: "10.0.0.0/16"},
+            requests=[committed, added_ipv6.model_copy(update={"ipv6": False})],
+            previous=CidrAllocations(),
+        )
+        requests = [committed, explicit, added, added_ipv6]
+
+        uncommitted = find_uncommitted_subnets(
+            requests=requests,
+            allocations=plan_subnet_cidr_blocks(
+                vpc_cidr_blocks={vpc_name: "10.0.0.0/16"}, requests=requests, previous=previous
+            ),
+            previous=previous,
+        )
+
+        assert uncommitted == [f"{vpc_name}/added", f"{vpc_name}/committed-ipv4"]
+
+
+class TestIpv6SubnetIndexes:
+    def test_Given_previous_index__When_planned__Then_kept_and_new_subnet_takes_lowest_free_index(self):
+        vpc_name = str(uuid4())
+        existing = SubnetCidrRequest(vpc_name=vpc_name, subnet_name=str(uuid4()), ipv6=True)
+        added = SubnetCidrRequest(vpc_name=vpc_name, subnet_name=str(uuid4()), ipv6=True)
+        existing_index = 3
+
+        indexes = plan_ipv6_subnet_indexes(
+            requests=[added, existing], previous={vpc_name: {existing.subnet_name: existing_index}}
+        )
+
+        assert indexes == {vpc_name: {existing.subnet_name: existing_index, added.subnet_name: 0}}
+
+    def test_Given_all_indexes_used__When_planned__Then_error(self):
+        vpc_name = str(uuid4())
+        subnet_name = str(uuid4())
+        previous = {vpc_name: {str(index): index for index in range(256)}}
+        requests = [SubnetCidrRequest(vpc_name=vpc_name, subnet_name=name, ipv6=True) for name in previous[vpc_name]]
+
+        with pytest.raises(VpcIpv6SubnetsExhaustedError, match=subnet_name):
+            _ = plan_ipv6_subnet_indexes(
+                requests=[*requests, SubnetCidrRequest(vpc_name=vpc_name, subnet_name=subnet_name, ipv6=True)],
+                previous=previous,
+            )
+
+    def test_Given_index__When_cidr_block_computed__Then_nth_slash_64_of_vpc_block(self):
+        assert (
+            ipv6_subnet_cidr_block(vpc_ipv6_cidr_block="2600:1f18:abcd:ef00::/56", index=10)
+            == "2600:1f18:abcd:ef0a::/64"
+        )
+
+    def test_Given_ipv4_only_requests__When_planned__Then_no_ipv6_indexes(self):
+        vpc_name = str(uuid4())
+
+        allocations = plan_subnet_cidr_blocks(
+            vpc_cidr_blocks={vpc_name: "10.0.0.0/16"},
+            requests=[SubnetCidrRequest(vpc_name=vpc_name, subnet_name=str(uuid4()))],
+            previous=CidrAllocations(),
+        )
+
+        assert allocations.ipv6_subnet_indexes == {}
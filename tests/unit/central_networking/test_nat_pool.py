@@ -0,0 +1,64 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import NatGatewayNotInAvailabilityZoneError
+from aws_central_infrastructure.central_networking.lib import NatGatewayPool
+from aws_central_infrastructure.central_networking.lib import NatGatewayPoolEmptyError
+from aws_central_infrastructure.central_networking.lib import select_nat_availability_zone
+
+
+def test_Given_nat_in_same_az__When_selected__Then_same_az_used():
+    selected = select_nat_availability_zone(
+        pool_name=str(uuid4()),
+        availability_zone_id="use1-az2",
+        available_availability_zone_ids=["use1-az4", "use1-az2", "use1-az1"],
+        allow_cross_az=True,
+    )
+
+    assert selected == "use1-az2"
+
+
+def test_Given_no_nat_in_az_and_cross_az_allowed__When_selected__Then_first_sorted_az_used():
+    selected = select_nat_availability_zone(
+        pool_name=str(uuid4()),
+        availability_zone_id="use1-az6",
+        available_availability_zone_ids=["use1-az4", "use1-az2"],
+        allow_cross_az=True,
+    )
+
+    assert selected == "use1-az2"
+
+
+def test_Given_no_nat_in_az_and_cross_az_not_allowed__When_selected__Then_error():
+    pool_name = str(uuid4())
+
+    with pytest.raises(NatGatewayNotInAvailabilityZoneError, match=f"{pool_name}.*use1-az6"):
+        _ = select_nat_availability_zone(
+            pool_name=pool_name,
+            availability_zone_id="use1-az6",
+            available_availability_zone_ids=["use1-az4"],
+            allow_cross_az=False,
+        )
+
+
+def test_Given_empty_pool__When_selected__Then_error():
+    pool_name = str(uuid4())
+
+    with pytest.raises(NatGatewayPoolEmptyError, match=pool_name):
+        _ = select_nat_availability_zone(
+            pool_name=pool_name,
+            availability_zone_id="use1-az1",
+            available_availability_zone_ids=[],
+            allow_cross_az=True,
+        )
+
+
+def test_Given_nats_added_from_standalone_subnets__When_pool_selected__Then_nat_in_same_az_used():
+    pool = NatGatewayPool(str(uuid4()))
+    nat_gateways = {"use1-az1": object(), "use1-az2": object()}  # stand-ins for the NAT gateway resources
+    for availability_zone_id, nat_gateway in nat_gateways.items():
+        pool.add(availability_zone_id=availability_zone_id, nat_gateway=nat_gateway)  # pyright: ignore[reportArgumentType] # a stand-in
+
+    assert pool.select(availability_zone_id="use1-az2") is nat_gateways["use1-az2"]
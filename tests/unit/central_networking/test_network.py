@@ -0,0 +1,33 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import NatGatewayPool
+from aws_central_infrastructure.central_networking.lib import NatPoolWithoutNatError
+from aws_central_infrastructure.central_networking.lib import SharedSubnetConfig
+from aws_central_infrastructure.central_networking.lib import ram_share_principals_key
+from aws_central_infrastructure.central_networking.lib import validate_subnet_config
+
+
+def test_Given_same_principals_in_different_order__When_keyed__Then_same_share():
+    principals = [str(uuid4()), str(uuid4()), str(uuid4())]
+
+    assert ram_share_principals_key(principals) == ram_share_principals_key([*reversed(principals), principals[0]])
+
+
+def test_Given_different_principals__When_keyed__Then_different_shares():
+    shared_principal = str(uuid4())
+
+    assert ram_share_principals_key([shared_principal]) != ram_share_principals_key([shared_principal, str(uuid4())])
+
+
+def test_Given_subnet_adding_to_pool_without_creating_nat__When_validated__Then_error():
+    pool = NatGatewayPool(str(uuid4()))
+    # the VPC is a Pulumi resource, so skip validation rather than creating one
+    config = SharedSubnetConfig.model_construct(
+        name=str(uuid4()), vpc=None, cidr_block="10.0.0.0/28", accounts_to_share_to=["all"], add_nat_to_pool=pool
+    )
+
+    with pytest.raises(NatPoolWithoutNatError, match=pool.name):
+        validate_subnet_config(config)
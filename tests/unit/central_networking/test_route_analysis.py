@@ -0,0 +1,109 @@
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import EgressHubConfig
+from aws_central_infrastructure.central_networking.lib import SubnetDefaultRoute
+from aws_central_infrastructure.central_networking.lib import TransitGatewayVpcAttachmentConfig
+from aws_central_infrastructure.central_networking.lib import analyze_reachability
+
+VPC_NAME = "generic"
+
+
+def _route(name: str, **kwargs: object) -> SubnetDefaultRoute:
+    return SubnetDefaultRoute.model_validate(
+        {"subnet_name": name, "vpc_name": VPC_NAME, "availability_zone_id": "use1-az1", "target": "none", **kwargs}
+    )
+
+
+def test_Given_private_subnet_routing_to_nat_in_public_subnet__When_analyzed__Then_reaches_internet_via_that_nat():
+    results = analyze_reachability(
+        [
+            _route("public", target="internet_gateway", hosts_nat=True),
+            _route("private", target="nat_gateway", nat_subnet_name="public"),
+        ]
+    )
+
+    assert results["private"].reaches_internet is True
+    assert results["private"].via_nat_subnet_name == "public"
+    assert results["public"].reaches_internet is True
+    assert results["public"].via_nat_subnet_name is None
+
+
+def test_Given_nat_in_subnet_without_internet_route__When_analyzed__Then_blackhole():
+    results = analyze_reachability(
+        [
+            _route("nat-host", hosts_nat=True),
+            _route("private", target="nat_gateway", nat_subnet_name="nat-host"),
+        ]
+    )
+
+    assert results["private"].reaches_internet is False
+    assert results["private"].blackhole_reason == "routes through nat-host, which has no default route"
+    assert results["nat-host"].blackhole_reason is None  # isolated on purpose
+
+
+def test_Given_route_to_nat_in_another_vpc__When_analyzed__Then_blackhole():
+    results = analyze_reachability(
+        [
+            _route("public", target="internet_gateway", hosts_nat=True, vpc_name=str(uuid4())),
+            _route("private", target="nat_gateway", nat_subnet_name="public"),
+        ]
+    )
+
+    assert results["private"].blackhole_reason is not None
+    assert "another VPC" in results["private"].blackhole_reason
+
+
+def test_Given_spoke_subnet__When_analyzed__Then_reaches_internet_through_egress_vpc_nat_in_same_az():
+    spoke_vpc_name = str(uuid4())
+    egress_vpc_name = str(uuid4())
+    hub = EgressHubConfig(
+        name=str(uuid4()),
+        egress=TransitGatewayVpcAttachmentConfig(vpc_name=egress_vpc_name, subnet_names=["tgw-az1", "tgw-az2"]),
+        egress_return_route_subnet_names=["public-az1", "public-az2"],
+        spokes=[TransitGatewayVpcAttachmentConfig(vpc_name=spoke_vpc_name, subnet_names=["spoke-tgw"])],
+    )
+    routes = [
+        _route("public-az1", vpc_name=egress_vpc_name, target="internet_gateway", hosts_nat=True),
+        _route(
+            "public-az2",
+            vpc_name=egress_vpc_name,
+            target="internet_gateway",
+            hosts_nat=True,
+            availability_zone_id="use1-az2",
+        ),
+        _route("tgw-az1", vpc_name=egress_vpc_name, target="nat_gateway", nat_subnet_name="public-az1"),
+        _route(
+            "tgw-az2",
+            vpc_name=egress_vpc_name,
+            target="nat_gateway",
+            nat_subnet_name="public-az2",
+            availability_zone_id="use1-az2",
+        ),
+        _route("workload", vpc_name=spoke_vpc_name, target="transit_gateway", availability_zone_id="use1-az2"),
+    ]
+
+    results = analyze_reachability(routes, [hub])
+
+    assert results["workload"].reaches_internet is True
+    assert results["workload"].via_nat_subnet_name == "public-az2"
+
+
+def test_Given_transit_gateway_route_in_vpc_without_hub__When_analyzed__Then_blackhole():
+    results = analyze_reachability([_route("workload", target="transit_gateway")])
+
+    assert results["workload"].blackhole_reason is not None
+    assert "not a spoke" in results["workload"].blackhole_reason
+
+
+def test_Given_long_chain__When_analyzed__Then_every_subnet_resolves_to_the_same_exit():
+    chain_length = 50
+    routes = [_route("0", target="internet_gateway", hosts_nat=True)]
+    routes.extend(
+        _route(str(index), target="nat_gateway", nat_subnet_name=str(index - 1), hosts_nat=True)
+        for index in range(1, chain_length)
+    )
+
+    results = analyze_reachability(routes)
+
+    assert all(result.reaches_internet and result.egress_subnet_name == "0" for result in results.values())
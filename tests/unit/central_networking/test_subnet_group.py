@@ -0,0 +1,57 @@
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import SharedSubnetGroupConfig
+from aws_central_infrastructure.central_networking.lib import SubnetSize
+from aws_central_infrastructure.central_networking.lib import UnknownNatSubnetGroupError
+from aws_central_infrastructure.central_networking.lib import validate_subnet_group_nat_references
+
+
+def _group_config(**kwargs: Any) -> SharedSubnetGroupConfig:  # noqa: ANN401 # passthrough to the config
+    # the VPC is a Pulumi resource, so skip validation rather than creating one
+    return SharedSubnetGroupConfig.model_construct(
+        **{
+            "name": str(uuid4()),
+            "vpc": None,
+            "availability_zone_ids": ["use1-az1", "use1-az2", "use1-az4"],
+            "cidr_block": None,
+            "size": SubnetSize.ADDRESSES_16,
+            "accounts_to_share_to": ["all"],
+            **kwargs,
+        }
+    )
+
+
+def test_Given_group_cidr_block_and_three_azs__When_split__Then_each_az_gets_a_quarter():
+    config = _group_config(cidr_block="10.0.4.0/24")
+
+    assert config.split_cidr_block() == ["10.0.4.0/26", "10.0.4.64/26", "10.0.4.128/26"]
+
+
+def test_Given_no_group_cidr_block__When_split__Then_each_az_allocated_later():
+    config = _group_config()
+
+    assert config.split_cidr_block() == [None, None, None]
+
+
+def test_Given_nat_group_defined_earlier__When_validated__Then_no_error():
+    nat_group = _group_config(create_nat=True)
+
+    validate_subnet_group_nat_references([nat_group, _group_config(route_to_nat_gateways_of=nat_group.name)])
+
+
+def test_Given_nat_group_not_defined__When_validated__Then_error():
+    nat_group_name = str(uuid4())
+
+    with pytest.raises(UnknownNatSubnetGroupError, match=nat_group_name):
+        validate_subnet_group_nat_references([_group_config(route_to_nat_gateways_of=nat_group_name)])
+
+
+def test_Given_nat_group_defined_later__When_validated__Then_error():
+    nat_group = _group_config(create_nat=True)
+
+    with pytest.raises(UnknownNatSubnetGroupError, match=nat_group.name):
+        validate_subnet_group_nat_references([_group_config(route_to_nat_gateways_of=nat_group.name), nat_group])
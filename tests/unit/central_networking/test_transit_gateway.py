@@ -0,0 +1,68 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import EgressHubConfig
+from aws_central_infrastructure.central_networking.lib import HubVpcAttachedTwiceError
+from aws_central_infrastructure.central_networking.lib import HubVpcCidrOverlapError
+from aws_central_infrastructure.central_networking.lib import TransitGatewayVpcAttachmentConfig
+from aws_central_infrastructure.central_networking.lib import UnknownHubVpcError
+from aws_central_infrastructure.central_networking.lib import plan_egress_hub_return_routes
+
+
+def _hub_config(*, egress_vpc_name: str, spoke_vpc_names: list[str]) -> EgressHubConfig:
+    return EgressHubConfig(
+        name=str(uuid4()),
+        egress=TransitGatewayVpcAttachmentConfig(vpc_name=egress_vpc_name, subnet_names=[str(uuid4())]),
+        egress_return_route_subnet_names=[str(uuid4())],
+        spokes=[
+            TransitGatewayVpcAttachmentConfig(vpc_name=vpc_name, subnet_names=[str(uuid4())])
+            for vpc_name in spoke_vpc_names
+        ],
+    )
+
+
+def test_Given_disjoint_vpcs__When_planned__Then_return_routes_to_each_spoke():
+    egress_vpc_name = str(uuid4())
+    spoke_vpc_names = [str(uuid4()), str(uuid4())]
+    config = _hub_config(egress_vpc_name=egress_vpc_name, spoke_vpc_names=spoke_vpc_names)
+
+    return_routes = plan_egress_hub_return_routes(
+        config=config,
+        vpc_cidr_blocks={
+            egress_vpc_name: "10.0.0.0/16",
+            spoke_vpc_names[0]: "10.1.0.0/16",
+            spoke_vpc_names[1]: "10.2.0.0/16",
+        },
+    )
+
+    assert return_routes == ["10.1.0.0/16", "10.2.0.0/16"]
+
+
+def test_Given_overlapping_vpcs__When_planned__Then_error():
+    egress_vpc_name = str(uuid4())
+    spoke_vpc_name = str(uuid4())
+    config = _hub_config(egress_vpc_name=egress_vpc_name, spoke_vpc_names=[spoke_vpc_name])
+
+    with pytest.raises(HubVpcCidrOverlapError, match=f"{spoke_vpc_name}.*overlaps {egress_vpc_name}"):
+        _ = plan_egress_hub_return_routes(
+            config=config, vpc_cidr_blocks={egress_vpc_name: "10.0.0.0/16", spoke_vpc_name: "10.0.128.0/17"}
+        )
+
+
+def test_Given_unknown_vpc__When_planned__Then_error():
+    egress_vpc_name = str(uuid4())
+    spoke_vpc_name = str(uuid4())
+    config = _hub_config(egress_vpc_name=egress_vpc_name, spoke_vpc_names=[spoke_vpc_name])
+
+    with pytest.raises(UnknownHubVpcError, match=spoke_vpc_name):
+        _ = plan_egress_hub_return_routes(config=config, vpc_cidr_blocks={egress_vpc_name: "10.0.0.0/16"})
+
+
+def test_Given_vpc_attached_twice__When_planned__Then_error():
+    egress_vpc_name = str(uuid4())
+    config = _hub_config(egress_vpc_name=egress_vpc_name, spoke_vpc_names=[egress_vpc_name])
+
+    with pytest.raises(HubVpcAttachedTwiceError, match=egress_vpc_name):
+        _ = plan_egress_hub_return_routes(config=config, vpc_cidr_blocks={egress_vpc_name: "10.0.0.0/16"})
@@ -0,0 +1,49 @@
+from uuid import uuid4
+
+import pytest
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.central_networking.lib import InterfaceEndpointSubnetsError
+from aws_central_infrastructure.central_networking.lib import VpcEndpointsConfig
+from aws_central_infrastructure.central_networking.lib import validate_interface_endpoint_subnets
+
+
+def test_When_default_config__Then_s3_and_ecr_endpoints_included():
+    config = VpcEndpointsConfig()
+
+    assert "s3" in config.gateway_services
+    assert "ecr.dkr" in config.interface_services
+
+
+def test_Given_one_subnet_per_az__When_validate__Then_no_error():
+    validate_interface_endpoint_subnets(
+        vpc_name=str(uuid4()),
+        subnet_availability_zone_ids={str(uuid4()): "use1-az1", str(uuid4()): "use1-az2"},
+        has_interface_services=True,
+    )
+
+
+def test_Given_two_subnets_in_same_az__When_validate__Then_error():
+    vpc_name = str(uuid4())
+
+    with pytest.raises(InterfaceEndpointSubnetsError, match=f"{vpc_name}.*both in use1-az1"):
+        validate_interface_endpoint_subnets(
+            vpc_name=vpc_name,
+            subnet_availability_zone_ids={str(uuid4()): "use1-az1", str(uuid4()): "use1-az1"},
+            has_interface_services=True,
+        )
+
+
+def test_Given_interface_services_but_no_subnets__When_validate__Then_error():
+    vpc_name = str(uuid4())
+
+    with pytest.raises(InterfaceEndpointSubnetsError, match=f"{vpc_name}.*no subnets"):
+        validate_interface_endpoint_subnets(
+            vpc_name=vpc_name, subnet_availability_zone_ids={}, has_interface_services=True
+        )
+
+
+def test_Given_only_gateway_services__When_validate_without_subnets__Then_no_error():
+    validate_interface_endpoint_subnets(
+        vpc_name=str(uuid4()), subnet_availability_zone_ids={}, has_interface_services=False
+    )
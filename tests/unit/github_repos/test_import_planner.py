@@ -0,0 +1,272 @@
+import asyncio
+import json
+import urllib.parse
+import urllib.request
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from aws_central_infrastructure.github_repos.lib import MAX_RESOURCE_NAME_LENGTH
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.github_repos.lib import GithubApiClient
+from aws_central_infrastructure.github_repos.lib import GithubApiResponse
+from aws_central_infrastructure.github_repos.lib import GithubRepoConfig
+from aws_central_infrastructure.github_repos.lib import ImportResourceNameTooLongError
+from aws_central_infrastructure.github_repos.lib import RepoImportPlanner
+from aws_central_infrastructure.github_repos.lib import render_repo_configs_module
+
+
+class FakeGithubRepoApi:
+    def __init__(self):
+        self.responses: dict[str, tuple[int, Any]] = {}
+
+    def add(self, path: str, body: Any, *, status: int = 200) -> None:  # noqa: ANN401 # arbitrary JSON
+        self.responses[path] = (status, body)
+
+    def __call__(self, request: urllib.request.Request) -> GithubApiResponse:
+        status, body = self.responses[urllib.parse.urlparse(request.full_url).path]
+        return GithubApiResponse(status=status, body=b"" if body is None else json.dumps(body).encode())
+
+
+def _repo_json(**overrides: Any) -> dict[str, Any]:  # noqa: ANN401 # arbitrary JSON
+    return {
+        "visibility": "private",
+        "description": "a repo",
+        "allow_merge_commit": False,
+        "allow_rebase_merge": True,
+        "delete_branch_on_merge": True,
+        "has_issues": True,
+        "has_projects": False,
+        "has_wiki": False,
+        "has_downloads": True,
+        "allow_auto_merge": True,
+        "squash_merge_commit_title": "PR_TITLE",
+        "squash_merge_commit_message": "PR_BODY",
+        "allow_update_branch": False,
+        "topics": ["lab"],
+        **overrides,
+    }
+
+
+def _planner(fake_api: FakeGithubRepoApi, org_name: str) -> RepoImportPlanner:
+    return RepoImportPlanner(
+        client=GithubApiClient(token=str(uuid4()), transport=fake_api), org_name=org_name, stack_name="prod"
+    )
+
+
+def _add_repo(
+    fake_api: FakeGithubRepoApi,
+    *,
+    org_name: str,
+    repo_name: str,
+    rulesets: list[Any] | None = None,
+    autolinks: list[Any] | None = None,
+) -> str:
+    repo_path = f"/repos/{org_name}/{repo_name}"
+    fake_api.add(repo_path, _repo_json())
+    fake_api.add(f"{repo_path}/vulnerability-alerts", None, status=404)
+    fake_api.add(f"{repo_path}/rulesets", rulesets or [])
+    fake_api.add(f"{repo_path}/autolinks", autolinks or [])
+    return repo_path
+
+
+def _add_repo_with_ruleset(
+    fake_api: FakeGithubRepoApi, *, org_name: str, repo_name: str, org_admin_rule_bypass: bool
+) -> None:
+    repo_path = _add_repo(
+        fake_api, org_name=org_name, repo_name=repo_name, rulesets=[{"id": 42, "name": "Protect Default Branch"}]
+    )
+    fake_api.add(
+        f"{repo_path}/rulesets/42",
+        {
+            "id": 42,
+            "name": "Protect Default Branch",
+            "bypass_actors": [{"actor_type": "OrganizationAdmin", "actor_id": None}] if org_admin_rule_bypass else [],
+            "rules": [
+                {
+                    "type": "required_status_checks",
+                    "parameters": {"required_status_checks": [{"context": "required-check", "integration_id": 15368}]},
+                },
+                {"type": "pull_request", "parameters": {}},
+            ],
+        },
+    )
+
+
+class TestPlanRepo:
+    def test_Given_existing_ruleset_and_autolink__When_planned__Then_config_matches_github_and_all_resources_imported(
+        self,
+    ):
+        org_name = str(uuid4())
+        repo_name = str(uuid4())
+        fake_api = FakeGithubRepoApi()
+        repo_path = _add_repo(
+            fake_api,
+            org_name=org_name,
+            repo_name=repo_name,
+            rulesets=[{"id": 42, "name": "Protect Default Branch"}],
+            autolinks=[{"id": 7, "key_prefix": "JIRA-", "url_template": "https://jira.example.com/<num>"}],
+        )
+        fake_api.add(
+            f"{repo_path}/rulesets/42",
+            {
+                "id": 42,
+                "name": "Protect Default Branch",
+                "bypass_actors": [{"actor_type": "OrganizationAdmin", "actor_id": None}],
+                "rules": [
+                    {
+                        "type": "required_status_checks",
+                        "parameters": {
+                            "strict_required_status_checks_policy": False,
+                            "required_status_checks": [{"context": "required-check", "integration_id": 15368}],
+                        },
+                    },
+                    {
+                        "type": "pull_request",
+                        "parameters": {"require_code_owner_review": False, "allowed_merge_methods": ["rebase"]},
+                    },
+                ],
+            },
+        )
+
+        plan = asyncio.run(_planner(fake_api, org_name).plan_repo(repo_name))
+
+        assert plan.warnings == []
+        assert plan.config.vulnerability_alerts is False
+        assert plan.config.has_downloads is True
+        assert plan.config.org_admin_rule_bypass is True
+        assert plan.config.require_branch_to_be_up_to_date_before_merge is False
+        assert plan.config.require_code_owner_review is False
+        assert plan.config.allowed_merge_methods == ["rebase"]
+        assert plan.config.import_existing_repo_using_config is not None
+        assert plan.config.import_existing_repo_using_config.allow_rebase_merge is True
+        assert [autolink.ticket_prefix for autolink in plan.config.autolink_references] == ["JIRA-"]
+        assert {(resource.type.rsplit(":", 1)[-1], resource.id) for resource in plan.import_resources} == {
+            ("RepositoryRuleset", f"{repo_name}:42"),
+            ("RepositoryAutolinkReference", f"{repo_name}/7"),
+        }
+        assert all(resource.logical_name is not None for resource in plan.import_resources)
+        assert plan.import_resources[0].logical_name == f"{repo_name}--github-repos--prod"
+
+    def test_Given_no_ruleset__When_planned__Then_warning_and_ruleset_not_imported(self):
+        org_name = str(uuid4())
+        repo_name = str(uuid4())
+        fake_api = FakeGithubRepoApi()
+        _ = _add_repo(fake_api, org_name=org_name, repo_name=repo_name)
+
+        plan = asyncio.run(_planner(fake_api, org_name).plan_repo(repo_name))
+
+        assert len(plan.warnings) == 1
+        assert plan.import_resources == []
+
+    def test_Given_internal_repo__When_planned__Then_visibility_kept(self):
+        org_name = str(uuid4())
+        repo_name = str(uuid4())
+        fake_api = FakeGithubRepoApi()
+        repo_path = _add_repo(fake_api, org_name=org_name, repo_name=repo_name)
+        fake_api.add(repo_path, _repo_json(visibility="internal"))
+
+        plan = asyncio.run(_planner(fake_api, org_name).plan_repo(repo_name))
+
+        assert plan.config.visibility == "internal"
+
+    def test_Given_long_repo_name__When_planned__Then_error(self):
+        org_name = str(uuid4())
+        repo_name = "a" * MAX_RESOURCE_NAME_LENGTH
+        fake_api = FakeGithubRepoApi()
+        _ = _add_repo(
+            fake_api,
+            org_name=org_name,
+            repo_name=repo_name,
+            autolinks=[{"id": 7, "key_prefix": "JIRA-", "url_template": "https://example.com/<num>"}],
+        )
+
+        with pytest.raises(ImportResourceNameTooLongError, match=repo_name):
+            _ = asyncio.run(_planner(fake_api, org_name).plan_repo(repo_name))
+
+
+class TestPlanRepos:
+    def _plan_ruleset_imports(self, *, use_org_level_ruleset: bool) -> tuple[list[str], str, dict[str, list[str]]]:
+        org_name = str(uuid4())
+        fake_api = FakeGithubRepoApi()
+        shared_repo_names = [str(uuid4()) for _ in range(3)]
+        divergent_repo_name = str(uuid4())
+        for repo_name in shared_repo_names:
+            _add_repo_with_ruleset(fake_api, org_name=org_name, repo_name=repo_name, org_admin_rule_bypass=False)
+        _add_repo_with_ruleset(fake_api, org_name=org_name, repo_name=divergent_repo_name, org_admin_rule_bypass=True)
+
+        plans = asyncio.run(
+            _planner(fake_api, org_name).plan_repos(
+                [*shared_repo_names, divergent_repo_name], use_org_level_ruleset=use_org_level_ruleset
+            )
+        )
+
+        ruleset_imports = {
+            plan.config.name: [
+                resource.id for resource in plan.import_resources if resource.type.endswith("RepositoryRuleset")
+            ]
+            for plan in plans
+        }
+        return shared_repo_names, divergent_repo_name, ruleset_imports
+
+    def test_Given_org_level_ruleset__When_planned__Then_only_divergent_repo_ruleset_imported(self):
+        shared_repo_names, divergent_repo_name, ruleset_imports = self._plan_ruleset_imports(use_org_level_ruleset=True)
+
+        assert all(ruleset_imports[repo_name] == [] for repo_name in shared_repo_names)
+        assert ruleset_imports[divergent_repo_name] == [f"{divergent_repo_name}:42"]
+
+    def test_Given_no_org_level_ruleset__When_planned__Then_every_repo_ruleset_imported(self):
+        shared_repo_names, divergent_repo_name, ruleset_imports = self._plan_ruleset_imports(
+            use_org_level_ruleset=False
+        )
+
+        assert ruleset_imports == {
+            repo_name: [f"{repo_name}:42"] for repo_name in [*shared_repo_names, divergent_repo_name]
+        }
+
+
+class TestCreateImportFile:
+    def test_Given_plans__When_import_file_created__Then_reference_names_unique_and_parents_resolve(self):
+        org_name = str(uuid4())
+        fake_api = FakeGithubRepoApi()
+        repo_names = [str(uuid4()) for _ in range(3)]
+        for repo_name in repo_names:
+            _ = _add_repo(fake_api, org_name=org_name, repo_name=repo_name)
+        planner = _planner(fake_api, org_name)
+        plans = asyncio.run(planner.plan_repos(repo_names))
+
+        import_file = planner.create_import_file(plans)
+
+        names = [resource["name"] for resource in import_file["resources"]]
+        assert len(names) == len(set(names))
+        component_names = {resource["name"] for resource in import_file["resources"] if resource.get("component")}
+        assert all(
+            resource["parent"] in component_names for resource in import_file["resources"] if "parent" in resource
+        )
+        assert all("logicalName" in resource for resource in import_file["resources"])
+
+
+class TestRenderRepoConfigsModule:
+    def test_Given_plan__When_generated_module_executed__Then_configs_round_trip(self):
+        org_name = str(uuid4())
+        repo_name = str(uuid4())
+        fake_api = FakeGithubRepoApi()
+        _ = _add_repo(
+            fake_api,
+            org_name=org_name,
+            repo_name=repo_name,
+            autolinks=[{"id": 7, "key_prefix": "JIRA-", "url_template": "https://jira.example.com/<num>"}],
+        )
+        plan = asyncio.run(_planner(fake_api, org_name).plan_repo(repo_name))
+        namespace: dict[str, Any] = {
+            "__name__": "aws_central_infrastructure.github_repos.generated_repos",
+            "__package__": "aws_central_infrastructure.github_repos",
+        }
+        exec(compile(render_repo_configs_module([plan]), "generated_repos.py", "exec"), namespace)  # noqa: S102 # executing the generated code is the point of the test
+        configs: list[GithubRepoConfig] = []
+
+        namespace["create_imported_repo_configs"](configs)
+
+        assert configs == [plan.config]
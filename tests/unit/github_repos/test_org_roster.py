@@ -0,0 +1,152 @@
+import asyncio
+import json
+import urllib.parse
+import urllib.request
+from typing import Any
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.github_repos.lib import GithubApiClient
+from aws_central_infrastructure.github_repos.lib import GithubApiResponse
+from aws_central_infrastructure.github_repos.lib import GithubOrgMembers
+from aws_central_infrastructure.github_repos.lib import GithubOrgRoster
+from aws_central_infrastructure.github_repos.lib import GithubTeamConfig
+from aws_central_infrastructure.github_repos.lib import GithubTeamRoster
+from aws_central_infrastructure.github_repos.lib import fetch_org_roster
+from aws_central_infrastructure.github_repos.lib import fully_configure_teams
+from aws_central_infrastructure.github_repos.lib import render_team_configs_module
+
+
+class FakeGithubApi:
+    def __init__(self, *, page_size: int = 2):
+        self.page_size = page_size
+        self.lists: dict[tuple[str, str], list[Any]] = {}
+        self.requested_urls: list[str] = []
+
+    def add_list(self, path: str, items: list[Any], *, role: str = "") -> None:
+        self.lists[(path, role)] = items
+
+    def __call__(self, request: urllib.request.Request) -> GithubApiResponse:
+        self.requested_urls.append(request.full_url)
+        parsed = urllib.parse.urlparse(request.full_url)
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        items = self.lists[(parsed.path, query.get("role", ""))]
+        page = int(query.get("page", "1"))
+        start = (page - 1) * self.page_size
+        headers: dict[str, str] = {}
+        if start + self.page_size < len(items):
+            next_query = urllib.parse.urlencode({**query, "page": str(page + 1)})
+            headers["link"] = f'<https://api.github.com{parsed.path}?{next_query}>; rel="next"'
+        return GithubApiResponse(
+            status=200, body=json.dumps(items[start : start + self.page_size]).encode(), headers=headers
+        )
+
+
+def _users(*logins: str) -> list[dict[str, str]]:
+    return [{"login": login} for login in logins]
+
+
+class TestFetchOrgRoster:
+    def test_Given_members_spanning_multiple_pages__When_fetch__Then_all_pages_followed(self):
+        org_name = str(uuid4())
+        expected_member_pages = 3
+        members = sorted(str(uuid4()) for _ in range(5))
+        fake_api = FakeGithubApi(page_size=2)
+        fake_api.add_list(f"/orgs/{org_name}/members", _users("admin-user"), role="admin")
+        fake_api.add_list(f"/orgs/{org_name}/members", _users(*members), role="member")
+        fake_api.add_list(f"/orgs/{org_name}/teams", [])
+        client = GithubApiClient(token=str(uuid4()), transport=fake_api)
+
+        roster = asyncio.run(fetch_org_roster(client=client, org_name=org_name))
+
+        assert roster.everyone == members
+        assert roster.org_admins == ["admin-user"]
+        assert len([url for url in fake_api.requested_urls if "role=member" in url]) == expected_member_pages
+
+    def test_Given_nested_teams__When_fetch__Then_parent_and_memberships_captured(self):
+        org_name = str(uuid4())
+        fake_api = FakeGithubApi()
+        fake_api.add_list(f"/orgs/{org_name}/members", _users("admin-user"), role="admin")
+        fake_api.add_list(f"/orgs/{org_name}/members", _users("alice", "bob"), role="member")
+        fake_api.add_list(
+            f"/orgs/{org_name}/teams",
+            [
+                {"name": "Parent", "slug": "parent", "description": None, "privacy": "closed", "parent": None},
+                {
+                    "name": "Child",
+                    "slug": "child",
+                    "description": "d",
+                    "privacy": "secret",
+                    "parent": {"slug": "parent"},
+                },
+            ],
+        )
+        for slug in ("parent", "child"):
+            fake_api.add_list(f"/orgs/{org_name}/teams/{slug}/members", _users("admin-user"), role="maintainer")
+        # the parent's listing also includes the members of its child team
+        fake_api.add_list(f"/orgs/{org_name}/teams/parent/members", _users("carol", "bob", "alice"), role="member")
+        fake_api.add_list(f"/orgs/{org_name}/teams/child/members", _users("bob", "alice"), role="member")
+        fake_api.add_list(
+            f"/orgs/{org_name}/teams/parent/repos",
+            [
+                {"name": "repo-a", "permissions": {"admin": False, "maintain": False, "push": True, "pull": True}},
+                {"name": "repo-b", "permissions": {"pull": True}},
+                {"name": "repo-c", "permissions": {"admin": True, "push": True, "pull": True}},
+            ],
+        )
+        fake_api.add_list(f"/orgs/{org_name}/teams/child/repos", [])
+        client = GithubApiClient(token=str(uuid4()), transport=fake_api)
+
+        roster = asyncio.run(fetch_org_roster(client=client, org_name=org_name))
+
+        child = next(team for team in roster.teams if team.slug == "child")
+        parent = next(team for team in roster.teams if team.slug == "parent")
+        assert child.parent_slug == "parent"
+        assert child.privacy == "secret"
+        assert child.maintainers == ["admin-user"]
+        assert child.members == ["alice", "bob"]
+        assert parent.members == ["carol"]
+        assert parent.maintainers == []
+        assert parent.repo_permissions == {"repo-a": "push", "repo-b": "pull", "repo-c": "admin"}
+
+
+class TestRenderTeamConfigsModule:
+    def test_Given_roster__When_generated_module_executed__Then_team_configs_pass_org_validation(self):
+        roster = GithubOrgRoster(
+            org_name=str(uuid4()),
+            org_admins=["admin-user"],
+            everyone=["alice", "bob"],
+            teams=[
+                GithubTeamRoster(name="Everyone", slug="everyone", members=["alice", "bob"]),
+                GithubTeamRoster(name="Child Team", slug="child-team", parent_slug="parent", members=["alice"]),
+                GithubTeamRoster(name="DevSecOps", slug="devsecops", maintainers=["admin-user"]),
+                GithubTeamRoster(
+                    name="Parent",
+                    slug="parent",
+                    parent_slug="everyone",
+                    members=["bob", "admin-user"],
+                    repo_permissions={"repo-a": "push"},
+                ),
+            ],
+        )
+        namespace: dict[str, Any] = {
+            "__name__": "aws_central_infrastructure.github_repos.generated_teams",
+            "__package__": "aws_central_infrastructure.github_repos",
+        }
+        exec(compile(render_team_configs_module(roster), "generated_teams.py", "exec"), namespace)  # noqa: S102 # executing the generated code is the point of the test
+        root_team = GithubTeamConfig(name="Everyone", description=str(uuid4()))
+        dev_sec_ops_team_config = GithubTeamConfig(name="DevSecOps", description=str(uuid4()), parent_team=root_team)
+        configs: list[GithubTeamConfig] = [dev_sec_ops_team_config]
+
+        org_members = namespace["define_team_configs"](configs=configs, dev_sec_ops_team_config=dev_sec_ops_team_config)
+        fully_configure_teams(configs=configs, org_members=org_members, root_team=root_team)
+
+        assert isinstance(org_members, GithubOrgMembers)
+        assert org_members.everyone == ["alice", "bob"]
+        assert [config.name for config in configs] == ["Everyone", "DevSecOps", "Parent", "Child Team"]
+        assert dev_sec_ops_team_config.maintainers == ["admin-user"]
+        child = configs[3]
+        assert child.parent_team is configs[2]
+        assert configs[2].parent_team is None
+        assert configs[2].maintainers == ["admin-user"]
+        assert configs[2].repo_permissions == {"repo-a": "push"}
@@ -0,0 +1,50 @@
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.github_repos.lib import GithubRepoConfig
+from aws_central_infrastructure.github_repos.lib import partition_default_branch_rulesets
+
+
+def _config(**kwargs: bool) -> GithubRepoConfig:
+    return GithubRepoConfig(name=str(uuid4()), description=str(uuid4()), **kwargs)
+
+
+class TestPartitionDefaultBranchRulesets:
+    def test_Given_mostly_default_configs__When_partitioned__Then_divergent_repos_keep_own_ruleset(self):
+        default_configs = [_config() for _ in range(3)]
+        divergent_config = _config(org_admin_rule_bypass=True)
+        configs = [default_configs[0], divergent_config, *default_configs[1:]]
+
+        partition = partition_default_branch_rulesets(
+            {config.name: config.default_branch_ruleset_settings() for config in configs}
+        )
+
+        assert partition.shared_settings == default_configs[0].default_branch_ruleset_settings()
+        assert partition.shared_repo_names == sorted(config.name for config in default_configs)
+        assert partition.divergent_repo_names == [divergent_config.name]
+
+    def test_Given_explicit_merge_methods__When_partitioned__Then_grouped_by_those_methods(self):
+        configs = [
+            GithubRepoConfig(name=str(uuid4()), description="", allowed_merge_methods=["rebase", "squash"]),
+            GithubRepoConfig(name=str(uuid4()), description="", allowed_merge_methods=["rebase", "squash"]),
+            _config(),
+        ]
+
+        partition = partition_default_branch_rulesets(
+            {config.name: config.default_branch_ruleset_settings() for config in configs}
+        )
+
+        assert partition.shared_settings is not None
+        assert partition.shared_settings.allowed_merge_methods == ("rebase", "squash")
+        assert partition.divergent_repo_names == [configs[2].name]
+
+    def test_Given_every_repo_unique__When_partitioned__Then_no_org_ruleset(self):
+        configs = [_config(), _config(org_admin_rule_bypass=True)]
+
+        partition = partition_default_branch_rulesets(
+            {config.name: config.default_branch_ruleset_settings() for config in configs}
+        )
+
+        assert partition.shared_settings is None
+        assert partition.shared_repo_names == []
+        assert partition.divergent_repo_names == [config.name for config in configs]
@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.iac_management.lib import GithubOidcConfig
+from aws_central_infrastructure.iac_management.lib import create_oidc_sub_condition
+
+
+def _oidc_config(*, environments: list[str] | None = None, restrictions: str | None = None) -> GithubOidcConfig:
+    return GithubOidcConfig(
+        aws_account_id="123456789012",
+        role_name=str(uuid4()),
+        repo_org="my-org",
+        repo_name="my-repo",
+        environments=environments or [],
+        restrictions=restrictions,
+    )
+
+
+def test_Given_environments__When_sub_condition_created__Then_only_those_environments_match():
+    environments = [str(uuid4()), str(uuid4())]
+
+    condition = create_oidc_sub_condition(_oidc_config(environments=environments))
+
+    assert condition.test == "StringEquals"
+    assert condition.variable == "token.actions.githubusercontent.com:sub"
+    assert condition.values == [f"repo:my-org/my-repo:environment:{environment}" for environment in environments]
+
+
+def test_Given_environments_and_restrictions__When_sub_condition_created__Then_restrictions_ignored():
+    environment = str(uuid4())
+
+    condition = create_oidc_sub_condition(_oidc_config(environments=[environment], restrictions="ref:refs/heads/main"))
+
+    assert condition.values == [f"repo:my-org/my-repo:environment:{environment}"]
+
+
+def test_Given_branch_restriction__When_sub_condition_created__Then_exact_match_on_the_ref():
+    condition = create_oidc_sub_condition(_oidc_config(restrictions="ref:refs/heads/main"))
+
+    assert condition.test == "StringEquals"
+    assert condition.values == ["repo:my-org/my-repo:ref:refs/heads/main"]
+
+
+def test_Given_no_restrictions__When_sub_condition_created__Then_any_ref_in_the_repo_matches():
+    condition = create_oidc_sub_condition(_oidc_config())
+
+    assert condition.test == "StringLike"
+    assert condition.values == ["repo:my-org/my-repo:*"]
@@ -0,0 +1,62 @@
+from pathlib import Path
+from uuid import uuid4
+
+# separate internal imports from external imports with this comment, because otherwise ruff in the copier template doesn't recognize them as internal and reformats them
+from aws_central_infrastructure.iac_management.lib import CENTRAL_INFRA_GITHUB_ORG_NAME
+from aws_central_infrastructure.org_model.lib import OrgModel
+from aws_central_infrastructure.org_model.lib import compile_org_model
+from aws_central_infrastructure.org_model.lib import load_or_compile_org_model
+
+
+def _is_resolved(org_model: OrgModel, repo_name: str) -> bool:
+    # repos in other orgs are keyed as org/name, and can't be checked against this org's repos
+    return (
+        "/" in repo_name
+        or repo_name in org_model.repos
+        or any(repo_name in reference for reference in org_model.unknown_repo_references)
+    )
+
+
+def test_When_compiled__Then_team_permissions_refer_to_known_teams_and_repos():
+    org_model = compile_org_model(source_hash=str(uuid4()))
+
+    for repo_name, permissions in org_model.team_permissions_by_repo.items():
+        assert _is_resolved(org_model, repo_name)
+        assert set(permissions) <= set(org_model.teams)
+
+
+def test_When_compiled__Then_collaborator_permissions_refer_to_known_collaborators_and_repos():
+    org_model = compile_org_model(source_hash=str(uuid4()))
+
+    for repo_name, permissions in org_model.collaborator_permissions_by_repo.items():
+        assert _is_resolved(org_model, repo_name)
+        assert set(permissions) <= set(org_model.collaborators)
+
+
+def test_When_compiled__Then_package_claims_resolve_to_repos_with_publishing_environments():
+    org_model = compile_org_model(source_hash=str(uuid4()))
+
+    for repo_name in org_model.package_claims:
+        assert _is_resolved(org_model, repo_name)
+        if repo_name in org_model.repos:
+            assert org_model.repos[repo_name].create_pypi_publishing_environments is True
+
+
+def test_When_compiled__Then_ecr_pushers_refer_to_known_repos():
+    org_model = compile_org_model(source_hash=str(uuid4()))
+
+    for ecr_config in org_model.ecr_configs:
+        if ecr_config.git_repo_name is not None and ecr_config.git_repo_org == CENTRAL_INFRA_GITHUB_ORG_NAME:
+            assert _is_resolved(org_model, ecr_config.git_repo_name)
+
+
+def test_Given_cache_dir__When_loaded_twice__Then_second_load_reads_the_cached_model(tmp_path: Path):
+    stale_cache_file = tmp_path / "org-model-stale.json"
+    _ = stale_cache_file.write_text("{}")
+
+    org_model = load_or_compile_org_model(cache_dir=tmp_path)
+    cached_files = list(tmp_path.iterdir())
+    cached_org_model = load_or_compile_org_model(cache_dir=tmp_path)
+
+    assert [path.name for path in cached_files] == [f"org-model-{org_model.source_hash}.json"]
+    assert cached_org_model == org_model